@@ -1,6 +1,36 @@
 """Rules Combiner CLI Package.
 
 A CLI tool for combining rule files into a single AGENT.md file.
+
+The programmatic API is exported lazily so importing the package (and the
+CLI) stays cheap:
+
+    >>> from rules_combiner import CombinationConfig, combine
 """
 
+from importlib import import_module
+from typing import Any
+
 __version__ = "0.1.0"
+
+# Public name -> module that defines it, imported on first access
+_LAZY_EXPORTS = {
+    "AsyncCombiner": "aio",
+    "CombinationConfig": "models",
+    "CombineResult": "api",
+    "CombineTimings": "api",
+    "Combiner": "api",
+    "RuleFile": "models",
+    "SectionInfo": "api",
+    "SelectionMode": "models",
+    "combine": "api",
+}
+
+__all__ = ["__version__", *_LAZY_EXPORTS]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module_name}", __name__), name)
@@ -0,0 +1,199 @@
+"""asyncio façade over the combine API for use inside async services.
+
+All file I/O runs on a bounded thread pool, and a semaphore caps how many
+I/O jobs are in flight across every request sharing the façade. Section
+loads for one request are fanned out concurrently, so a timeout or
+cancellation stops the loads that have not started yet instead of waiting
+for the whole combine to finish.
+
+Example:
+    >>> async with AsyncCombiner(max_concurrency=16) as combiner:
+    ...     result = await combiner.combine(config, timeout=2.0)
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Awaitable, Callable, List, Optional, Type, TypeVar
+
+from .api import Combiner, CombineResult, CombineTimings
+from .catalog import RuleCatalog
+from .models import CombinationConfig, RuleFile
+from .output import PatchResult
+
+T = TypeVar("T")
+
+
+class AsyncCombiner:
+    """Runs discovery, combining and writing without blocking the event loop.
+
+    Timeouts raise ``asyncio.TimeoutError``; cancelling the awaiting task
+    raises ``asyncio.CancelledError``. In both cases section loads that have
+    not started are abandoned. A job already running on a worker thread
+    finishes in the background, since threads cannot be interrupted; writes
+    are atomic or in-place patches, so an abandoned write never leaves a
+    partial output.
+
+    Example:
+        >>> combiner = AsyncCombiner()
+        >>> rules = await combiner.discover(Path("rules"))
+        >>> await combiner.aclose()
+    """
+
+    def __init__(
+        self,
+        combiner: Optional[Combiner] = None,
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the façade.
+
+        Args:
+            combiner: Engine whose warm caches are shared by all requests; a
+                new one is created if omitted.
+            max_workers: Worker threads for file I/O; defaults to the CPU
+                count plus four, capped at 32.
+            max_concurrency: Maximum I/O jobs in flight across all requests;
+                defaults to ``max_workers``.
+            timeout: Default per-request timeout in seconds; None waits
+                indefinitely.
+        """
+        self._combiner = combiner or Combiner()
+        self._max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._max_concurrency = max_concurrency or self._max_workers
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="rules-combiner"
+        )
+        # Created on first use so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def combiner(self) -> Combiner:
+        """The synchronous engine whose caches back this façade."""
+        return self._combiner
+
+    async def discover(self, rules_dir: Path, timeout: Optional[float] = None) -> RuleCatalog:
+        """Discover the rules in a directory.
+
+        Args:
+            rules_dir: Path of the rules directory.
+            timeout: Seconds to wait; overrides the default timeout.
+
+        Returns:
+            The indexed catalog of discovered rule files.
+
+        Raises:
+            ValueError: If the directory does not exist.
+            asyncio.TimeoutError: If the timeout expires.
+        """
+        return await self._with_timeout(
+            self._run(self._combiner.discover, rules_dir), timeout
+        )
+
+    async def combine(
+        self,
+        config: CombinationConfig,
+        rules: Optional[List[RuleFile]] = None,
+        timeout: Optional[float] = None,
+    ) -> CombineResult:
+        """Combine the rules a configuration selects.
+
+        Args:
+            config: What to combine.
+            rules: Already selected rules, in output order.
+            timeout: Seconds to wait for the whole request; overrides the
+                default timeout.
+
+        Returns:
+            CombineResult, identical to what ``Combiner.combine`` returns.
+
+        Raises:
+            ValueError: If the selection is invalid or selects nothing.
+            OSError: If a rule file cannot be read.
+            asyncio.TimeoutError: If the timeout expires.
+        """
+        return await self._with_timeout(self._combine(config, rules), timeout)
+
+    async def write(
+        self, config: CombinationConfig, result: CombineResult, timeout: Optional[float] = None
+    ) -> PatchResult:
+        """Write a combine result to the configured output.
+
+        Raises:
+            OSError: If the output cannot be written.
+            asyncio.TimeoutError: If the timeout expires.
+        """
+        return await self._with_timeout(
+            self._run(self._combiner.write, config, result), timeout
+        )
+
+    async def aclose(self) -> None:
+        """Shut down the worker threads, waiting for running jobs to finish."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+
+    async def __aenter__(self) -> "AsyncCombiner":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def _combine(
+        self, config: CombinationConfig, rules: Optional[List[RuleFile]]
+    ) -> CombineResult:
+        """Discover, select and load sections concurrently, then assemble."""
+        started = time.perf_counter()
+        timings = CombineTimings()
+
+        if rules is None:
+            available = await self._run(self._combiner.discover, config.rules_directory)
+            timings.discovery = time.perf_counter() - started
+            phase_started = time.perf_counter()
+            rules = self._combiner.select(config, available)
+            timings.selection = time.perf_counter() - phase_started
+        if not rules:
+            raise ValueError(f"No rules selected from {config.rules_directory}")
+
+        phase_started = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self._run(self._combiner.load_section, rule))
+            for rule in rules
+        ]
+        try:
+            sections = await asyncio.gather(*tasks)
+        except BaseException:
+            # On error, timeout or cancellation, stop the loads still queued
+            for task in tasks:
+                task.cancel()
+            raise
+
+        result = self._combiner.assemble(config, list(sections), timings)
+        timings.processing = time.perf_counter() - phase_started
+        timings.total = time.perf_counter() - started
+        return result
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the executor once a concurrency slot is free."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def _with_timeout(self, awaitable: Awaitable[T], timeout: Optional[float]) -> T:
+        """Await with the per-request timeout, falling back to the default."""
+        effective = self._timeout if timeout is None else timeout
+        if effective is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, effective)
@@ -0,0 +1,463 @@
+"""Programmatic API for combining rules without console side effects.
+
+Everything here returns values or raises exceptions; nothing prints, prompts
+or exits. A :class:`Combiner` keeps discovered catalogs and processed
+sections cached, so long-lived services can call it repeatedly and only pay
+for files that changed.
+
+Example:
+    >>> from rules_combiner import CombinationConfig, combine
+    >>> result = combine(CombinationConfig(
+    ...     rules_directory=Path("rules"),
+    ...     output_file=Path("AGENT.md"),
+    ...     selected_rules=["python-coding.md"],
+    ... ))
+    >>> result.content[:20]
+    b'<!-- rules-combiner:'
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import __version__
+from .catalog import RuleCatalog
+from .discovery import RuleDiscoveryEngine
+from .manifest import SourceEntry, SourceManifest, hash_content, selection_options
+from .models import CombinationConfig, RuleFile
+from .output import OutputGenerator, PatchResult
+from .processor import RuleProcessor
+from .selection import select_rules
+
+
+def _directory_snapshot(rules_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """Return each file's modification time and size, without reading it."""
+    snapshot = {}
+    with os.scandir(rules_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+@dataclass
+class _DirectoryState:
+    """A discovered catalog and the directory snapshot it was built from."""
+
+    snapshot: Dict[str, Tuple[int, int]]
+    rules: RuleCatalog
+
+
+@dataclass
+class _CachedSection:
+    """An encoded, marked-up rule section, valid while the file is unchanged."""
+
+    data: bytes
+    sha256: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how well the warm caches are doing."""
+
+    discoveries: int = 0
+    catalog_hits: int = 0
+    sections_processed: int = 0
+    section_hits: int = 0
+
+
+class WarmCatalog:
+    """Discovered rules and processed sections shared across calls.
+
+    Every catalog lookup re-stats the rules directory. A catalog is
+    rediscovered only when a file was added, removed or modified, and a
+    section is reprocessed only when its own file changed. Safe to share
+    between threads.
+
+    Example:
+        >>> catalog = WarmCatalog()
+        >>> rules = catalog.rules(Path("rules"))
+        >>> catalog.rules(Path("rules")) is rules
+        True
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty caches."""
+        self._processor = RuleProcessor()
+        self._directories: Dict[Path, _DirectoryState] = {}
+        self._sections: Dict[Path, _CachedSection] = {}
+        # One lock per rule, so concurrent misses on a rule read it only once
+        self._section_locks: Dict[Path, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Cache counters since the catalog was created."""
+        return self._stats
+
+    def rules(self, rules_dir: Path) -> RuleCatalog:
+        """Return the rules in a directory, rediscovering them only if it changed.
+
+        Args:
+            rules_dir: Path of the rules directory.
+
+        Returns:
+            The indexed catalog of discovered rule files.
+
+        Raises:
+            ValueError: If the directory does not exist.
+        """
+        if not rules_dir.is_dir():
+            raise ValueError(f"Directory '{rules_dir}' does not exist")
+
+        snapshot = _directory_snapshot(rules_dir)
+        with self._lock:
+            state = self._directories.get(rules_dir)
+            if state is not None and state.snapshot == snapshot:
+                self._stats.catalog_hits += 1
+                return state.rules
+
+        rules = RuleDiscoveryEngine(rules_dir).discover_catalog()
+        with self._lock:
+            self._directories[rules_dir] = _DirectoryState(snapshot=snapshot, rules=rules)
+            self._stats.discoveries += 1
+        return rules
+
+    def section(self, rule: RuleFile) -> Tuple[_CachedSection, bool]:
+        """Return a rule's processed section and whether it came from the cache."""
+        stat = rule.path.stat()
+        with self._lock:
+            section_lock = self._section_locks.setdefault(rule.path, threading.Lock())
+        with section_lock:
+            with self._lock:
+                cached = self._sections.get(rule.path)
+                if (
+                    cached is not None
+                    and cached.size == stat.st_size
+                    and cached.mtime_ns == stat.st_mtime_ns
+                ):
+                    self._stats.section_hits += 1
+                    return cached, True
+
+            content = self._processor.read_rule_content(rule.path)
+            formatted = self._processor.format_rule_section(content, rule.title)
+            marked = self._processor.format_section_marker(rule.filename, formatted) + formatted
+            cached = _CachedSection(
+                data=marked.encode('utf-8'),
+                sha256=hash_content(content),
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+            with self._lock:
+                self._sections[rule.path] = cached
+                self._stats.sections_processed += 1
+        return cached, False
+
+    def table_of_contents(self, rules: List[RuleFile]) -> bytes:
+        """Return the encoded, marked table of contents for the given rules."""
+        toc = self._processor.generate_table_of_contents(rules)
+        return (self._processor.format_section_marker("toc", toc) + toc).encode('utf-8')
+
+
+@dataclass
+class LoadedSection:
+    """A rule's processed section, loaded for one combine call."""
+
+    rule: RuleFile
+    data: bytes
+    sha256: str
+    size: int
+    mtime_ns: int
+    cached: bool = False
+    seconds: float = 0.0
+
+
+@dataclass
+class SectionInfo:
+    """Where one section landed in the combined content.
+
+    Attributes:
+        section_id: Rule filename, or ``"toc"`` for the table of contents.
+        title: Rule title, or ``"Table of Contents"``.
+        offset: Byte offset of the section (including its marker).
+        size: Size in bytes of the section (including its marker).
+        sha256: Digest of the source rule content; None for the TOC.
+        cached: Whether the section was served from the cache.
+        seconds: Time spent producing the section.
+    """
+
+    section_id: str
+    title: str
+    offset: int
+    size: int
+    sha256: Optional[str] = None
+    cached: bool = False
+    seconds: float = 0.0
+
+
+@dataclass
+class CombineTimings:
+    """Wall-clock seconds spent in each phase of a combine call."""
+
+    discovery: float = 0.0
+    selection: float = 0.0
+    processing: float = 0.0
+    total: float = 0.0
+
+
+@dataclass
+class CombineResult:
+    """Combined content and metadata returned by :func:`combine`.
+
+    Example:
+        >>> result = combine(config)
+        >>> [section.section_id for section in result.sections]
+        ['toc', 'python-coding.md']
+    """
+
+    content: bytes
+    rules: List[RuleFile] = field(default_factory=list)
+    sections: List[SectionInfo] = field(default_factory=list)
+    timings: CombineTimings = field(default_factory=CombineTimings)
+    manifest: Optional[SourceManifest] = None
+
+    @property
+    def text(self) -> str:
+        """The combined content decoded as text."""
+        return self.content.decode('utf-8')
+
+
+class Combiner:
+    """Reusable engine behind :func:`combine`.
+
+    Holds a :class:`WarmCatalog`, so repeated calls reuse discovery results
+    and processed sections. Safe to call from several threads at once.
+
+    Example:
+        >>> combiner = Combiner()
+        >>> result = combiner.combine(config)
+        >>> combiner.write(config, result).mode
+        'rewritten'
+    """
+
+    def __init__(self, catalog: Optional[WarmCatalog] = None) -> None:
+        """Initialize the combiner.
+
+        Args:
+            catalog: Caches to use; a new catalog is created if omitted.
+        """
+        self._catalog = catalog or WarmCatalog()
+
+    @property
+    def catalog(self) -> WarmCatalog:
+        """The caches used by this combiner."""
+        return self._catalog
+
+    def discover(self, rules_dir: Path) -> RuleCatalog:
+        """Return the indexed rules in a directory from the warm catalog."""
+        return self._catalog.rules(rules_dir)
+
+    def combine(
+        self,
+        config: CombinationConfig,
+        rules: Optional[List[RuleFile]] = None,
+        on_rule: Optional[Callable[[RuleFile], None]] = None,
+    ) -> CombineResult:
+        """Combine the rules a configuration selects.
+
+        Args:
+            config: What to combine; ``selection_mode`` must not be interactive
+                unless ``rules`` is given.
+            rules: Already selected rules, in output order. Skips discovery
+                and selection when given.
+            on_rule: Callback invoked before each rule section is produced.
+
+        Returns:
+            CombineResult with the encoded content and section metadata.
+
+        Raises:
+            ValueError: If the selection is invalid or selects nothing.
+            OSError: If a rule file cannot be read.
+        """
+        started = time.perf_counter()
+        timings = CombineTimings()
+
+        if rules is None:
+            available = self._catalog.rules(config.rules_directory)
+            timings.discovery = time.perf_counter() - started
+            phase_started = time.perf_counter()
+            rules = self.select(config, available)
+            timings.selection = time.perf_counter() - phase_started
+        if not rules:
+            raise ValueError(f"No rules selected from {config.rules_directory}")
+
+        phase_started = time.perf_counter()
+        sections = []
+        for rule in rules:
+            if on_rule is not None:
+                on_rule(rule)
+            sections.append(self.load_section(rule))
+
+        result = self.assemble(config, sections, timings)
+        timings.processing = time.perf_counter() - phase_started
+        timings.total = time.perf_counter() - started
+        return result
+
+    def select(self, config: CombinationConfig, available: Sequence[RuleFile]) -> List[RuleFile]:
+        """Resolve a configuration's selection against discovered rules.
+
+        Raises:
+            ValueError: If the selection is invalid or interactive.
+        """
+        return select_rules(
+            available,
+            config.selection_mode,
+            config.selected_rules,
+            config.selected_patterns,
+            config.selected_tags,
+            config.selection_expression,
+        )
+
+    def load_section(self, rule: RuleFile) -> LoadedSection:
+        """Load one rule's processed section through the cache.
+
+        This is the only step of a combine that reads rule files, so callers
+        may run it concurrently for different rules.
+
+        Raises:
+            OSError: If the rule file cannot be read.
+        """
+        started = time.perf_counter()
+        cached, hit = self._catalog.section(rule)
+        return LoadedSection(
+            rule=rule,
+            data=cached.data,
+            sha256=cached.sha256,
+            size=cached.size,
+            mtime_ns=cached.mtime_ns,
+            cached=hit,
+            seconds=time.perf_counter() - started,
+        )
+
+    def assemble(
+        self,
+        config: CombinationConfig,
+        sections: List[LoadedSection],
+        timings: Optional[CombineTimings] = None,
+    ) -> CombineResult:
+        """Join loaded sections into the combined document without further I/O.
+
+        Args:
+            config: Output options (table of contents, manifest, output path).
+            sections: Loaded sections in output order.
+            timings: Timings to attach to the result.
+
+        Returns:
+            CombineResult with the encoded content and section metadata.
+        """
+        rules = [section.rule for section in sections]
+        manifest = SourceManifest(options={
+            "include_toc": config.include_toc,
+            "tool_version": __version__,
+            **selection_options(config),
+        }) if config.embed_manifest else None
+        manifest_base_dir = config.output_file.parent
+
+        parts: List[bytes] = []
+        infos: List[SectionInfo] = []
+        offset = 0
+
+        def add(data: bytes, info: SectionInfo) -> None:
+            nonlocal offset
+            info.offset = offset
+            info.size = len(data)
+            parts.append(data)
+            infos.append(info)
+            offset += len(data) + 1  # sections are joined by a newline
+
+        if config.include_toc:
+            toc_started = time.perf_counter()
+            toc = self._catalog.table_of_contents(rules)
+            add(toc, SectionInfo(
+                "toc", "Table of Contents", 0, 0,
+                seconds=time.perf_counter() - toc_started,
+            ))
+
+        for section in sections:
+            rule = section.rule
+            add(section.data, SectionInfo(
+                rule.filename, rule.title, 0, 0, sha256=section.sha256,
+                cached=section.cached, seconds=section.seconds,
+            ))
+            if manifest is not None:
+                manifest.sources.append(SourceEntry(
+                    path=Path(os.path.relpath(rule.path, manifest_base_dir)).as_posix(),
+                    size=section.size,
+                    mtime_ns=section.mtime_ns,
+                    sha256=section.sha256,
+                ))
+
+        content = b"\n".join(parts)
+        if manifest is not None:
+            content += manifest.trailer_for(len(content)).encode('utf-8')
+
+        return CombineResult(
+            content=content, rules=rules, sections=infos,
+            timings=timings or CombineTimings(), manifest=manifest,
+        )
+
+    def write(self, config: CombinationConfig, result: CombineResult) -> PatchResult:
+        """Write a result to the configured output, patching it in place if possible.
+
+        Backs up the existing output first when ``config.backup_existing`` is
+        set; the returned ``backup_path`` points at the backup.
+
+        Args:
+            config: Configuration the result was combined from.
+            result: Result of :meth:`combine`.
+
+        Returns:
+            PatchResult describing how the file was written.
+
+        Raises:
+            OSError: If the output cannot be written.
+        """
+        generator = OutputGenerator(config.output_file, backup=config.backup_existing)
+        backup_path = generator.backup_existing_file()
+        patch_result = generator.write_incremental(result.content)
+        patch_result.backup_path = backup_path
+        return patch_result
+
+
+_default_combiner: Optional[Combiner] = None
+_default_combiner_lock = threading.Lock()
+
+
+def combine(
+    config: CombinationConfig, rules: Optional[List[RuleFile]] = None
+) -> CombineResult:
+    """Combine the rules a configuration selects, using a shared warm Combiner.
+
+    Args:
+        config: What to combine.
+        rules: Already selected rules, in output order.
+
+    Returns:
+        CombineResult with the encoded content, section metadata and timings.
+
+    Raises:
+        ValueError: If the selection is invalid or selects nothing.
+        OSError: If a rule file cannot be read.
+    """
+    global _default_combiner
+    with _default_combiner_lock:
+        if _default_combiner is None:
+            _default_combiner = Combiner()
+    return _default_combiner.combine(config, rules)
@@ -0,0 +1,312 @@
+"""Parallel generation of many outputs from a shared build manifest."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .api import Combiner
+from .catalog import RuleCatalog
+from .config import path_value, read_toml, string_list
+from .log import logger
+from .models import CombinationConfig, SelectionMode
+from .selection import select_rules
+
+
+@dataclass
+class BuildTarget:
+    """One output to generate as part of a build.
+
+    Example:
+        >>> target = BuildTarget(
+        ...     name="service-a",
+        ...     output=Path("services/a/AGENT.md"),
+        ...     rules_directory=Path("rules"),
+        ...     selected_rules=["python-coding.md"],
+        ... )
+        >>> target.selection_mode
+        <SelectionMode.SPECIFIC: 'specific'>
+    """
+
+    name: str
+    output: Path
+    rules_directory: Path
+    selected_rules: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    expression: Optional[str] = None
+    selection_mode: SelectionMode = SelectionMode.SPECIFIC
+    include_toc: bool = True
+    embed_manifest: bool = True
+    backup: bool = False
+
+
+@dataclass
+class TargetResult:
+    """Outcome of building a single target."""
+
+    target: BuildTarget
+    seconds: float = 0.0
+    rule_count: int = 0
+    output_size: int = 0
+    write_mode: str = ""
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the target was built successfully."""
+        return self.error is None
+
+
+@dataclass
+class BuildSummary:
+    """Aggregate outcome of a build run."""
+
+    results: List[TargetResult] = field(default_factory=list)
+    discovery_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    @property
+    def failed(self) -> List[TargetResult]:
+        """Results of targets that failed."""
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def total_bytes(self) -> int:
+        """Combined size of all successfully built outputs."""
+        return sum(result.output_size for result in self.results if result.ok)
+
+    @property
+    def targets_per_second(self) -> float:
+        """Build throughput in targets per second of wall time."""
+        return len(self.results) / self.total_seconds if self.total_seconds else 0.0
+
+
+def load_build_manifest(path: Path) -> List[BuildTarget]:
+    """Load build targets from a TOML build manifest.
+
+    Top-level keys (``rules_directory``, ``include_toc``, ``manifest``,
+    ``backup``) act as defaults for every ``[[targets]]`` entry. Relative
+    paths are resolved against the manifest's directory.
+
+    Example manifest::
+
+        rules_directory = "rules"
+
+        [[targets]]
+        output = "services/api/AGENT.md"
+        select = ["python-coding.md", "python-test.md"]
+
+        [[targets]]
+        name = "web"
+        output = "services/web/AGENT.md.gz"
+        select_glob = ["type-script*.md", "ui-*.md"]
+        include_toc = false
+
+    Args:
+        path: Path to the build manifest.
+
+    Returns:
+        The targets in manifest order.
+
+    Raises:
+        ValueError: If the manifest is invalid.
+    """
+    data = read_toml(path)
+    base_dir = path.parent
+    entries = data.get("targets")
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"Build manifest {path} defines no [[targets]]")
+
+    targets = []
+    outputs: Dict[Path, int] = {}
+    for number, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Target #{number} in {path} is not a table")
+        if "output" not in entry:
+            raise ValueError(f"Target #{number} in {path} has no 'output'")
+        target = _target_from_entry(entry, data, base_dir)
+        output = Path(os.path.abspath(target.output))
+        if output in outputs:
+            raise ValueError(
+                f"Targets #{outputs[output]} and #{number} in {path} both write {target.output}"
+            )
+        outputs[output] = number
+        targets.append(target)
+    return targets
+
+
+def _target_from_entry(
+    entry: Dict[str, Any], defaults: Dict[str, Any], base_dir: Path
+) -> BuildTarget:
+    """Build a BuildTarget from a manifest entry and top-level defaults.
+
+    Raises:
+        ValueError: If a value has the wrong type or the entry selects no rules.
+    """
+    def option(key: str, default: Any) -> Any:
+        return entry.get(key, defaults.get(key, default))
+
+    output = path_value(entry, "output", "", base_dir)
+    select = entry.get("select", [])
+    patterns = string_list(entry.get("select_glob", []), "select_glob")
+    tags = string_list(entry.get("select_tags", []), "select_tags")
+
+    expression = None
+    if select == "all":
+        mode, select = SelectionMode.ALL, []
+    else:
+        mode = SelectionMode.SPECIFIC
+        if isinstance(select, str):
+            # Any other string is a selection expression
+            expression, select = select, []
+        select = string_list(select, "select")
+        if not select and not patterns and not tags and not expression:
+            raise ValueError(f"Target '{entry['output']}' selects no rules")
+
+    name = entry.get("name", entry["output"])
+    if not isinstance(name, str):
+        raise ValueError(f"Target '{entry['output']}' has a 'name' that is not a string")
+    return BuildTarget(
+        name=name,
+        output=output,
+        rules_directory=path_value(
+            entry if "rules_directory" in entry else defaults, "rules_directory", "rules", base_dir
+        ),
+        selected_rules=select,
+        patterns=patterns,
+        tags=tags,
+        expression=expression,
+        selection_mode=mode,
+        include_toc=bool(option("include_toc", True)),
+        embed_manifest=bool(option("manifest", True)),
+        backup=bool(option("backup", False)),
+    )
+
+
+class BuildRunner:
+    """Builds many targets, sharing discovery and section processing.
+
+    Each distinct rules directory is discovered once, and each rule file is
+    read and formatted at most once no matter how many targets include it.
+    Targets are then assembled and written concurrently on a thread pool.
+
+    Example:
+        >>> runner = BuildRunner(load_build_manifest(Path("rules-build.toml")))
+        >>> summary = runner.run()
+        >>> len(summary.failed)
+        0
+    """
+
+    def __init__(
+        self,
+        targets: List[BuildTarget],
+        jobs: Optional[int] = None,
+        combiner: Optional[Combiner] = None,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            targets: Targets to build.
+            jobs: Worker threads; defaults to the CPU count plus four, capped at 32.
+            combiner: Engine whose caches are shared by all targets; a new
+                one is created if omitted.
+        """
+        self._targets = targets
+        self._jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self._combiner = combiner or Combiner()
+        self._catalogs: Dict[Path, RuleCatalog] = {}
+        self._discovery_errors: Dict[Path, OSError] = {}
+        self._logger = logger.bind(component="build")
+
+    def run(
+        self, on_result: Optional[Callable[[TargetResult], None]] = None
+    ) -> BuildSummary:
+        """Build every target.
+
+        Args:
+            on_result: Callback invoked as each target finishes.
+
+        Returns:
+            BuildSummary with per-target results in manifest order.
+        """
+        started = time.perf_counter()
+        summary = BuildSummary()
+
+        for rules_dir in dict.fromkeys(target.rules_directory for target in self._targets):
+            try:
+                self._catalogs[rules_dir] = self._combiner.discover(rules_dir)
+            except ValueError:
+                # Reported per target as "no rule files found"
+                self._catalogs[rules_dir] = RuleCatalog([])
+            except OSError as e:
+                # Reported by each target built from the directory
+                self._logger.error(f"Cannot discover rules in {rules_dir}: {e}")
+                self._catalogs[rules_dir] = RuleCatalog([])
+                self._discovery_errors[rules_dir] = e
+        summary.discovery_seconds = time.perf_counter() - started
+
+        results: Dict[int, TargetResult] = {}
+        with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            futures = {
+                executor.submit(self._build_target, target): index
+                for index, target in enumerate(self._targets)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result is not None:
+                    on_result(result)
+
+        summary.results = [results[index] for index in range(len(self._targets))]
+        summary.total_seconds = time.perf_counter() - started
+        self._logger.info(
+            f"Built {len(summary.results)} targets in {summary.total_seconds:.2f}s "
+            f"({len(summary.failed)} failed)"
+        )
+        return summary
+
+    def _build_target(self, target: BuildTarget) -> TargetResult:
+        """Assemble and write one target, capturing any error."""
+        started = time.perf_counter()
+        result = TargetResult(target=target)
+        try:
+            if target.rules_directory in self._discovery_errors:
+                raise self._discovery_errors[target.rules_directory]
+            rules = select_rules(
+                self._catalogs[target.rules_directory],
+                target.selection_mode,
+                target.selected_rules,
+                target.patterns,
+                target.tags,
+                target.expression,
+            )
+            if not rules:
+                raise ValueError(f"No rule files found in {target.rules_directory}")
+
+            config = CombinationConfig(
+                rules_directory=target.rules_directory,
+                output_file=target.output,
+                selected_rules=target.selected_rules,
+                include_toc=target.include_toc,
+                backup_existing=target.backup,
+                selection_mode=target.selection_mode,
+                selected_patterns=target.patterns,
+                selected_tags=target.tags,
+                selection_expression=target.expression,
+                embed_manifest=target.embed_manifest,
+            )
+            combined = self._combiner.combine(config, rules)
+            patch_result = self._combiner.write(config, combined)
+
+            result.rule_count = len(rules)
+            result.output_size = len(combined.content)
+            result.write_mode = patch_result.mode
+        except Exception as e:
+            self._logger.error(f"Target {target.name} failed: {e}")
+            result.error = str(e)
+
+        result.seconds = time.perf_counter() - started
+        return result
@@ -0,0 +1,292 @@
+"""Indexed collection of discovered rule files."""
+
+import bisect
+import fnmatch
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .models import RuleFile
+
+if TYPE_CHECKING:
+    from .graph import DependencyGraph
+
+
+# Numeric fields that bitset comparisons can filter on
+_NUMERIC_FIELDS: Dict[str, Callable[[RuleFile], int]] = {
+    "tokens": lambda rule: rule.estimated_tokens,
+    "size": lambda rule: rule.file_size,
+    "priority": lambda rule: rule.priority,
+}
+
+
+def positions_to_mask(positions: Iterable[int], size: int) -> int:
+    """Build a bitset with bit *i* set for each position *i*.
+
+    Runs in O(size / 8 + len(positions)), unlike OR-ing ``1 << i`` per
+    position, which copies the growing integer every time.
+    """
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def mask_to_positions(mask: int) -> List[int]:
+    """Return the positions of the set bits of a bitset, ascending."""
+    # bin() runs in C; scanning its reversed digits finds the set bits
+    digits = bin(mask)[:1:-1]
+    positions = []
+    position = digits.find("1")
+    while position != -1:
+        positions.append(position)
+        position = digits.find("1", position + 1)
+    return positions
+
+
+class RuleCatalog(Sequence[RuleFile]):
+    """Discovered rules with constant-time lookups and precomputed totals.
+
+    A catalog behaves like a read-only list of rules in discovery order, and
+    also indexes them by filename, path and frontmatter tag so membership
+    tests, lookups, subsets and tag queries never scan the whole catalog.
+    Total size and token estimates are computed once at construction.
+    Bitsets of the rules matching a tag, glob or numeric comparison, used
+    by selection expressions, are built on first use and cached, as is the
+    ``requires``/``after`` dependency graph. The content-hash index needs every
+    file to be read, so it is built on the first ``by_hash`` call. The lazily
+    built caches are guarded by locks, so a catalog can be shared between
+    threads.
+
+    Example:
+        >>> catalog = RuleCatalog(engine.iter_rules())
+        >>> "python-coding.md" in catalog
+        True
+        >>> catalog.subset(["b.md", "a.md"])  # catalog order
+        [RuleFile(filename='a.md', ...), RuleFile(filename='b.md', ...)]
+    """
+
+    def __init__(self, rules: Iterable[RuleFile]) -> None:
+        """Build the indexes.
+
+        Args:
+            rules: Rule files in display order. If two share a filename, the
+                first wins in filename lookups.
+        """
+        self._rules: List[RuleFile] = list(rules)
+        self._positions: Dict[str, int] = {}
+        self._paths: Dict[Path, RuleFile] = {}
+        self._tags: Dict[str, List[int]] = {}
+        for position, rule in enumerate(self._rules):
+            self._positions.setdefault(rule.filename, position)
+            self._paths.setdefault(rule.path, rule)
+            for tag in rule.tags:
+                self._tags.setdefault(tag, []).append(position)
+        self.total_size = sum(rule.file_size for rule in self._rules)
+        self.total_tokens = sum(rule.estimated_tokens for rule in self._rules)
+        # Catalogs are shared across threads by the build runner and the
+        # daemon, so the lazily built indexes are guarded: one lock for the
+        # hash index and dependency graph, another for the cheap bitset caches
+        self._index_lock = threading.Lock()
+        self._hashes: Optional[Dict[str, List[RuleFile]]] = None
+        self._graph: Optional["DependencyGraph"] = None
+        self._mask_lock = threading.Lock()
+        self._masks: Dict[Tuple[str, ...], int] = {}
+        self._sorted: Dict[str, Tuple[List[int], List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __iter__(self) -> Iterator[RuleFile]:
+        return iter(self._rules)
+
+    @overload
+    def __getitem__(self, position: int) -> RuleFile: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[RuleFile]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[RuleFile, List[RuleFile]]:
+        return self._rules[position]
+
+    def __contains__(self, item: object) -> bool:
+        """Check membership by filename or by rule."""
+        if isinstance(item, RuleFile):
+            return self._paths.get(item.path) is item
+        return item in self._positions
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RuleCatalog):
+            return self._rules == other._rules
+        if isinstance(other, list):
+            return self._rules == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RuleCatalog({len(self._rules)} rules)"
+
+    @property
+    def filenames(self) -> List[str]:
+        """Filenames in catalog order."""
+        return [rule.filename for rule in self._rules]
+
+    def get(self, filename: str) -> Optional[RuleFile]:
+        """Return the rule with a filename, or None."""
+        position = self._positions.get(filename)
+        return None if position is None else self._rules[position]
+
+    def index_of(self, filename: str) -> int:
+        """Return a rule's 0-based position in the catalog.
+
+        Raises:
+            KeyError: If no rule has the filename.
+        """
+        return self._positions[filename]
+
+    def by_path(self, path: Path) -> Optional[RuleFile]:
+        """Return the rule at a path, or None."""
+        return self._paths.get(path)
+
+    @property
+    def tags(self) -> Dict[str, int]:
+        """Number of rules carrying each tag, by tag name."""
+        return {tag: len(positions) for tag, positions in sorted(self._tags.items())}
+
+    def with_tags(self, tags: Iterable[str]) -> List[RuleFile]:
+        """Return the rules carrying any of the tags, in catalog order.
+        
+        Tags are matched case-insensitively through the tag index, so no
+        rule file is read.
+        
+        Example:
+            >>> [rule.filename for rule in catalog.with_tags(["python", "testing"])]
+            ['python-coding.md', 'python-testing.md']
+        """
+        positions: Set[int] = set()
+        for tag in tags:
+            positions.update(self._tags.get(tag.lower(), ()))
+        return [self._rules[position] for position in sorted(positions)]
+
+    def tag_mask(self, tag: str) -> int:
+        """Return the bitset of rules carrying a tag."""
+        tag = tag.lower()
+        key = ("tag", tag)
+        with self._mask_lock:
+            if key not in self._masks:
+                self._masks[key] = positions_to_mask(self._tags.get(tag, ()), len(self._rules))
+            return self._masks[key]
+
+    def glob_mask(self, pattern: str) -> int:
+        """Return the bitset of rules whose filename matches a glob."""
+        key = ("glob", pattern)
+        with self._mask_lock:
+            if key not in self._masks:
+                self._masks[key] = positions_to_mask(
+                    (
+                        position for position, rule in enumerate(self._rules)
+                        if fnmatch.fnmatchcase(rule.filename, pattern)
+                    ),
+                    len(self._rules),
+                )
+            return self._masks[key]
+
+    def field_mask(self, field: str, operator: str, value: int) -> int:
+        """Return the bitset of rules whose numeric field compares true.
+
+        Rules are sorted by the field once; each comparison is then a
+        binary search plus the bits of the matching slice.
+
+        Args:
+            field: ``tokens``, ``size`` or ``priority``.
+            operator: One of ``<``, ``<=``, ``>``, ``>=``, ``=`` or ``!=``.
+            value: Value to compare with.
+
+        Raises:
+            ValueError: If the field or operator is unknown.
+        """
+        key = ("field", field, operator, str(value))
+        with self._mask_lock:
+            if key in self._masks:
+                return self._masks[key]
+            if field not in _NUMERIC_FIELDS:
+                raise ValueError(
+                    f"Cannot compare {field!r}; choose from {', '.join(_NUMERIC_FIELDS)}"
+                )
+            if field not in self._sorted:
+                order = sorted(
+                    range(len(self._rules)), key=lambda p: _NUMERIC_FIELDS[field](self._rules[p])
+                )
+                self._sorted[field] = ([_NUMERIC_FIELDS[field](self._rules[p]) for p in order], order)
+            values, order = self._sorted[field]
+
+            low, high = bisect.bisect_left(values, value), bisect.bisect_right(values, value)
+            slices = {
+                "<": order[:low], "<=": order[:high], ">": order[high:], ">=": order[low:],
+                "=": order[low:high], "!=": order[:low] + order[high:],
+            }
+            if operator not in slices:
+                raise ValueError(f"Unknown comparison operator {operator!r}")
+            self._masks[key] = positions_to_mask(slices[operator], len(self._rules))
+            return self._masks[key]
+
+    @property
+    def graph(self) -> "DependencyGraph":
+        """Dependency graph of the rules' ``requires`` and ``after`` declarations."""
+        with self._index_lock:
+            if self._graph is None:
+                from .graph import DependencyGraph
+                self._graph = DependencyGraph(self)
+        return self._graph
+
+    def by_hash(self, sha256: str) -> List[RuleFile]:
+        """Return the rules whose decompressed content has a SHA-256 digest.
+
+        The first call reads and hashes every rule; later calls are lookups.
+        Rules that cannot be read are left out of the index.
+        """
+        with self._index_lock:
+            if self._hashes is None:
+                self._hashes = self._build_hash_index()
+        return list(self._hashes.get(sha256, ()))
+
+    def subset(self, filenames: Iterable[str]) -> List[RuleFile]:
+        """Return the named rules in catalog order, ignoring unknown names.
+
+        Runs in O(m log m) for m names, independent of the catalog size.
+        """
+        positions = {
+            self._positions[name] for name in filenames if name in self._positions
+        }
+        return [self._rules[position] for position in sorted(positions)]
+
+    def missing(self, filenames: Iterable[str]) -> List[str]:
+        """Return the names that match no rule, in the order given."""
+        return [name for name in filenames if name not in self._positions]
+
+    def _build_hash_index(self) -> Dict[str, List[RuleFile]]:
+        """Hash every rule's content."""
+        from .manifest import hash_content
+        from .processor import RuleProcessor
+
+        processor = RuleProcessor()
+        hashes: Dict[str, List[RuleFile]] = {}
+        for rule in self._rules:
+            try:
+                digest = hash_content(processor.read_rule_content(rule.path))
+            except (OSError, ValueError):
+                continue
+            hashes.setdefault(digest, []).append(rule)
+        return hashes
@@ -1,39 +1,287 @@
 """Command-line interface for the Rules Combiner CLI."""
 
+import re
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple, Union
 
 import click
-from rich.console import Console
+from click.core import ParameterSource
 
-from .discovery import RuleDiscoveryEngine  
-from .models import CombinationConfig
-from .output import OutputGenerator
-from .processor import RuleProcessor
-from .selector import InteractiveSelector
+from . import __version__
+from .completion import (
+    complete_names,
+    complete_profiles,
+    complete_selection,
+    complete_tags,
+)
+from .log import set_level
+
+if TYPE_CHECKING:
+    from .api import CombineResult
+    from .catalog import RuleCatalog
+    from .manifest import SourceManifest
+    from .models import CombinationConfig, RuleFile, SelectionMode
+    from .processor import RuleProcessor
+    from .reporting import PorcelainReporter, RichReporter
+    from .timing import RunTimer, _DisabledTimer
+
+    Reporter = Union[PorcelainReporter, RichReporter]
+    Timer = Union[RunTimer, _DisabledTimer]
+
+
+# Output formats of list-rules; rules_combiner.listing renders all but the
+# table, and is only imported once the command runs
+LIST_FORMATS = ("table", "json", "ndjson", "tsv")
+
+
+class _LazyConsole:
+    """Stand-in for a rich Console that imports rich on first use.
+    
+    Engine modules and rich are imported inside the commands that need them,
+    so ``--help``, ``--version`` and cheap subcommands start quickly.
+    """
+    
+    def __init__(self) -> None:
+        self._console: Optional[Any] = None
+    
+    def load(self) -> Any:
+        """Return the real rich Console, creating it on first use."""
+        if self._console is None:
+            from rich.console import Console
+            
+            self._console = Console()
+        return self._console
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+
+console = _LazyConsole()
 
 
-console = Console()
+class ByteSize(click.ParamType):
+    """Click parameter type accepting sizes like ``512K``, ``64M`` or ``1G``."""
+    
+    name = "size"
+    _UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+    
+    def convert(
+        self, value: object, param: Optional[click.Parameter], ctx: Optional[click.Context]
+    ) -> int:
+        if isinstance(value, int):
+            return value
+        match = re.fullmatch(r"\s*(\d+)\s*([KMG]?)B?\s*", str(value), re.IGNORECASE)
+        if not match:
+            self.fail(f"{value!r} is not a size such as 512K, 64M or 1G", param, ctx)
+        return int(match.group(1)) * self._UNITS[match.group(2).upper()]
+
+
+def _timings_option(command: Any) -> Any:
+    """Add the --timings option shared by commands that can report timings."""
+    return click.option(
+        "--timings",
+        "timings_format",
+        type=click.Choice(["table", "json"]),
+        is_flag=False,
+        flag_value="table",
+        default=None,
+        help="Report per-phase wall/CPU time, files opened, bytes read and written, "
+        "and cache hit rates on stderr, as a table (default) or JSON"
+    )(command)
+
+
+def _start_timer(timings_format: Optional[str]) -> "Timer":
+    """Return a timer that reports when the command finishes, or a no-op one."""
+    from .timing import DISABLED_TIMER, RunTimer
+    
+    if timings_format is None:
+        return DISABLED_TIMER
+    
+    timer = RunTimer()
+    
+    def report() -> None:
+        text = timer.format_json() if timings_format == "json" else timer.format_table()
+        click.echo(text, err=True)
+    
+    # Runs however the command ends, including sys.exit
+    click.get_current_context().call_on_close(report)
+    return timer
+
+
+def _iter_sections(
+    processor: "RuleProcessor",
+    rules: List["RuleFile"],
+    include_toc: bool,
+    manifest: Optional["SourceManifest"],
+    output: Path,
+    reporter: "Reporter",
+) -> Iterator[str]:
+    """Yield the combined document's sections, reporting progress per rule."""
+    current_rule: List["RuleFile"] = []
+    
+    try:
+        with reporter.processing(len(rules)) as report_rule:
+            def on_rule(rule: "RuleFile") -> None:
+                report_rule(rule)
+                current_rule[:] = [rule]
+            
+            yield from processor.iter_sections(
+                rules, include_toc, manifest, output.parent, on_rule=on_rule
+            )
+    except Exception as e:
+        filename = current_rule[0].filename if current_rule else "table of contents"
+        reporter.error(f"Error processing {filename}: {e}")
+        sys.exit(1)
+
+
+def _generate_via_daemon(
+    rules_dir: Path,
+    output: Path,
+    mode: "SelectionMode",
+    filenames: List[str],
+    patterns: List[str],
+    tags: List[str],
+    expression: Optional[str],
+    include_toc: bool,
+    backup: bool,
+    embed_manifest: bool,
+    reporter: "Reporter",
+    timer: "Timer",
+) -> bool:
+    """Forward a non-interactive generate to a running daemon.
+    
+    Returns:
+        True if the daemon built the output, False if no compatible daemon
+        is running and the caller should build it locally.
+    """
+    from .daemon import DaemonClient, default_socket_path
+    from .models import SelectionMode
+    
+    socket_path = default_socket_path()
+    if not socket_path.exists():
+        return False
+    
+    client = DaemonClient(socket_path)
+    try:
+        if client.request("ping").get("version") != __version__:
+            return False
+        with timer.phase("daemon"):
+            response = client.request(
+                "generate",
+                rules_dir=str(rules_dir.resolve()),
+                output=str(output.resolve()),
+                all=mode is SelectionMode.ALL,
+                select=filenames,
+                select_glob=patterns,
+                select_tags=tags,
+                select_expr=expression,
+                include_toc=include_toc,
+                backup=backup,
+                manifest=embed_manifest,
+            )
+    except (OSError, ValueError):
+        return False
+    
+    if not response.get("ok"):
+        reporter.error(str(response.get('error')))
+        sys.exit(1)
+    
+    reporter.daemon(socket_path)
+    timer.record_cache("sections", response["section_hits"], response["section_lookups"])
+    if response["backup_path"]:
+        reporter.backup(Path(response["backup_path"]))
+    reporter.written(response["write_mode"], response["offset"], response["bytes_written"])
+    reporter.generated(output, len(response["rules"]), response["output_size"])
+    return True
+
+
+def _combine(
+    config: "CombinationConfig", rules: List["RuleFile"], reporter: "Reporter"
+) -> "CombineResult":
+    """Combine the selected rules in memory, reporting progress per rule."""
+    from .api import Combiner
+    
+    current_rule: List["RuleFile"] = []
+    
+    try:
+        with reporter.processing(len(rules)) as report_rule:
+            def on_rule(rule: "RuleFile") -> None:
+                report_rule(rule)
+                current_rule[:] = [rule]
+            
+            return Combiner().combine(config, rules, on_rule=on_rule)
+    except Exception as e:
+        filename = current_rule[0].filename if current_rule else "table of contents"
+        reporter.error(f"Error processing {filename}: {e}")
+        sys.exit(1)
+
+
+def _resolve_dependencies(
+    catalog: "RuleCatalog", rules: List["RuleFile"], reporter: "Reporter"
+) -> List["RuleFile"]:
+    """Add required rules to an interactive selection and order it by dependency."""
+    try:
+        return catalog.graph.resolve(rules)
+    except ValueError as e:
+        reporter.error(str(e))
+        sys.exit(1)
 
 
 @click.group()
-@click.version_option(version="0.1.0")
-def cli() -> None:
+@click.version_option(version=__version__)
+@click.option(
+    "--verbose",
+    "-v",
+    is_flag=True,
+    help="Show debug and info log messages (warnings and errors are always shown)"
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Profile the subcommand with cProfile, writing PATH.pstats and PATH.collapsed (flamegraph stacks)"
+)
+def cli(verbose: bool, profile_path: Optional[Path]) -> None:
     """Rules Combiner CLI - Combine rule files into a single AGENT.md file.
     
     This tool helps you select and combine multiple Markdown rule files from a
     rules directory into a single, well-formatted AGENT.md file with table of
     contents and proper section headers.
     """
-    pass
+    set_level("trace" if verbose else "warning")
+    if profile_path is not None:
+        _start_profiler(profile_path)
+
+
+def _start_profiler(profile_path: Path) -> None:
+    """Profile the rest of the run, saving the profile when the CLI exits."""
+    import cProfile
+    
+    profiler = cProfile.Profile()
+    
+    def save() -> None:
+        from .profiling import write_profile
+        
+        profiler.disable()
+        try:
+            pstats_path, collapsed_path = write_profile(profiler, profile_path)
+        except OSError as e:
+            click.echo(f"Could not write profile: {e}", err=True)
+            return
+        click.echo(f"Profile written to {pstats_path} and {collapsed_path}", err=True)
+    
+    # Runs after the subcommand, however it ends
+    click.get_current_context().call_on_close(save)
+    profiler.enable()
 
 
 @cli.command()
 @click.option(
     "--rules-dir",
-    type=click.Path(exists=True, file_okay=False, path_type=Path),
-    default="rules",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
     help="Directory containing rule files (default: rules)"
 )
 @click.option(
@@ -42,6 +290,55 @@ def cli() -> None:
     default="AGENT.md",
     help="Output file name (default: AGENT.md)"
 )
+@click.option(
+    "--all",
+    "select_all",
+    is_flag=True,
+    help="Select every discovered rule without prompting"
+)
+@click.option(
+    "--select",
+    default=None,
+    shell_complete=complete_selection,
+    help="Rules to combine without prompting: filenames (a.md,b.md) or an expression (e.g. 'tag:python & !*legacy* & tokens<2000')"
+)
+@click.option(
+    "--select-glob",
+    multiple=True,
+    shell_complete=complete_names,
+    help="Glob pattern of rule filenames to combine without prompting (repeatable)"
+)
+@click.option(
+    "--tags",
+    default=None,
+    shell_complete=complete_tags,
+    help="Comma-separated frontmatter tags; combine every rule carrying any of them"
+)
+@click.option(
+    "--config",
+    "config_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="TOML file describing the combination (rules directory, output, selection, options)"
+)
+@click.option(
+    "--use-profile",
+    "profile_name",
+    default=None,
+    shell_complete=complete_profiles,
+    help="Use a saved selection profile; an unchanged profile reuses its cached output"
+)
+@click.option(
+    "--profiles-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default="rules-profiles.toml",
+    help="TOML file holding saved profiles (default: rules-profiles.toml)"
+)
+@click.option(
+    "--save-profile",
+    default=None,
+    help="Save the selection as a new profile in the profiles file"
+)
 @click.option(
     "--no-backup",
     is_flag=True,
@@ -52,94 +349,411 @@ def cli() -> None:
     is_flag=True, 
     help="Skip generating table of contents"
 )
-def generate(rules_dir: Path, output: Path, no_backup: bool, no_toc: bool) -> None:
-    """Generate combined rules file interactively.
+@click.option(
+    "--history",
+    is_flag=True,
+    help="Record revisions in the delta-compressed history instead of timestamped backups"
+)
+@click.option(
+    "--no-manifest",
+    is_flag=True,
+    help="Skip embedding the source manifest used by 'verify'"
+)
+@click.option(
+    "--max-memory",
+    type=ByteSize(),
+    default=None,
+    help="Build through a spooled buffer capped at this size (e.g. 64M) for very large selections"
+)
+@click.option(
+    "--budget",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Warn when the output's estimated token count exceeds this budget; shown live in the selectors"
+)
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    help="Build in this process even if a 'serve' daemon is running"
+)
+@click.option(
+    "--quiet",
+    "-q",
+    is_flag=True,
+    help="Print nothing but errors; requires a non-interactive selection"
+)
+@click.option(
+    "--porcelain",
+    is_flag=True,
+    help="Print stable tab-separated progress lines for scripts; requires a non-interactive selection"
+)
+@click.option(
+    "--picker",
+    is_flag=True,
+    help="Choose rules in a full-screen, keyboard-driven picker (needs a terminal with curses)"
+)
+@_timings_option
+def generate(
+    rules_dir: Optional[Path],
+    output: Path,
+    select_all: bool,
+    select: Optional[str],
+    select_glob: Tuple[str, ...],
+    tags: Optional[str],
+    config_file: Optional[Path],
+    profile_name: Optional[str],
+    profiles_file: Path,
+    save_profile: Optional[str],
+    no_backup: bool,
+    no_toc: bool,
+    history: bool,
+    no_manifest: bool,
+    max_memory: Optional[int],
+    budget: Optional[int],
+    no_daemon: bool,
+    quiet: bool,
+    porcelain: bool,
+    picker: bool,
+    timings_format: Optional[str],
+) -> None:
+    """Generate combined rules file.
     
     Discovers rule files in the specified directory, presents them for
     interactive selection, and combines the selected rules into a single
-    output file.
+    output file. With --all, --select, --select-glob, --tags or --config
+    the selection is made without prompting, for use in scripts and CI.
+    Non-interactive runs are forwarded to a running 'serve' daemon.
+    With --use-profile, a selection saved with --save-profile is reused, and
+    if neither its settings nor its rule files changed since it was last
+    built, the cached output is kept or restored without reading any rule.
+    With --budget, a selection whose estimated output exceeds the token
+    budget is reported as soon as it is made.
+    With --quiet or --porcelain, output is plain text that never goes
+    through rich.
     """
+    from .discovery import RuleDiscoveryEngine
+    from .history import OutputHistory
+    from .manifest import SourceManifest, selection_options
+    from .models import CombinationConfig, SelectionMode
+    from .output import OutputGenerator, SpooledOutputWriter
+    from .processor import RuleProcessor
+    from .query import is_expression
+    from .reporting import PorcelainReporter, RichReporter
+    from .selection import select_rules, split_names
+    from .totals import BYTES_PER_TOKEN, SelectionTotals, budget_warning, output_tokens
+    
+    config: Optional[CombinationConfig] = None
+    if config_file is not None and profile_name is not None:
+        raise click.UsageError("--config and --use-profile cannot be used together")
+    if save_profile is not None and profile_name is not None:
+        raise click.UsageError("--save-profile and --use-profile cannot be used together")
+    if profile_name is not None:
+        from .profiles import load_profile
+        
+        if not profiles_file.is_file():
+            raise click.BadParameter(
+                f"Profiles file '{profiles_file}' does not exist.", param_hint="'--profiles-file'"
+            )
+        try:
+            config = load_profile(profiles_file, profile_name)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--use-profile'")
+    elif config_file is not None:
+        from .config import load_combination_config
+        
+        try:
+            config = load_combination_config(config_file)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--config'")
+    
+    if config is not None:
+        # Explicit command-line options take precedence over the config file
+        ctx = click.get_current_context()
+        if rules_dir is None:
+            rules_dir = config.rules_directory
+        if ctx.get_parameter_source("output") is not ParameterSource.COMMANDLINE:
+            output = config.output_file
+        no_toc = no_toc or not config.include_toc
+        no_backup = no_backup or not config.backup_existing
+        no_manifest = no_manifest or not config.embed_manifest
+        if budget is None:
+            budget = config.token_budget
+    
+    rules_dir = rules_dir if rules_dir is not None else Path("rules")
+    if not rules_dir.is_dir():
+        raise click.BadParameter(
+            f"Directory '{rules_dir}' does not exist.", param_hint="'--rules-dir'"
+        )
+    
+    # A plain filename list keeps its order; anything else is an expression
+    expression = select if select is not None and is_expression(select) else None
+    filenames = [] if expression else split_names(select)
+    patterns = [pattern for value in select_glob for pattern in split_names(value)]
+    tag_names = split_names(tags)
+    if select_all:
+        mode = SelectionMode.ALL
+    elif filenames or patterns or tag_names or expression:
+        mode = SelectionMode.SPECIFIC
+    elif config is not None:
+        mode = config.selection_mode
+        filenames = config.selected_rules
+        patterns = config.selected_patterns
+        tag_names = config.selected_tags
+        expression = config.selection_expression
+    else:
+        mode = SelectionMode.INTERACTIVE
+    
+    if quiet or porcelain:
+        if mode is SelectionMode.INTERACTIVE:
+            raise click.UsageError(
+                "--quiet and --porcelain need --all, --select, --select-glob, --tags or --config"
+            )
+        reporter: "Reporter" = PorcelainReporter(quiet=quiet)
+    else:
+        # rich renderables such as progress bars need the real Console
+        reporter = RichReporter(console.load())
+    timer = _start_timer(timings_format)
+    
+    profile_cache = None
+    if profile_name is not None and not history:
+        from .profiles import CACHED, CURRENT, ProfileCache, build_key
+        
+        profile_key = build_key(CombinationConfig(
+            rules_directory=rules_dir,
+            output_file=output,
+            selected_rules=filenames,
+            selection_mode=mode,
+            selected_patterns=patterns,
+            selected_tags=tag_names,
+            selection_expression=expression,
+            include_toc=not no_toc,
+            embed_manifest=not no_manifest,
+        ), __version__)
+        profile_cache = ProfileCache(profiles_file, profile_name)
+        with timer.phase("profile cache"):
+            status = profile_cache.check(profile_key, rules_dir, output)
+        if status in (CURRENT, CACHED):
+            assert profile_cache.record is not None
+            if status == CACHED:
+                try:
+                    with timer.phase("backup"):
+                        backup_path = None if no_backup else (
+                            OutputGenerator(output).backup_existing_file()
+                        )
+                    if backup_path:
+                        reporter.backup(backup_path)
+                    with timer.phase("write"):
+                        profile_cache.restore(output)
+                except OSError as e:
+                    reporter.error(f"Could not restore cached output: {e}")
+                    sys.exit(1)
+            warning = budget_warning(profile_cache.record.output_size // BYTES_PER_TOKEN, budget)
+            if warning:
+                reporter.warning(warning)
+            reporter.cached(output, profile_cache.record.rule_count, restored=status == CACHED)
+            return
+    
+    # The daemon cannot prompt, stream through a spool or record history, and
+    # profile builds run locally so their inputs can be recorded
+    if (
+        not no_daemon and mode is not SelectionMode.INTERACTIVE
+        and not history and max_memory is None and profile_cache is None
+        and _generate_via_daemon(
+            rules_dir, output, mode, filenames, patterns, tag_names, expression,
+            include_toc=not no_toc, backup=not no_backup, embed_manifest=not no_manifest,
+            reporter=reporter, timer=timer,
+        )
+    ):
+        warning = budget_warning(output_tokens(output) or 0, budget)
+        if warning:
+            reporter.warning(warning)
+        return
+    
     try:
         # Step 1: Discover rule files
-        console.print(f"[cyan]Discovering rule files in: {rules_dir}[/cyan]")
-        discovery_engine = RuleDiscoveryEngine(rules_dir)
-        available_rules = discovery_engine.discover_rules()
+        reporter.discovering(rules_dir)
+        with timer.phase("discovery"):
+            discovery_engine = RuleDiscoveryEngine(rules_dir)
+            available_rules = discovery_engine.discover_catalog()
         
         if not available_rules:
-            console.print(f"[red]No rule files found in {rules_dir}[/red]")
-            console.print("Please ensure the directory contains .md files.")
+            reporter.error(
+                f"No rule files found in {rules_dir}. "
+                "Please ensure the directory contains .md files."
+            )
             sys.exit(1)
         
-        console.print(f"[green]Found {len(available_rules)} rule files[/green]")
+        reporter.discovered(len(available_rules))
+        totals = SelectionTotals(
+            include_toc=not no_toc,
+            embed_manifest=not no_manifest,
+            budget=budget,
+            current_tokens=output_tokens(output),
+        )
         
-        # Step 2: Interactive selection
-        console.print("\n[cyan]Select rules to combine:[/cyan]")
-        selector = InteractiveSelector(available_rules)
-        selected_filenames = selector.get_user_selection()
+        # Step 2: Select rules, prompting only in interactive mode
+        if mode is SelectionMode.INTERACTIVE and picker:
+            from .picker import CursesPicker, picker_available
+            
+            if not picker_available() or not sys.stdin.isatty():
+                reporter.error("--picker needs an interactive terminal with curses support")
+                sys.exit(1)
+            with timer.phase("selection"):
+                selected_filenames = CursesPicker(available_rules, totals).run()
+            
+            if not selected_filenames:
+                reporter.warning("No rules selected. Exiting.")
+                sys.exit(0)
+            
+            selected_rules = _resolve_dependencies(
+                available_rules, available_rules.subset(selected_filenames), reporter
+            )
+        elif mode is SelectionMode.INTERACTIVE:
+            from .selector import InteractiveSelector
+            
+            reporter.selecting()
+            with timer.phase("selection"):
+                selector = InteractiveSelector(available_rules, totals)
+                selected_filenames = selector.get_user_selection()
+            
+            if not selected_filenames:
+                reporter.warning("No rules selected. Exiting.")
+                sys.exit(0)
+            
+            # Look up the selected rules in the catalog's filename index
+            selected_rules = _resolve_dependencies(
+                available_rules, available_rules.subset(selected_filenames), reporter
+            )
+        else:
+            try:
+                with timer.phase("selection"):
+                    selected_rules = select_rules(
+                        available_rules, mode, filenames, patterns, tag_names, expression
+                    )
+            except ValueError as e:
+                reporter.error(str(e))
+                sys.exit(1)
         
-        if not selected_filenames:
-            console.print("[yellow]No rules selected. Exiting.[/yellow]")
-            sys.exit(0)
+        # The prompt counted its selection and showed any budget warning when
+        # confirming; the picker counted the picked rules but not what they
+        # require, and the other modes counted nothing yet
+        if mode is not SelectionMode.INTERACTIVE or picker:
+            counted = set(selected_filenames) if mode is SelectionMode.INTERACTIVE else set()
+            for rule in selected_rules:
+                if rule.filename not in counted:
+                    totals.add(rule)
+            warning = totals.budget_warning()
+            if warning:
+                reporter.warning(warning)
         
-        # Filter selected rules
-        selected_rules = [
-            rule for rule in available_rules 
-            if rule.filename in selected_filenames
-        ]
+        reporter.selected(len(selected_rules))
         
-        console.print(f"\n[green]Processing {len(selected_rules)} selected rules...[/green]")
+        if mode is SelectionMode.INTERACTIVE:
+            # The output records the confirmed names as its selection
+            mode, filenames = SelectionMode.SPECIFIC, selected_filenames
+        combine_config = CombinationConfig(
+            rules_directory=rules_dir,
+            output_file=output,
+            selected_rules=filenames,
+            include_toc=not no_toc,
+            backup_existing=not no_backup,
+            selection_mode=mode,
+            selected_patterns=patterns,
+            embed_manifest=not no_manifest,
+            selected_tags=tag_names,
+            selection_expression=expression,
+        )
         
         # Step 3: Process and combine rules
-        processor = RuleProcessor()
-        combined_content_parts = []
-        
-        # Generate table of contents if requested
-        if not no_toc:
-            toc = processor.generate_table_of_contents(selected_rules)
-            combined_content_parts.append(toc)
-        
-        # Process each selected rule
-        for rule in selected_rules:
-            console.print(f"Processing: {rule.filename}")
-            
-            try:
-                rule_content = processor.read_rule_content(rule.path)
-                formatted_section = processor.format_rule_section(rule_content, rule.title)
-                combined_content_parts.append(formatted_section)
-                
-            except Exception as e:
-                console.print(f"[red]Error processing {rule.filename}: {e}[/red]")
-                sys.exit(1)
-        
-        # Combine all parts
-        combined_content = "\n".join(combined_content_parts)
+        spool = None
+        manifest = None
+        with timer.phase("processing"):
+            if max_memory is None:
+                combined = _combine(combine_config, selected_rules, reporter)
+                rule_sections = [section for section in combined.sections if section.sha256]
+                timer.record_cache(
+                    "sections",
+                    sum(section.cached for section in rule_sections),
+                    len(rule_sections),
+                )
+            else:
+                # Stream sections through a bounded buffer instead of one big string
+                manifest = None if no_manifest else SourceManifest(options={
+                    "include_toc": not no_toc,
+                    "tool_version": __version__,
+                    **selection_options(combine_config),
+                })
+                spool = SpooledOutputWriter(output, max_memory=max_memory)
+                for section in _iter_sections(
+                    RuleProcessor(), selected_rules, not no_toc, manifest, output, reporter
+                ):
+                    spool.add_section(section)
         
         # Step 4: Generate output
-        console.print(f"\n[cyan]Writing combined rules to: {output}[/cyan]")
+        reporter.writing(output)
         output_generator = OutputGenerator(output, backup=not no_backup)
+        output_history = OutputHistory(output) if history else None
         
-        # Create backup if enabled and file exists
-        if not no_backup:
-            backup_path = output_generator.backup_existing_file()
-            if backup_path:
-                console.print(f"[yellow]Created backup: {backup_path}[/yellow]")
+        with timer.phase("backup"):
+            if output_history:
+                # Capture the current output (including manual edits) before overwriting
+                output_history.record_file()
+            elif not no_backup:
+                # Create backup if enabled and file exists
+                backup_path = output_generator.backup_existing_file()
+                if backup_path:
+                    reporter.backup(backup_path)
         
-        # Write the combined content
-        output_generator.write_combined_rules(combined_content)
+        with timer.phase("write"):
+            if spool is not None:
+                with spool:
+                    trailer = manifest.trailer_for(spool.body_size) if manifest else ""
+                    spool.finalize(trailer)
+            else:
+                # Write the combined content, patching only the sections that changed
+                patch_result = output_generator.write_incremental(combined.content)
+                reporter.written(
+                    patch_result.mode, patch_result.offset, patch_result.bytes_written
+                )
+        
+        if output_history:
+            with timer.phase("history"):
+                revision = output_history.record_file()
+            if revision:
+                reporter.history(revision.number, revision.stored_size)
         
         # Validate output
-        if output_generator.validate_output():
-            console.print(f"[green]✓ Successfully generated {output}[/green]")
-            console.print(f"[dim]Combined {len(selected_rules)} rules into {output.stat().st_size:,} bytes[/dim]")
+        with timer.phase("validation"):
+            valid = output_generator.validate_output()
+        if valid:
+            reporter.generated(output, len(selected_rules), output.stat().st_size)
         else:
-            console.print("[red]✗ Output file validation failed[/red]")
+            reporter.error("Output file validation failed")
             sys.exit(1)
+        
+        if profile_cache is not None:
+            # Tags and expressions can depend on any rule's content, so watch them all
+            inputs = available_rules if tag_names or expression else selected_rules
+            try:
+                profile_cache.store(profile_key, rules_dir, output, selected_rules, inputs)
+            except OSError as e:
+                reporter.warning(f"Could not cache profile output: {e}")
+        
+        if save_profile is not None:
+            from .profiles import save_profile as append_profile
+            
+            try:
+                append_profile(profiles_file, save_profile, [rule.filename for rule in selected_rules])
+            except (OSError, ValueError) as e:
+                reporter.error(f"Could not save profile: {e}")
+                sys.exit(1)
+            reporter.profile_saved(save_profile, profiles_file)
             
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operation cancelled by user.[/yellow]")
+        reporter.warning("Operation cancelled by user.")
         sys.exit(0)
     except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
+        reporter.error(f"Unexpected error: {e}")
         sys.exit(1)
 
 
@@ -149,17 +763,87 @@ def generate(rules_dir: Path, output: Path, no_backup: bool, no_toc: bool) -> No
     type=click.Path(exists=True, file_okay=False, path_type=Path),
     default="rules"
 )
-def list_rules(rules_dir: Path) -> None:
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(LIST_FORMATS),
+    default="table",
+    help="Output format; json, ndjson and tsv stream one record per rule"
+)
+@click.option(
+    "--fields",
+    default=None,
+    help="Comma-separated fields for json/ndjson/tsv: filename,path,title,size,tokens,tags,priority (default: all but tags,priority)"
+)
+@click.option(
+    "--sort",
+    "sort_key",
+    default=None,
+    help="Sort by a field; prefix with '-' for descending order (e.g. -size)"
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Show at most this many rules"
+)
+@_timings_option
+def list_rules(
+    rules_dir: Path,
+    output_format: str,
+    fields: Optional[str],
+    sort_key: Optional[str],
+    limit: Optional[int],
+    timings_format: Optional[str]
+) -> None:
     """List all available rule files.
     
     Shows all discoverable rule files in the specified directory with
-    their titles and file sizes.
+    their titles and file sizes. Machine-readable formats print only the
+    requested fields and skip work the fields do not need, e.g. title
+    extraction when "title" is not requested.
     """
+    from .catalog import RuleCatalog
+    from .discovery import RuleDiscoveryEngine
+    from .listing import iter_lines, order_rules, parse_fields, parse_sort
+    
+    if fields is not None and output_format == "table":
+        raise click.BadParameter("--fields requires --format json, ndjson or tsv", param_hint="--fields")
+    try:
+        field_names = parse_fields(fields)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--fields")
+    if sort_key is not None:
+        try:
+            sort_field, _ = parse_sort(sort_key)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--sort")
+    
+    discovery_engine = RuleDiscoveryEngine(rules_dir)
+    timer = _start_timer(timings_format)
+    
+    if output_format != "table":
+        needed = set(field_names)
+        if sort_key is not None:
+            needed.add(sort_field)
+        try:
+            # Discovery and printing are interleaved, so they share a phase
+            with timer.phase("discovery+output"):
+                rules = order_rules(discovery_engine.iter_rules(needed), sort_key, limit)
+                for line in iter_lines(rules, field_names, output_format):
+                    click.echo(line)
+        except Exception as e:
+            click.echo(f"Error listing rules: {e}", err=True)
+            sys.exit(1)
+        return
+    
     try:
         console.print(f"[cyan]Listing rule files in: {rules_dir}[/cyan]\n")
         
-        discovery_engine = RuleDiscoveryEngine(rules_dir)
-        available_rules = discovery_engine.discover_rules()
+        with timer.phase("discovery"):
+            available_rules = RuleCatalog(
+                order_rules(discovery_engine.iter_rules(), sort_key, limit)
+            )
         
         if not available_rules:
             console.print(f"[red]No rule files found in {rules_dir}[/red]")
@@ -173,21 +857,252 @@ def list_rules(rules_dir: Path) -> None:
         table.add_column("Size", justify="right", style="blue")
         table.add_column("~Tokens", justify="right", style="yellow")
         
-        total_tokens = 0
         for rule in available_rules:
             file_size = f"{rule.file_size:,} bytes" if rule.file_size > 0 else "unknown"
             token_estimate = f"~{rule.estimated_tokens:,}" if rule.estimated_tokens > 0 else "~0"
-            total_tokens += rule.estimated_tokens
             table.add_row(rule.filename, rule.title, file_size, token_estimate)
         
-        console.print(table)
-        console.print(f"\n[dim]Total: {len(available_rules)} rule files, ~{total_tokens:,} estimated tokens[/dim]")
+        with timer.phase("output"):
+            console.print(table)
+        console.print(f"\n[dim]Total: {len(available_rules)} rule files, ~{available_rules.total_tokens:,} estimated tokens[/dim]")
         
     except Exception as e:
         console.print(f"[red]Error listing rules: {e}[/red]")
         sys.exit(1)
 
 
+@cli.command()
+@click.argument(
+    "manifest_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default="rules-build.toml",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker threads (default: based on CPU count)"
+)
+def build(manifest_file: Path, jobs: Optional[int]) -> None:
+    """Generate many outputs from a build manifest in one run.
+    
+    Reads MANIFEST_FILE (default: rules-build.toml), discovers each rules
+    directory once, and builds every target on a worker pool. Exits with
+    status 1 if any target fails.
+    """
+    from .build import BuildRunner, load_build_manifest
+    
+    try:
+        targets = load_build_manifest(manifest_file)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    
+    console.print(f"[cyan]Building {len(targets)} targets from: {manifest_file}[/cyan]")
+    summary = BuildRunner(targets, jobs=jobs).run()
+    
+    from rich.table import Table
+    
+    table = Table(title="Build Results")
+    table.add_column("Target", style="magenta")
+    table.add_column("Rules", justify="right", style="cyan")
+    table.add_column("Size", justify="right", style="blue")
+    table.add_column("Write", style="green")
+    table.add_column("Time", justify="right", style="yellow")
+    
+    for result in summary.results:
+        if result.ok:
+            table.add_row(
+                result.target.name,
+                str(result.rule_count),
+                f"{result.output_size:,} bytes",
+                result.write_mode,
+                f"{result.seconds * 1000:.1f} ms",
+            )
+        else:
+            table.add_row(
+                result.target.name, "-", "-", f"[red]failed: {result.error}[/red]",
+                f"{result.seconds * 1000:.1f} ms",
+            )
+    
+    console.print(table)
+    console.print(
+        f"\n[dim]Built {len(summary.results) - len(summary.failed)}/{len(summary.results)} "
+        f"targets, {summary.total_bytes:,} bytes in {summary.total_seconds:.2f}s "
+        f"(discovery {summary.discovery_seconds:.2f}s, "
+        f"{summary.targets_per_second:,.1f} targets/s)[/dim]"
+    )
+    
+    if summary.failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--output",
+    type=click.Path(path_type=Path),
+    default="AGENT.md",
+    help="Generated file to check (default: AGENT.md)"
+)
+def verify(output: Path) -> None:
+    """Check whether a generated file is up to date with its sources.
+    
+    Uses the manifest embedded by 'generate'. Sources are only re-hashed
+    when their size or modification time changed. Exits with status 1 if
+    the output is stale.
+    """
+    from .manifest import StalenessChecker
+    
+    result = StalenessChecker(output, tool_version=__version__).verify()
+    
+    if result.fresh:
+        console.print(
+            f"[green]✓ {output} is up to date[/green] "
+            f"[dim]({result.checked} sources, {result.hashed} hashed)[/dim]"
+        )
+        return
+    
+    console.print(f"[red]✗ {output} is stale: {result.reason}[/red]")
+    for source in result.stale_sources:
+        console.print(f"  • {source}")
+    sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Unix socket to listen on (default: $RULES_COMBINER_SOCKET or a per-user runtime path)"
+)
+def serve(socket_path: Optional[Path]) -> None:
+    """Run a daemon that keeps rules warm and serves generate requests.
+    
+    Discovered catalogs and processed sections stay cached between
+    requests and are refreshed when rule files change. While the daemon
+    runs, non-interactive 'generate' calls are forwarded to it.
+    """
+    from .daemon import RulesDaemon, default_socket_path
+    
+    daemon = RulesDaemon(socket_path or default_socket_path())
+    console.print(f"[cyan]Serving on: {daemon.socket_path}[/cyan] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Daemon stopped.[/yellow]")
+
+
+@cli.command()
+@click.argument("shell", type=click.Choice(["bash", "zsh", "fish"]))
+def completion(shell: str) -> None:
+    """Print the shell completion script for SHELL.
+    
+    Completes rule filenames and tags for 'generate --select', '--tags' and
+    '--select-glob', and profile names for '--use-profile'. Candidates come
+    from a snapshot of the rules directory that is only rebuilt when files
+    are added, removed, renamed or edited, so completing stays fast on large
+    or network-mounted directories. Enable it with, for example:
+    
+        eval "$(rules-combiner completion bash)"
+    """
+    from click.shell_completion import get_completion_class
+    
+    prog_name = click.get_current_context().find_root().info_name or "rules-combiner"
+    complete_var = f"_{prog_name.replace('-', '_').upper()}_COMPLETE"
+    completion_class = get_completion_class(shell)
+    assert completion_class is not None
+    click.echo(completion_class(cli, {}, prog_name, complete_var).source())
+
+
+@cli.group()
+def history() -> None:
+    """Inspect and restore previous revisions of a generated file."""
+    pass
+
+
+_history_output_option = click.option(
+    "--output",
+    type=click.Path(path_type=Path),
+    default="AGENT.md",
+    help="Output file whose history to use (default: AGENT.md)"
+)
+
+
+@history.command("list")
+@_history_output_option
+def history_list(output: Path) -> None:
+    """List recorded revisions of the output file."""
+    from .history import OutputHistory
+    
+    revisions = OutputHistory(output).list_revisions()
+    if not revisions:
+        console.print(f"[yellow]No history recorded for {output}[/yellow]")
+        return
+    
+    from rich.table import Table
+    
+    table = Table(title=f"History of {output}")
+    table.add_column("Rev", justify="right", style="cyan")
+    table.add_column("Recorded", style="green")
+    table.add_column("Kind", style="magenta")
+    table.add_column("Size", justify="right", style="blue")
+    table.add_column("Stored", justify="right", style="yellow")
+    
+    for revision in revisions:
+        table.add_row(
+            str(revision.number),
+            revision.timestamp,
+            revision.kind,
+            f"{revision.content_size:,} bytes",
+            f"{revision.stored_size:,} bytes",
+        )
+    
+    console.print(table)
+    stored = sum(revision.stored_size for revision in revisions)
+    console.print(f"\n[dim]Total: {len(revisions)} revisions in {stored:,} bytes[/dim]")
+
+
+@history.command("diff")
+@click.argument("old", type=int)
+@click.argument("new", type=int)
+@_history_output_option
+def history_diff(old: int, new: int, output: Path) -> None:
+    """Show a unified diff between revisions OLD and NEW."""
+    from .history import OutputHistory
+    
+    try:
+        diff_text = OutputHistory(output).diff(old, new)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    
+    if diff_text:
+        click.echo(diff_text, nl=False)
+    else:
+        console.print(f"[dim]Revisions {old} and {new} are identical[/dim]")
+
+
+@history.command("restore")
+@click.argument("number", type=int)
+@_history_output_option
+def history_restore(number: int, output: Path) -> None:
+    """Restore the output file to revision NUMBER."""
+    from .history import OutputHistory
+    
+    try:
+        OutputHistory(output).restore(number)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    
+    console.print(f"[green]✓ Restored {output} to revision {number}[/green]")
+
+
 def main() -> None:
     """Main entry point for the CLI."""
     cli()
@@ -0,0 +1,239 @@
+"""Shell completion of rule filenames, tags and profiles.
+
+Completing ``generate --select`` must not run discovery on every TAB
+press, which would read the head of every rule file. Instead the
+filenames and tags of a rules directory are kept in a small JSON snapshot
+in the user's cache directory, tagged with the modification time of the
+directory and the newest modification time of the files in it. A completion
+stats the directory and loads the snapshot. Adding, removing or renaming a
+rule changes the directory's time and is seen at once; an edited rule, whose
+tags may have changed, is only seen by statting every file, which is done
+at most every ``RECHECK_SECONDS``. Discovery runs again, and the snapshot is
+rewritten, only when either time changed. Completion never fails: any error
+yields no candidates.
+
+The CLI imports this module on every run, so it imports only what
+completing needs, and only once completing; discovery is imported only when
+a snapshot has to be rebuilt.
+
+Example:
+    >>> snapshot = load_snapshot(Path("rules"))
+    >>> snapshot.filenames[:2], snapshot.tags[:2]
+    (['git.md', 'python-coding.md'], ['backend', 'python'])
+"""
+
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional
+
+if TYPE_CHECKING:
+    from click.shell_completion import CompletionItem
+
+SNAPSHOT_VERSION = 3
+
+# Seconds a snapshot is trusted before its files are statted again
+RECHECK_SECONDS = 5.0
+
+# Characters that separate terms of a --select value
+_SEPARATORS = ",|&(!"
+
+
+@dataclass
+class CatalogSnapshot:
+    """Filenames and tags of a rules directory at one modification time.
+
+    Attributes:
+        rules_dir: Resolved path of the rules directory.
+        dir_mtime_ns: Modification time of the directory.
+        files_mtime_ns: Newest modification time of the files in it.
+        checked_at: When the files were last statted, in seconds since the
+            epoch.
+    """
+
+    rules_dir: str
+    dir_mtime_ns: int
+    files_mtime_ns: int
+    checked_at: float = 0.0
+    filenames: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    version: int = SNAPSHOT_VERSION
+
+
+def cache_dir() -> Path:
+    """Return the directory holding completion snapshots.
+
+    ``$XDG_CACHE_HOME/rules-combiner`` if set, else
+    ``~/.cache/rules-combiner``.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "rules-combiner"
+
+
+def snapshot_path(rules_dir: Path) -> Path:
+    """Return the snapshot file of a rules directory."""
+    import hashlib
+
+    digest = hashlib.sha256(str(rules_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+    return cache_dir() / f"completion-{digest}.json"
+
+
+def load_snapshot(rules_dir: Path) -> CatalogSnapshot:
+    """Return an up-to-date snapshot of a rules directory.
+
+    The cached snapshot is used while the directory's modification time is
+    unchanged and, if it was last checked more than ``RECHECK_SECONDS`` ago,
+    no file in it was modified since; otherwise the rules are discovered
+    again, reading only the heads needed for tags, and the snapshot is
+    rewritten. A snapshot that cannot be written is still returned.
+
+    Raises:
+        OSError: If the rules directory cannot be read.
+    """
+    import json
+
+    dir_mtime_ns = rules_dir.stat().st_mtime_ns
+    path = snapshot_path(rules_dir)
+    snapshot: Optional[CatalogSnapshot] = None
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        snapshot = CatalogSnapshot(**data)
+    except (OSError, ValueError, TypeError):
+        pass
+
+    now = time.time()
+    if snapshot is not None and snapshot.version == SNAPSHOT_VERSION:
+        if snapshot.dir_mtime_ns == dir_mtime_ns and now - snapshot.checked_at < RECHECK_SECONDS:
+            return snapshot
+    files_mtime_ns = newest_file_mtime(rules_dir)
+    if (
+        snapshot is None
+        or snapshot.version != SNAPSHOT_VERSION
+        or snapshot.dir_mtime_ns != dir_mtime_ns
+        or snapshot.files_mtime_ns != files_mtime_ns
+    ):
+        snapshot = build_snapshot(rules_dir, dir_mtime_ns, files_mtime_ns)
+    snapshot.checked_at = now
+    try:
+        _write_atomic(path, json.dumps(asdict(snapshot)))
+    except OSError:
+        pass
+    return snapshot
+
+
+def newest_file_mtime(rules_dir: Path) -> int:
+    """Return the newest modification time of the files in a directory, in ns.
+
+    Raises:
+        OSError: If the rules directory cannot be read.
+    """
+    newest = 0
+    with os.scandir(rules_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    newest = max(newest, entry.stat().st_mtime_ns)
+            except OSError:
+                # Removed while scanning; the directory's mtime changed too
+                continue
+    return newest
+
+
+def build_snapshot(rules_dir: Path, dir_mtime_ns: int, files_mtime_ns: int) -> CatalogSnapshot:
+    """Discover a rules directory's filenames and tags."""
+    from .discovery import RuleDiscoveryEngine
+
+    filenames = []
+    tags = set()
+    for rule in RuleDiscoveryEngine(rules_dir).iter_rules(fields=("filename", "tags")):
+        filenames.append(rule.filename)
+        tags.update(rule.tags)
+    return CatalogSnapshot(
+        str(rules_dir.resolve()), dir_mtime_ns, files_mtime_ns,
+        filenames=filenames, tags=sorted(tags),
+    )
+
+
+def complete_selection(ctx: Any, param: Any, incomplete: str) -> List["CompletionItem"]:
+    """Complete the last term of a ``--select`` value with filenames and ``tag:`` terms."""
+    split = max(incomplete.rfind(separator) for separator in _SEPARATORS) + 1
+    prefix, term = incomplete[:split], incomplete[split:].lstrip()
+    prefix += incomplete[split:len(incomplete) - len(term)]
+    snapshot = _snapshot_for(ctx)
+    if snapshot is None:
+        return []
+    if term.startswith("tag:"):
+        candidates = [f"tag:{tag}" for tag in snapshot.tags]
+    else:
+        candidates = snapshot.filenames + [f"tag:{tag}" for tag in snapshot.tags]
+    return _items(prefix, term, candidates)
+
+
+def complete_names(ctx: Any, param: Any, incomplete: str) -> List["CompletionItem"]:
+    """Complete the last name of a comma-separated list of rule filenames or globs."""
+    prefix, _, term = incomplete.rpartition(",")
+    snapshot = _snapshot_for(ctx)
+    if snapshot is None:
+        return []
+    return _items(f"{prefix}," if prefix else "", term, snapshot.filenames)
+
+
+def complete_tags(ctx: Any, param: Any, incomplete: str) -> List["CompletionItem"]:
+    """Complete the last tag of a comma-separated ``--tags`` value."""
+    prefix, _, term = incomplete.rpartition(",")
+    snapshot = _snapshot_for(ctx)
+    if snapshot is None:
+        return []
+    return _items(f"{prefix}," if prefix else "", term.lower(), snapshot.tags)
+
+
+def complete_profiles(ctx: Any, param: Any, incomplete: str) -> List["CompletionItem"]:
+    """Complete profile names from the profiles file given on the command line."""
+    from .profiles import PROFILES_FILE, profile_names
+
+    profiles_file = ctx.params.get("profiles_file") or PROFILES_FILE
+    try:
+        names = profile_names(Path(profiles_file))
+    except (OSError, ValueError):
+        return []
+    return _items("", incomplete, names)
+
+
+def _snapshot_for(ctx: Any) -> Optional[CatalogSnapshot]:
+    """Load the snapshot of the rules directory given on the command line."""
+    from .log import set_level
+
+    # The CLI group callback that sets the log level does not run while
+    # completing, and log lines would end up in the shell
+    set_level("error")
+    rules_dir = Path(ctx.params.get("rules_dir") or "rules")
+    try:
+        return load_snapshot(rules_dir)
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+
+def _items(prefix: str, term: str, candidates: List[str]) -> List["CompletionItem"]:
+    """Turn the candidates starting with a term into completion items."""
+    from click.shell_completion import CompletionItem
+
+    return [
+        CompletionItem(f"{prefix}{candidate}")
+        for candidate in candidates if candidate.startswith(term)
+    ]
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write a file through a temporary file and a rename."""
+    import tempfile
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
@@ -0,0 +1,235 @@
+"""Transparent reading and writing of compressed rule and output files."""
+
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+from pathlib import Path
+from typing import IO, Any, Optional, Tuple, Type, Union
+
+# Maps file suffix to codec name; ".zst" needs the optional 'zstandard' package
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+RULE_FILE_PATTERNS = ("*.md",) + tuple(f"*.md{suffix}" for suffix in COMPRESSION_SUFFIXES)
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def compression_for(path: Path) -> Optional[str]:
+    """Return the codec name implied by a path's suffix.
+
+    Args:
+        path: File path to inspect.
+
+    Returns:
+        Codec name such as ``"gzip"``, or None for uncompressed files.
+    """
+    return COMPRESSION_SUFFIXES.get(path.suffix.lower())
+
+
+def is_compressed(path: Path) -> bool:
+    """Return True if the path names a compressed file."""
+    return compression_for(path) is not None
+
+
+def rule_stem(path: Path) -> str:
+    """Return the filename without compression and markdown suffixes.
+
+    Example:
+        >>> rule_stem(Path("rules/python-coding.md.gz"))
+        'python-coding'
+    """
+    name = path.name
+    if is_compressed(path):
+        name = name[: -len(path.suffix)]
+    if name.lower().endswith(".md"):
+        name = name[:-3]
+    return name
+
+
+def open_binary(path: Path, mode: str = "rb") -> IO[bytes]:
+    """Open a file for streaming binary I/O, (de)compressing by suffix.
+
+    Args:
+        path: File to open.
+        mode: ``"rb"`` or ``"wb"``.
+
+    Returns:
+        A binary file object; plain files are opened directly.
+
+    Raises:
+        RuntimeError: If a ``.zst`` file is used without 'zstandard' installed.
+    """
+    codec = compression_for(path)
+    if codec == "gzip":
+        # mtime=0 keeps compressed output reproducible across builds
+        if "w" in mode:
+            return gzip.GzipFile(filename=str(path), mode=mode, mtime=0)  # type: ignore[return-value]
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    if codec == "bz2":
+        return bz2.open(path, mode)  # type: ignore[return-value]
+    if codec == "xz":
+        return lzma.open(path, mode)  # type: ignore[return-value]
+    if codec == "zstd":
+        return _import_zstandard().open(path, mode)  # type: ignore[no-any-return]
+    return path.open(mode)
+
+
+def open_text(path: Path) -> IO[str]:
+    """Open a possibly compressed file for streaming UTF-8 text reading.
+
+    Args:
+        path: File to open.
+
+    Returns:
+        A text file object with universal newline handling.
+    """
+    if not is_compressed(path):
+        return path.open('r', encoding='utf-8')
+    return io.TextIOWrapper(open_binary(path, "rb"), encoding='utf-8')
+
+
+def read_text(path: Path) -> str:
+    """Read the full UTF-8 text of a possibly compressed file.
+
+    Args:
+        path: File to read.
+
+    Returns:
+        The decoded (and decompressed) content.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid UTF-8 or cannot be decompressed.
+    """
+    if not is_compressed(path):
+        return path.read_text(encoding='utf-8')
+    with open_text(path) as f:
+        try:
+            return f.read()
+        except _decompression_errors(path) as e:
+            raise ValueError(f"Cannot decompress {path}: {e}")
+
+
+def write_text(path: Path, content: str) -> None:
+    """Write UTF-8 text, compressing according to the path's suffix.
+
+    Args:
+        path: Destination file.
+        content: Text to write.
+    """
+    if not is_compressed(path):
+        path.write_text(content, encoding='utf-8')
+        return
+    path.write_bytes(encode_content(path, content))
+
+
+def wrap_writer(path: Path, raw: IO[bytes]) -> IO[bytes]:
+    """Wrap an open binary file in a compressor chosen by the path's suffix.
+
+    Closing the returned writer flushes the compressed stream but leaves
+    ``raw`` open.
+
+    Args:
+        path: Destination path, used only to pick the codec.
+        raw: Open binary file that receives the (compressed) bytes.
+
+    Returns:
+        A writable binary stream; ``raw`` itself for uncompressed paths.
+    """
+    codec = compression_for(path)
+    if codec == "gzip":
+        return gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)  # type: ignore[return-value]
+    if codec == "bz2":
+        return bz2.BZ2File(raw, "wb")
+    if codec == "xz":
+        return lzma.LZMAFile(raw, "wb")
+    if codec == "zstd":
+        compressor = _import_zstandard().ZstdCompressor()
+        return compressor.stream_writer(raw, closefd=False)  # type: ignore[no-any-return]
+    return raw
+
+
+def encode_content(path: Path, content: Union[str, bytes]) -> bytes:
+    """Return the bytes that write_text would store for a path.
+
+    Args:
+        path: Destination file, used only to pick the codec.
+        content: Text to encode, or text already encoded as UTF-8.
+
+    Returns:
+        UTF-8 bytes, compressed if the path has a compression suffix.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if not is_compressed(path):
+        return data
+    buffer = io.BytesIO()
+    with wrap_writer(path, buffer) as writer:
+        writer.write(data)
+    return buffer.getvalue()
+
+
+def _import_zstandard() -> Any:
+    """Import the optional zstandard package.
+
+    Raises:
+        RuntimeError: If the package is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "Reading or writing .zst files requires the 'zstandard' package "
+            "(pip install 'personal-prompts[zstd]')"
+        )
+    return zstandard
+
+
+def _decompression_errors(path: Path) -> Tuple[Type[BaseException], ...]:
+    """Return the exceptions a path's codec raises for corrupt or truncated data.
+
+    gzip and bz2 report bad headers as OSError, so read errors of compressed
+    files are included too.
+    """
+    errors: Tuple[Type[BaseException], ...] = (OSError, EOFError, zlib.error, lzma.LZMAError)
+    if compression_for(path) == "zstd":
+        errors += (_import_zstandard().ZstdError,)
+    return errors
+
+
+def uncompressed_size(path: Path) -> int:
+    """Return the size of a file's decompressed content in bytes.
+
+    Compressed files are measured by streaming through the content. The
+    gzip size trailer is not used: it holds the size modulo 4 GiB, and of
+    the last member only.
+
+    Args:
+        path: File to measure.
+
+    Returns:
+        Decompressed size in bytes (the plain size for uncompressed files).
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file cannot be decompressed.
+    """
+    codec = compression_for(path)
+    if codec is None:
+        return path.stat().st_size
+    total = 0
+    with open_binary(path, "rb") as f:
+        try:
+            while True:
+                chunk = f.read(_CHUNK_SIZE)
+                if not chunk:
+                    return total
+                total += len(chunk)
+        except _decompression_errors(path) as e:
+            raise ValueError(f"Cannot decompress {path}: {e}")
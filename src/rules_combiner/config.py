@@ -0,0 +1,152 @@
+"""Loading of combination settings from TOML configuration files."""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .models import CombinationConfig, SelectionMode
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover - exercised only on older interpreters
+    import tomli as tomllib
+
+
+def read_toml(path: Path) -> Dict[str, Any]:
+    """Read and parse a TOML file.
+
+    Args:
+        path: Path to the TOML file.
+
+    Returns:
+        The parsed document.
+
+    Raises:
+        ValueError: If the file cannot be read or is not valid TOML.
+    """
+    try:
+        with path.open('rb') as f:
+            return tomllib.load(f)
+    except OSError as e:
+        raise ValueError(f"Cannot read config file {path}: {e}")
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"Invalid TOML in {path}: {e}")
+
+
+def string_list(value: Any, key: str) -> List[str]:
+    """Normalize a TOML value that may be one string or a list of strings.
+
+    Args:
+        value: The parsed value.
+        key: Name of the key, for the error message.
+
+    Returns:
+        The strings, as a list.
+
+    Raises:
+        ValueError: If the value is neither a string nor a list of strings.
+    """
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return list(value)
+    raise ValueError(f"'{key}' must be a string or a list of strings")
+
+
+def path_value(data: Dict[str, Any], key: str, default: str, base_dir: Path) -> Path:
+    """Return a path setting resolved against a base directory.
+
+    Raises:
+        ValueError: If the value is not a string.
+    """
+    value = data.get(key, default)
+    if not isinstance(value, str):
+        raise ValueError(f"'{key}' must be a path string")
+    return base_dir / value
+
+
+def config_from_mapping(data: Dict[str, Any], base_dir: Path) -> CombinationConfig:
+    """Build a CombinationConfig from a parsed TOML table.
+
+    Relative paths are resolved against ``base_dir``. ``selected_rules`` may
+    be a list of filenames, the string ``"all"`` or a selection expression
+    such as ``"tag:python & tokens<2000"``; ``select_glob`` adds
+    rules matching one or more glob patterns and ``select_tags`` rules
+    carrying one or more frontmatter tags. ``token_budget`` is the estimated
+    token count above which the selection is reported as too large.
+
+    Args:
+        data: Parsed configuration table.
+        base_dir: Directory that relative paths are resolved against.
+
+    Returns:
+        The validated CombinationConfig.
+
+    Raises:
+        ValueError: If required keys are missing or values have the wrong type.
+    """
+    selected = data.get("selected_rules", [])
+    patterns = string_list(data.get("select_glob", []), "select_glob")
+    tags = string_list(data.get("select_tags", []), "select_tags")
+    expression = None
+    if selected == "all":
+        mode = SelectionMode.ALL
+        selected = []
+    elif isinstance(selected, str):
+        mode = SelectionMode.SPECIFIC
+        expression, selected = selected, []
+    elif isinstance(selected, list) and all(isinstance(name, str) for name in selected):
+        mode = SelectionMode(data.get("selection_mode", SelectionMode.SPECIFIC.value))
+    else:
+        raise ValueError("'selected_rules' must be a list of filenames, \"all\" or an expression")
+
+    if mode is SelectionMode.INTERACTIVE:
+        raise ValueError("Config files cannot use the interactive selection mode")
+    if mode is SelectionMode.SPECIFIC and not (selected or patterns or tags or expression):
+        raise ValueError(
+            "Config selects no rules: set 'selected_rules', 'select_glob' or 'select_tags'"
+        )
+
+    budget = data.get("token_budget")
+    if budget is not None and (isinstance(budget, bool) or not isinstance(budget, int) or budget < 1):
+        raise ValueError("'token_budget' must be a positive integer")
+
+    return CombinationConfig(
+        rules_directory=path_value(data, "rules_directory", "rules", base_dir),
+        output_file=path_value(data, "output_file", "AGENT.md", base_dir),
+        selected_rules=list(selected),
+        include_toc=bool(data.get("include_toc", True)),
+        backup_existing=bool(data.get("backup_existing", True)),
+        selection_mode=mode,
+        selected_patterns=patterns,
+        embed_manifest=bool(data.get("manifest", True)),
+        selected_tags=tags,
+        selection_expression=expression,
+        token_budget=budget,
+    )
+
+
+def load_combination_config(path: Path) -> CombinationConfig:
+    """Load a CombinationConfig from a TOML file.
+
+    Example file::
+
+        rules_directory = "rules"
+        output_file = "AGENT.md"
+        selected_rules = ["python-coding.md", "python-test.md"]
+        select_glob = ["ui-*.md"]
+        include_toc = true
+        backup_existing = false
+        token_budget = 8000
+
+    Args:
+        path: Path to the TOML config file. Relative paths inside it are
+            resolved against the file's directory.
+
+    Returns:
+        The loaded CombinationConfig.
+
+    Raises:
+        ValueError: If the file is invalid or references missing directories.
+    """
+    return config_from_mapping(read_toml(path), path.parent)
@@ -0,0 +1,316 @@
+"""Long-running daemon that serves combine requests over a Unix socket.
+
+The daemon keeps discovered rule catalogs and processed sections warm between
+requests, so editor integrations and git hooks that call the tool many times
+a minute skip interpreter startup and rule discovery. Requests and responses
+are single-line JSON objects.
+"""
+
+import getpass
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import __version__
+from .api import Combiner
+from .log import logger
+from .models import CombinationConfig, RuleFile, SelectionMode
+from .selection import select_rules
+
+SOCKET_ENV_VAR = "RULES_COMBINER_SOCKET"
+
+# Responses larger than this are not expected; it only bounds a broken peer
+_MAX_LINE_SIZE = 16 * 1024 * 1024
+
+
+def default_socket_path() -> Path:
+    """Return the socket path used when none is given.
+
+    ``$RULES_COMBINER_SOCKET`` takes precedence, then ``$XDG_RUNTIME_DIR``,
+    then a per-user file in the temporary directory.
+    """
+    override = os.environ.get(SOCKET_ENV_VAR)
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "rules-combiner.sock"
+    return Path(tempfile.gettempdir()) / f"rules-combiner-{getpass.getuser()}.sock"
+
+
+def _absolute_path(payload: Dict[str, Any], key: str) -> Path:
+    """Read a required absolute path from a request payload.
+
+    Paths must be absolute because the daemon's working directory is
+    unrelated to the client's.
+    """
+    if key not in payload:
+        raise ValueError(f"Missing request field: {key}")
+    if not isinstance(payload[key], str):
+        raise ValueError(f"'{key}' must be a string")
+    path = Path(payload[key])
+    if not path.is_absolute():
+        raise ValueError(f"'{key}' must be an absolute path")
+    return path
+
+
+def _string_list(payload: Dict[str, Any], key: str) -> List[str]:
+    """Read an optional list of strings from a request payload."""
+    value = payload.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"'{key}' must be a list of strings")
+    return value
+
+
+def _selection_from_payload(
+    payload: Dict[str, Any],
+) -> Tuple[SelectionMode, List[str], List[str], List[str], Optional[str]]:
+    """Read the ``all``, ``select``, ``select_glob``, ``select_tags`` and ``select_expr`` fields.
+
+    Returns:
+        The selection mode, filenames, glob patterns, tags and expression.
+    """
+    if payload.get("all"):
+        return SelectionMode.ALL, [], [], [], None
+    filenames = _string_list(payload, "select")
+    patterns = _string_list(payload, "select_glob")
+    tags = _string_list(payload, "select_tags")
+    expression = payload.get("select_expr")
+    if expression is not None and not isinstance(expression, str):
+        raise ValueError("'select_expr' must be a string")
+    if not filenames and not patterns and not tags and not expression:
+        raise ValueError(
+            "Request selects no rules: set 'select', 'select_glob', 'select_tags', "
+            "'select_expr' or 'all'"
+        )
+    return SelectionMode.SPECIFIC, filenames, patterns, tags, expression
+
+
+def _select_from_payload(rules: Sequence[RuleFile], payload: Dict[str, Any]) -> List[RuleFile]:
+    """Resolve the selection fields of a request against discovered rules."""
+    return select_rules(rules, *_selection_from_payload(payload))
+
+
+class RulesDaemon:
+    """Serves list, select and generate requests from a warm catalog.
+
+    Example:
+        >>> daemon = RulesDaemon(default_socket_path())
+        >>> daemon.serve_forever()  # until shutdown() or a "shutdown" request
+    """
+
+    def __init__(self, socket_path: Path, combiner: Optional[Combiner] = None) -> None:
+        """Initialize the daemon.
+
+        Args:
+            socket_path: Path of the Unix domain socket to listen on.
+            combiner: Engine whose warm caches serve requests; a new one is
+                created if omitted.
+        """
+        self._socket_path = socket_path
+        self._combiner = combiner or Combiner()
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self._ready = threading.Event()
+        self._logger = logger.bind(component="daemon")
+
+    @property
+    def socket_path(self) -> Path:
+        """Path of the socket the daemon listens on."""
+        return self._socket_path
+
+    def serve_forever(self) -> None:
+        """Listen on the socket and serve requests until shut down.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket.
+        """
+        if DaemonClient(self._socket_path).is_running():
+            raise RuntimeError(f"A daemon is already listening on {self._socket_path}")
+        # A socket file left behind by a daemon that died is safe to replace
+        self._socket_path.unlink(missing_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        request = {"error": f"Malformed request: {e}"}
+                    if not isinstance(request, dict):
+                        request = {"error": "Request must be a JSON object"}
+                    response = daemon.handle(request)
+                    self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+                    self.wfile.flush()
+
+        previous_umask = os.umask(0o077)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(str(self._socket_path), Handler)
+        finally:
+            os.umask(previous_umask)
+        server.daemon_threads = True
+        self._server = server
+
+        self._logger.info(f"Listening on {self._socket_path}")
+        self._ready.set()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._socket_path.unlink(missing_ok=True)
+            self._ready.clear()
+            self._logger.info("Daemon stopped")
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the daemon is accepting connections."""
+        return self._ready.wait(timeout)
+
+    def shutdown(self) -> None:
+        """Stop serving; safe to call from any thread except a request handler."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a decoded request and build its response.
+
+        Errors are reported in the response rather than raised, so one bad
+        request never takes the daemon down.
+        """
+        command = request.get("command")
+        if command is None:
+            return {"ok": False, "error": request.get("error", "Request has no command")}
+        try:
+            if command == "ping":
+                return {"ok": True, "version": __version__, "pid": os.getpid()}
+            if command == "list":
+                return {"ok": True, "rules": self._list(request)}
+            if command == "select":
+                rules = self._combiner.discover(_absolute_path(request, "rules_dir"))
+                selected = _select_from_payload(rules, request)
+                return {"ok": True, "rules": [rule.filename for rule in selected]}
+            if command == "generate":
+                return {"ok": True, **self._generate(request)}
+            if command == "stats":
+                return {"ok": True, **asdict(self._combiner.catalog.stats)}
+            if command == "shutdown":
+                # shutdown() blocks until serve_forever returns, so it cannot run here
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"ok": True}
+            raise ValueError(f"Unknown command: {command!r}")
+        except (ValueError, OSError) as e:
+            self._logger.warning(f"Request {command!r} failed: {e}")
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            self._logger.error(f"Request {command!r} failed unexpectedly: {e!r}")
+            return {"ok": False, "error": f"Internal error: {e}"}
+
+    def _list(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Describe every rule in the requested directory."""
+        rules = self._combiner.discover(_absolute_path(request, "rules_dir"))
+        return [
+            {
+                "filename": rule.filename,
+                "title": rule.title,
+                "file_size": rule.file_size,
+                "estimated_tokens": rule.estimated_tokens,
+            }
+            for rule in rules
+        ]
+
+    def _generate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine from the warm caches and write the output."""
+        rules_dir = _absolute_path(request, "rules_dir")
+        mode, filenames, patterns, tags, expression = _selection_from_payload(request)
+        config = CombinationConfig(
+            rules_directory=rules_dir,
+            output_file=_absolute_path(request, "output"),
+            selected_rules=filenames,
+            include_toc=bool(request.get("include_toc", True)),
+            backup_existing=bool(request.get("backup", True)),
+            selection_mode=mode,
+            selected_patterns=patterns,
+            embed_manifest=bool(request.get("manifest", True)),
+            selected_tags=tags,
+            selection_expression=expression,
+        )
+        rules = self._combiner.select(config, self._combiner.discover(rules_dir))
+        result = self._combiner.combine(config, rules)
+        patch_result = self._combiner.write(config, result)
+        rule_sections = [section for section in result.sections if section.sha256]
+
+        return {
+            "rules": [rule.filename for rule in result.rules],
+            "output_size": len(result.content),
+            "write_mode": patch_result.mode,
+            "offset": patch_result.offset,
+            "bytes_written": patch_result.bytes_written,
+            "backup_path": str(patch_result.backup_path) if patch_result.backup_path else None,
+            "section_hits": sum(section.cached for section in rule_sections),
+            "section_lookups": len(rule_sections),
+        }
+
+
+class DaemonClient:
+    """Sends requests to a running daemon.
+
+    Example:
+        >>> client = DaemonClient()
+        >>> if client.is_running():
+        ...     client.request("list", rules_dir=str(Path("rules").resolve()))
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 30.0) -> None:
+        """Initialize the client.
+
+        Args:
+            socket_path: Daemon socket; defaults to ``default_socket_path()``.
+            timeout: Seconds to wait for a connection or response.
+        """
+        self._socket_path = socket_path or default_socket_path()
+        self._timeout = timeout
+
+    def is_running(self) -> bool:
+        """Whether a daemon is accepting requests on the socket."""
+        if not self._socket_path.exists():
+            return False
+        try:
+            return bool(self.request("ping").get("ok"))
+        except (OSError, ValueError):
+            return False
+
+    def request(self, command: str, **params: Any) -> Dict[str, Any]:
+        """Send one request and return the daemon's response.
+
+        Args:
+            command: Request command (ping, list, select, generate, stats, shutdown).
+            **params: Request fields.
+
+        Returns:
+            The decoded response; ``response["ok"]`` is False on request errors.
+
+        Raises:
+            OSError: If the daemon cannot be reached.
+            ValueError: If the response is malformed.
+        """
+        payload = json.dumps({"command": command, **params}).encode('utf-8') + b"\n"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self._timeout)
+            sock.connect(str(self._socket_path))
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile('rb') as reader:
+                line = reader.readline(_MAX_LINE_SIZE)
+
+        if not line:
+            raise ValueError("Daemon closed the connection without responding")
+        response = json.loads(line)
+        if not isinstance(response, dict):
+            raise ValueError("Malformed daemon response")
+        return response
@@ -1,18 +1,39 @@
 """Rule discovery engine for finding and cataloging rule files."""
 
+import itertools
+import os
 import re
 from pathlib import Path
-from typing import List
-
-from loguru import logger
+from typing import Collection, Iterable, Iterator, List, Optional, Tuple
 
+from .catalog import RuleCatalog
+from .compression import (
+    RULE_FILE_PATTERNS,
+    open_text,
+    rule_stem,
+    uncompressed_size,
+)
+from .frontmatter import MAX_FRONTMATTER_LINES, Frontmatter, read_frontmatter
+from .log import logger
 from .models import RuleFile
 
+# Fields that callers of iter_rules may request
+RULE_FIELDS = (
+    "filename", "path", "title", "size", "tokens", "tags", "priority", "requires", "after",
+)
+
+# Fields that are read from the head of the file
+_HEADER_FIELDS = {"title", "tags", "priority", "requires", "after"}
+
+# Lines after the frontmatter searched for the title; later titles are not seen
+MAX_TITLE_LINES = MAX_FRONTMATTER_LINES
+
 
 class RuleDiscoveryEngine:
     """Discovers and catalogs rule files in the rules directory.
     
-    This class provides functionality to scan a directory for Markdown files,
+    This class provides functionality to scan a directory for Markdown files
+    (optionally compressed as .md.gz, .md.bz2, .md.xz or .md.zst),
     validate their accessibility, extract metadata like titles, and return
     structured information about available rule files.
     
@@ -48,20 +69,74 @@ class RuleDiscoveryEngine:
         """
         self._logger.info(f"Starting rule discovery in: {self._rules_dir}")
         
-        discovered_rules: List[RuleFile] = []
+        discovered_rules = list(self.iter_rules())
         
-        # Find all .md files in the rules directory (not recursive)
-        markdown_files = list(self._rules_dir.glob("*.md"))
+        self._logger.info(f"Successfully discovered {len(discovered_rules)} rule files")
+        return discovered_rules
+    
+    def discover_catalog(self) -> RuleCatalog:
+        """Discover all rule files into an indexed catalog.
         
-        self._logger.info(f"Found {len(markdown_files)} markdown files to process")
+        Returns:
+            RuleCatalog of the discovered rules, indexed by filename and
+            path, with precomputed size and token totals.
+            
+        Example:
+            >>> catalog = RuleDiscoveryEngine(Path("rules")).discover_catalog()
+            >>> catalog.get("python-coding.md")
+        """
+        return RuleCatalog(self.discover_rules())
+    
+    def iter_rules(self, fields: Optional[Collection[str]] = None) -> Iterator[RuleFile]:
+        """Yield rule files one at a time as they are found.
+        
+        With ``fields`` set, only the work those fields need is done: the
+        head of the file is only read when ``title``, ``tags`` or
+        ``priority`` is requested, the size only computed for ``size`` or
+        ``tokens``, and files are checked for read permission instead of
+        being read in full. Fields that were not requested keep cheap
+        placeholders (the filename stem as title, zero size, no metadata).
         
-        for md_file in markdown_files:
-            if self.validate_rule_file(md_file):
+        Args:
+            fields: Names from ``RULE_FIELDS`` the caller will use; None
+                computes everything and fully validates each file.
+            
+        Returns:
+            Iterator over RuleFile objects in discovery order.
+            
+        Raises:
+            ValueError: If an unknown field is requested.
+            
+        Example:
+            >>> engine = RuleDiscoveryEngine(Path("rules"))
+            >>> names = [rule.filename for rule in engine.iter_rules(["filename"])]
+        """
+        unknown = set(fields or ()) - set(RULE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        
+        need_header = fields is None or bool(_HEADER_FIELDS.intersection(fields))
+        need_size = fields is None or "size" in fields or "tokens" in fields
+        
+        # Find all .md (and compressed .md.*) files in the rules directory (not recursive)
+        for pattern in RULE_FILE_PATTERNS:
+            for md_file in self._rules_dir.glob(pattern):
+                if fields is None:
+                    if not self.validate_rule_file(md_file):
+                        continue
+                elif not os.access(md_file, os.R_OK):
+                    self._logger.debug(f"Cannot read file {md_file}")
+                    continue
+                
                 try:
-                    title = self.extract_title(md_file)
-                    file_size = md_file.stat().st_size
+                    if need_header:
+                        title, metadata = self.extract_header(md_file)
+                    else:
+                        title, metadata = rule_stem(md_file), Frontmatter()
+                    # Token estimates are based on the decompressed content size
+                    file_size = uncompressed_size(md_file) if need_size else 0
                     # Estimate tokens: ~4 characters = 1 token
-                    estimated_tokens = max(1, file_size // 4)
+                    estimated_tokens = max(1, file_size // 4) if need_size else 0
                     
                     rule_file = RuleFile(
                         path=md_file,
@@ -69,17 +144,20 @@ class RuleDiscoveryEngine:
                         title=title,
                         file_size=file_size,
                         is_readable=True,
-                        estimated_tokens=estimated_tokens
+                        estimated_tokens=estimated_tokens,
+                        description=metadata.description,
+                        tags=metadata.tags,
+                        priority=metadata.priority,
+                        applies_to=metadata.applies_to,
+                        requires=metadata.requires,
+                        after=metadata.after,
                     )
                     
-                    discovered_rules.append(rule_file)
                     self._logger.debug(f"Added rule file: {md_file.name} (title: '{title}')")
+                    yield rule_file
                     
                 except Exception as e:
                     self._logger.warning(f"Failed to process rule file {md_file.name}: {e}")
-        
-        self._logger.info(f"Successfully discovered {len(discovered_rules)} rule files")
-        return discovered_rules
     
     def validate_rule_file(self, file_path: Path) -> bool:
         """Validate that a file is a readable rule file.
@@ -101,11 +179,12 @@ class RuleDiscoveryEngine:
                 self._logger.debug(f"Path is not a file: {file_path}")
                 return False
             
-            # Test if we can read the file
-            file_path.read_text(encoding='utf-8')
+            # Test if we can read (and decompress) the head of the file
+            with open_text(file_path) as f:
+                f.readline()
             return True
             
-        except (PermissionError, UnicodeDecodeError, OSError) as e:
+        except (OSError, ValueError, RuntimeError) as e:
             self._logger.debug(f"Cannot read file {file_path}: {e}")
             return False
     
@@ -114,7 +193,8 @@ class RuleDiscoveryEngine:
         
         Looks for the first level-1 markdown header (line starting with '# ')
         and returns the text after the hash. If no header is found, returns
-        the filename without extension.
+        the filename without extension. Files are read as a stream that
+        stops at the first header, decompressing compressed files.
         
         Args:
             file_path: Path to the markdown file.
@@ -126,24 +206,57 @@ class RuleDiscoveryEngine:
             For a file containing \"# Mental Model: Test Rule\", returns
             \"Mental Model: Test Rule\".
         """
+        return self.extract_header(file_path)[0]
+    
+    def extract_header(self, file_path: Path) -> Tuple[str, Frontmatter]:
+        """Extract the title and frontmatter metadata in one read.
+        
+        The frontmatter block, if any, is parsed first and the title is the
+        first level-1 header after it, so ``#`` comments in the block are
+        never mistaken for the title. Only the head of the file is read: the
+        block and at most ``MAX_TITLE_LINES`` lines after it. Unusable
+        frontmatter values are logged and skipped.
+        
+        Args:
+            file_path: Path to the markdown file.
+            
+        Returns:
+            The title (or filename as fallback) and the file's metadata.
+            
+        Example:
+            >>> title, metadata = engine.extract_header(Path("rules/python-testing.md"))
+            >>> metadata.tags
+            ['python', 'testing']
+        """
         try:
-            content = file_path.read_text(encoding='utf-8')
+            with open_text(file_path) as f:
+                metadata, lines = read_frontmatter(f)
+                title = self._find_title(itertools.islice(lines, MAX_TITLE_LINES))
+            
+            for error in metadata.errors:
+                self._logger.warning(f"Invalid frontmatter in {file_path.name}: {error}")
             
-            # Look for the first level-1 header (# Title)
-            # Match lines that start with # followed by space and capture until end of line
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('# '):
-                    title = line[2:].strip()  # Remove '# ' and any extra whitespace
-                    self._logger.debug(f"Extracted title from {file_path.name}: '{title}'")
-                    return title
+            if title is not None:
+                self._logger.debug(f"Extracted title from {file_path.name}: '{title}'")
+                return title, metadata
             
             # Use filename without extension as fallback
-            fallback_title = file_path.stem
+            fallback_title = rule_stem(file_path)
             self._logger.debug(f"No header found in {file_path.name}, using filename: '{fallback_title}'")
-            return fallback_title
+            return fallback_title, metadata
                 
-        except (UnicodeDecodeError, OSError) as e:
+        except (OSError, ValueError, EOFError, RuntimeError) as e:
             self._logger.warning(f"Could not read file {file_path.name} for title extraction: {e}")
-            return file_path.stem
+            return rule_stem(file_path), Frontmatter()
+    
+    def _find_title(self, lines: Iterable[str]) -> Optional[str]:
+        """Return the text of the first level-1 header among lines, if any.
+        
+        Stops consuming lines as soon as a header is found, so streamed
+        input is only read up to the title.
+        """
+        for line in lines:
+            line = line.strip()
+            if line.startswith('# '):
+                return line[2:].strip()  # Remove '# ' and any extra whitespace
+        return None
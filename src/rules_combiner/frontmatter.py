@@ -0,0 +1,197 @@
+"""Parsing of the optional metadata block at the top of rule files.
+
+A rule file may start with a frontmatter block between ``---`` lines
+holding YAML-style ``key: value`` pairs:
+
+    ---
+    tags: [python, testing]
+    priority: 10
+    applies-to: ["*.py", "tests/**"]
+    description: Conventions for pytest suites
+    requires: [python-coding.md]
+    after: [python-style.md]
+    ---
+    # Python Testing
+
+``requires`` names rules that must be combined too and come first;
+``after`` only orders the rule after others when they are also selected.
+
+Only the YAML that rule metadata needs is understood: plain and quoted
+scalars, inline ``[a, b]`` lists, ``- item`` block lists and ``#``
+comments. Unknown keys are ignored. A block must close within
+``MAX_FRONTMATTER_LINES`` lines, so reading the metadata never reads more
+than the head of a file. A block with a line that is not ``key: value`` or
+a list item, or without any known key, is not metadata but content, such as
+a Markdown horizontal rule, and is left in the body.
+
+Example:
+    >>> metadata, body = split_frontmatter("---\\ntags: [go]\\n---\\n# Go\\n")
+    >>> metadata.tags, body
+    (['go'], '# Go\\n')
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+DELIMITER = "---"
+
+# Lines after which an unclosed block is treated as ordinary content
+MAX_FRONTMATTER_LINES = 64
+
+# Keys that make a block metadata, after normalizing '_' to '-'
+KNOWN_KEYS = frozenset({"tags", "priority", "applies-to", "description", "requires", "after"})
+
+
+@dataclass
+class Frontmatter:
+    """Metadata declared in a rule file's frontmatter.
+
+    Tags are lowercased so lookups are case-insensitive. Values that could
+    not be used, such as a non-integer priority, are ignored and described
+    in ``errors``.
+    """
+
+    tags: List[str] = field(default_factory=list)
+    priority: int = 0
+    applies_to: List[str] = field(default_factory=list)
+    description: Optional[str] = None
+    requires: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def read_frontmatter(lines: Iterable[str]) -> Tuple[Frontmatter, Iterator[str]]:
+    """Parse a frontmatter block from the start of a stream of lines.
+
+    At most ``MAX_FRONTMATTER_LINES + 1`` lines are consumed before the
+    block is either closed or given up on, so the lines can come straight
+    from an open file.
+
+    Args:
+        lines: Lines of the file, with or without line endings.
+
+    Returns:
+        The metadata (empty when there is no block) and an iterator over
+        the lines after the block; without a block, or when the block is
+        not metadata, that is every line.
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return Frontmatter(), iter(())
+    if first.strip() != DELIMITER:
+        return Frontmatter(), itertools.chain([first], lines)
+
+    block = list(itertools.islice(lines, MAX_FRONTMATTER_LINES))
+    end = next(
+        (position for position, line in enumerate(block) if line.strip() == DELIMITER), None
+    )
+    metadata = None if end is None else _parse_block(block[:end])
+    if end is None or metadata is None:
+        # Not a metadata block after all; hand back everything that was read
+        return Frontmatter(), itertools.chain([first], block, lines)
+    return metadata, itertools.chain(block[end + 1:], lines)
+
+
+def split_frontmatter(content: str) -> Tuple[Frontmatter, str]:
+    """Split file content into its metadata and the Markdown body.
+
+    Blank lines between the block and the body are dropped with the block.
+    """
+    metadata, rest = read_frontmatter(content.splitlines(keepends=True))
+    body = "".join(rest)
+    if len(body) < len(content):
+        body = body.lstrip("\r\n")
+    return metadata, body
+
+
+def _parse_block(lines: List[str]) -> Optional[Frontmatter]:
+    """Turn the lines between the delimiters into Frontmatter.
+
+    Returns:
+        The metadata, or None if a line does not parse or no known key is
+        set, in which case the block is content.
+    """
+    values: Dict[str, Union[str, List[str]]] = {}
+    key: Optional[str] = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") or stripped == "-":
+            # Item of a block list under the previous key
+            items = values.get(key) if key is not None else None
+            if not isinstance(items, list):
+                return None
+            items.append(_scalar(stripped[1:]))
+            continue
+        name, separator, value = line.partition(":")
+        if not separator or not name.strip() or line[0].isspace():
+            return None
+        key = name.strip().lower().replace("_", "-")
+        values[key] = _value(value)
+    if KNOWN_KEYS.isdisjoint(values):
+        return None
+
+    errors: List[str] = []
+    priority = 0
+    try:
+        priority = int(_as_text(values.get("priority")) or 0)
+    except ValueError:
+        errors.append(f"priority must be an integer, not {values['priority']!r}")
+    return Frontmatter(
+        tags=[tag.lower() for tag in _as_list(values.get("tags"))],
+        priority=priority,
+        applies_to=_as_list(values.get("applies-to")),
+        description=_as_text(values.get("description")) or None,
+        requires=_as_list(values.get("requires")),
+        after=_as_list(values.get("after")),
+        errors=errors,
+    )
+
+
+def _value(text: str) -> Union[str, List[str]]:
+    """Parse the value after ``key:``; an empty value starts a block list."""
+    text = _strip_comment(text).strip()
+    if not text:
+        return []
+    if text.startswith("[") and text.endswith("]"):
+        return [_scalar(item) for item in text[1:-1].split(",") if item.strip()]
+    return _scalar(text)
+
+
+def _scalar(text: str) -> str:
+    """Strip whitespace, a trailing comment and matching quotes from a scalar."""
+    text = _strip_comment(text).strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    return text
+
+
+def _strip_comment(text: str) -> str:
+    """Remove a `` #`` comment that is not inside quotes."""
+    quote = None
+    for position, character in enumerate(text):
+        if character in "'\"" and quote in (None, character):
+            quote = None if quote else character
+        elif character == "#" and quote is None and (position == 0 or text[position - 1].isspace()):
+            return text[:position]
+    return text
+
+
+def _as_list(value: Union[str, List[str], None]) -> List[str]:
+    """Return a list value, splitting a plain ``a, b`` string on commas."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [item for item in value if item]
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _as_text(value: Union[str, List[str], None]) -> Optional[str]:
+    """Return a scalar value, joining a list with spaces."""
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
@@ -0,0 +1,267 @@
+"""Delta-compressed revision history for generated output files."""
+
+import difflib
+import hashlib
+import json
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .compression import read_text, write_text
+from .log import logger
+
+# A delta is a list of operations applied against the previous revision's
+# lines: ``[start, end]`` copies a slice of the base, a string is literal text.
+DeltaOp = Union[List[int], str]
+
+
+@dataclass
+class HistoryRevision:
+    """Metadata for a single revision stored in the history.
+
+    Example:
+        >>> revision = HistoryRevision(
+        ...     number=1, timestamp="2024-01-01T12:00:00", kind="full",
+        ...     content_size=1024, stored_size=412, sha256="ab12..."
+        ... )
+        >>> revision.kind
+        'full'
+    """
+
+    number: int
+    timestamp: str
+    kind: str
+    content_size: int
+    stored_size: int
+    sha256: str
+
+
+class OutputHistory:
+    """Keeps a compact revision history next to an output file.
+
+    The first revision (and every ``keyframe_interval``-th one after it) is
+    stored in full; all other revisions are stored as zlib-compressed,
+    line-level deltas against the previous revision. Restoring a revision
+    replays deltas forward from the nearest full keyframe.
+
+    Example:
+        >>> history = OutputHistory(Path("AGENT.md"))
+        >>> history.record_file()
+        >>> [revision.number for revision in history.list_revisions()]
+        [1]
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, output_path: Path, keyframe_interval: int = 50) -> None:
+        """Initialize the history store for an output file.
+
+        Args:
+            output_path: Path of the output file whose revisions are tracked.
+            keyframe_interval: Number of revisions between full snapshots.
+        """
+        self._output_path = output_path
+        self._history_dir = output_path.parent / f".{output_path.name}.history"
+        self._keyframe_interval = max(1, keyframe_interval)
+        self._logger = logger.bind(component="history")
+
+    @property
+    def history_dir(self) -> Path:
+        """Directory holding the index and revision blobs."""
+        return self._history_dir
+
+    def list_revisions(self) -> List[HistoryRevision]:
+        """Return all stored revisions, oldest first.
+
+        Returns:
+            List of HistoryRevision entries; empty if no history exists yet.
+        """
+        index_path = self._history_dir / self.INDEX_FILENAME
+        if not index_path.exists():
+            return []
+
+        data = json.loads(index_path.read_text(encoding='utf-8'))
+        return [HistoryRevision(**entry) for entry in data.get("revisions", [])]
+
+    def record(self, content: str) -> Optional[HistoryRevision]:
+        """Record new content as the next revision.
+
+        Content identical to the latest revision is not stored again.
+
+        Args:
+            content: Full text of the new revision.
+
+        Returns:
+            The newly stored revision, or None if the content was unchanged.
+        """
+        revisions = self.list_revisions()
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+        if revisions and revisions[-1].sha256 == digest:
+            self._logger.debug("Content matches latest revision, nothing recorded")
+            return None
+
+        number = len(revisions) + 1
+        if (number - 1) % self._keyframe_interval == 0:
+            kind = "full"
+            payload = content.encode('utf-8')
+        else:
+            kind = "delta"
+            base = self._latest_content(revisions[-1])
+            payload = json.dumps(
+                self._compute_delta(base, content), ensure_ascii=False,
+                separators=(',', ':')
+            ).encode('utf-8')
+
+        blob = zlib.compress(payload, 9)
+        self._history_dir.mkdir(parents=True, exist_ok=True)
+        self._blob_path(number).write_bytes(blob)
+
+        revision = HistoryRevision(
+            number=number,
+            timestamp=datetime.now().isoformat(timespec="seconds"),
+            kind=kind,
+            content_size=len(content.encode('utf-8')),
+            stored_size=len(blob),
+            sha256=digest,
+        )
+        revisions.append(revision)
+        self._write_index(revisions)
+
+        self._logger.info(
+            f"Recorded revision {number} ({kind}, {revision.stored_size} bytes stored)"
+        )
+        return revision
+
+    def record_file(self) -> Optional[HistoryRevision]:
+        """Record the current content of the output file, if it exists.
+
+        Returns:
+            The newly stored revision, or None if nothing was recorded.
+        """
+        if not self._output_path.exists():
+            return None
+        return self.record(read_text(self._output_path))
+
+    def get_content(self, number: int) -> str:
+        """Reconstruct the full content of a revision.
+
+        Args:
+            number: 1-based revision number.
+
+        Returns:
+            The revision's full text.
+
+        Raises:
+            ValueError: If the revision does not exist.
+        """
+        revisions = self.list_revisions()
+        if number < 1 or number > len(revisions):
+            raise ValueError(
+                f"Revision {number} does not exist (available: 1-{len(revisions)})"
+                if revisions else "No revisions recorded yet"
+            )
+
+        # Walk back to the nearest full keyframe, then replay deltas forward
+        start = number
+        while revisions[start - 1].kind != "full":
+            start -= 1
+
+        content = self._read_blob(start).decode('utf-8')
+        for current in range(start + 1, number + 1):
+            delta = json.loads(self._read_blob(current).decode('utf-8'))
+            content = self._apply_delta(content, delta)
+
+        return content
+
+    def diff(self, old: int, new: int) -> str:
+        """Produce a unified diff between two revisions.
+
+        Args:
+            old: Revision number to diff from.
+            new: Revision number to diff to.
+
+        Returns:
+            Unified diff text; empty if the revisions are identical.
+        """
+        old_lines = self.get_content(old).splitlines(keepends=True)
+        new_lines = self.get_content(new).splitlines(keepends=True)
+        name = self._output_path.name
+        return ''.join(difflib.unified_diff(
+            old_lines, new_lines,
+            fromfile=f"{name}@{old}", tofile=f"{name}@{new}"
+        ))
+
+    def restore(self, number: int) -> Optional[HistoryRevision]:
+        """Restore the output file to the content of a revision.
+
+        The restored content is recorded as a new revision so the history
+        stays linear.
+
+        Args:
+            number: 1-based revision number to restore.
+
+        Returns:
+            The revision recorded for the restored content, or None if the
+            restored content already matched the latest revision.
+        """
+        content = self.get_content(number)
+        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+        write_text(self._output_path, content)
+        self._logger.info(f"Restored {self._output_path} to revision {number}")
+        return self.record(content)
+
+    def _latest_content(self, latest: HistoryRevision) -> str:
+        """Return the latest revision's content, reading the output if possible.
+
+        The output file usually still holds the latest revision, which avoids
+        replaying the delta chain.
+        """
+        if self._output_path.exists():
+            content = read_text(self._output_path)
+            if hashlib.sha256(content.encode('utf-8')).hexdigest() == latest.sha256:
+                return content
+        return self.get_content(latest.number)
+
+    def _compute_delta(self, base: str, content: str) -> List[DeltaOp]:
+        """Compute a line-level delta transforming base into content."""
+        base_lines = base.splitlines(keepends=True)
+        new_lines = content.splitlines(keepends=True)
+        matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+
+        delta: List[DeltaOp] = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                delta.append([i1, i2])
+            elif j2 > j1:
+                delta.append(''.join(new_lines[j1:j2]))
+        return delta
+
+    def _apply_delta(self, base: str, delta: List[DeltaOp]) -> str:
+        """Apply a delta produced by _compute_delta to base."""
+        base_lines = base.splitlines(keepends=True)
+        parts: List[str] = []
+        for op in delta:
+            if isinstance(op, str):
+                parts.append(op)
+            else:
+                parts.extend(base_lines[op[0]:op[1]])
+        return ''.join(parts)
+
+    def _blob_path(self, number: int) -> Path:
+        """Return the blob path for a revision number."""
+        return self._history_dir / f"{number:06d}.z"
+
+    def _read_blob(self, number: int) -> bytes:
+        """Read and decompress a revision blob."""
+        return zlib.decompress(self._blob_path(number).read_bytes())
+
+    def _write_index(self, revisions: List[HistoryRevision]) -> None:
+        """Persist the revision index."""
+        index = {"version": 1, "revisions": [asdict(rev) for rev in revisions]}
+        index_path = self._history_dir / self.INDEX_FILENAME
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index, indent=2), encoding='utf-8')
+        tmp_path.replace(index_path)
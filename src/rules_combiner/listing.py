@@ -0,0 +1,147 @@
+"""Machine-readable, streaming rendering of rule listings."""
+
+import heapq
+import itertools
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .discovery import RULE_FIELDS
+from .models import RuleFile
+
+# Fields shown when --fields is not given; metadata fields are opt-in
+DEFAULT_FIELDS = ("filename", "path", "title", "size", "tokens")
+
+_FIELD_VALUES: Dict[str, Callable[[RuleFile], Any]] = {
+    "filename": lambda rule: rule.filename,
+    "path": lambda rule: str(rule.path),
+    "title": lambda rule: rule.title,
+    "size": lambda rule: rule.file_size,
+    "tokens": lambda rule: rule.estimated_tokens,
+    "tags": lambda rule: rule.tags,
+    "priority": lambda rule: rule.priority,
+    "requires": lambda rule: rule.requires,
+    "after": lambda rule: rule.after,
+}
+
+
+def parse_fields(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated field list, defaulting to ``DEFAULT_FIELDS``.
+
+    Raises:
+        ValueError: If an unknown field is named.
+
+    Example:
+        >>> parse_fields("filename, size")
+        ['filename', 'size']
+    """
+    if not value:
+        return list(DEFAULT_FIELDS)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in RULE_FIELDS]
+    if unknown or not fields:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown) or value!r}; "
+            f"choose from {', '.join(RULE_FIELDS)}"
+        )
+    return fields
+
+
+def parse_sort(value: str) -> Tuple[str, bool]:
+    """Parse a sort key such as ``size`` or ``-tokens`` into (field, descending).
+
+    Raises:
+        ValueError: If the field is unknown.
+    """
+    descending = value.startswith('-')
+    field = value.lstrip('-')
+    if field not in RULE_FIELDS:
+        raise ValueError(f"Cannot sort by {field!r}; choose from {', '.join(RULE_FIELDS)}")
+    return field, descending
+
+
+def order_rules(
+    rules: Iterable[RuleFile], sort: Optional[str] = None, limit: Optional[int] = None
+) -> Iterable[RuleFile]:
+    """Sort and truncate rules, staying lazy when no sort is requested.
+
+    Without ``sort`` the first ``limit`` rules are streamed through as they
+    are discovered. With both ``sort`` and ``limit`` only ``limit`` rules
+    are kept in memory while scanning.
+
+    Args:
+        rules: Rules in discovery order.
+        sort: Field to sort by, prefixed with ``-`` for descending order.
+        limit: Maximum number of rules to return.
+
+    Returns:
+        The ordered rules.
+    """
+    if sort is None:
+        return itertools.islice(rules, limit)
+
+    field, descending = parse_sort(sort)
+    key = _FIELD_VALUES[field]
+    if limit is None:
+        return sorted(rules, key=key, reverse=descending)
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(limit, rules, key=key)
+
+
+def rule_record(rule: RuleFile, fields: Sequence[str]) -> Dict[str, Any]:
+    """Project a rule onto the requested fields, in the requested order."""
+    return {field: _FIELD_VALUES[field](rule) for field in fields}
+
+
+def iter_lines(
+    rules: Iterable[RuleFile], fields: Sequence[str], output_format: str
+) -> Iterator[str]:
+    """Render rules as lines of JSON, NDJSON or TSV, one rule at a time.
+
+    JSON output is a single array written incrementally, so every format
+    can be printed while discovery is still running.
+
+    Args:
+        rules: Rules to render.
+        fields: Fields to include, in column order.
+        output_format: One of ``json``, ``ndjson`` or ``tsv``.
+
+    Returns:
+        Iterator over output lines, without trailing newlines.
+
+    Raises:
+        ValueError: If the format is not a machine-readable one.
+    """
+    if output_format == "tsv":
+        yield "\t".join(fields)
+        for rule in rules:
+            yield "\t".join(
+                _tsv_value(value) for value in rule_record(rule, fields).values()
+            )
+    elif output_format == "ndjson":
+        for rule in rules:
+            yield json.dumps(rule_record(rule, fields), ensure_ascii=False)
+    elif output_format == "json":
+        separator = "["
+        for rule in rules:
+            yield separator + json.dumps(rule_record(rule, fields), ensure_ascii=False)
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+    else:
+        raise ValueError(f"Unsupported list format: {output_format}")
+
+
+def _tsv_value(value: Any) -> str:
+    """Format a TSV cell, replacing characters that would break the row."""
+    if isinstance(value, list):
+        value = ",".join(value)
+    return str(value).replace("\t", " ").replace("\n", " ")
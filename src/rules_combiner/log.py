@@ -0,0 +1,74 @@
+"""Lazily imported logger shared by the engine modules.
+
+Importing loguru costs more than the rest of the CLI's import graph put
+together, so engine modules log through ``logger`` from this module instead.
+It behaves like ``loguru.logger`` but only imports loguru when a record at or
+above the current threshold is actually emitted.
+"""
+
+from typing import Any, Callable, Dict, Optional, cast
+
+_LEVELS: Dict[str, int] = {
+    "trace": 5,
+    "debug": 10,
+    "info": 20,
+    "success": 25,
+    "warning": 30,
+    "error": 40,
+    "exception": 40,
+    "critical": 50,
+}
+
+_threshold = 0
+
+
+def set_level(name: str) -> None:
+    """Drop records below a level without importing loguru for them.
+
+    Args:
+        name: Level name such as ``"debug"`` or ``"warning"``.
+
+    Raises:
+        ValueError: If the level name is unknown.
+    """
+    global _threshold
+    try:
+        _threshold = _LEVELS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {name}")
+
+
+def _discard(*args: Any, **kwargs: Any) -> None:
+    """Stand-in for logging methods below the threshold."""
+
+
+class LazyLogger:
+    """Proxy for ``loguru.logger`` that imports loguru on first emitted record.
+
+    Example:
+        >>> log = logger.bind(component="discovery")
+        >>> log.debug("Found 3 rule files")  # loguru is imported here
+    """
+
+    def __init__(self, **extra: Any) -> None:
+        """Initialize the proxy with the extra fields to bind."""
+        self._extra = extra
+        self._logger: Optional[Any] = None
+
+    def bind(self, **extra: Any) -> "LazyLogger":
+        """Return a proxy with additional bound fields, like ``loguru.logger.bind``."""
+        return LazyLogger(**{**self._extra, **extra})
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        level = _LEVELS.get(name)
+        if level is not None and level < _threshold:
+            return _discard
+
+        if self._logger is None:
+            from loguru import logger as loguru_logger
+
+            self._logger = loguru_logger.bind(**self._extra) if self._extra else loguru_logger
+        return cast(Callable[..., Any], getattr(self._logger, name))
+
+
+logger = LazyLogger()
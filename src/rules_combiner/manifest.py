@@ -0,0 +1,372 @@
+"""Source manifest embedded in generated output for cheap staleness checks."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .compression import is_compressed, read_text
+from .log import logger
+from .models import CombinationConfig, SelectionMode
+
+MANIFEST_PREFIX = "<!-- rules-combiner-manifest "
+MANIFEST_SUFFIX = " -->"
+
+# Manifests are read from the end of the output; most fit well inside this window
+_TAIL_READ_SIZE = 64 * 1024
+
+
+def hash_content(content: str) -> str:
+    """Return the SHA-256 hex digest of decoded rule content.
+
+    Hashing the decoded text (rather than raw bytes) keeps the digest stable
+    across the newline translation performed when rules are read.
+
+    Args:
+        content: Decoded rule content.
+
+    Returns:
+        Hex digest of the UTF-8 encoded content.
+    """
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def selection_options(config: CombinationConfig) -> Dict[str, Any]:
+    """Return the manifest options recording how a configuration selects rules.
+
+    Besides the selection criteria, the rules directory and its modification
+    time are recorded, so verification notices rules that were added,
+    removed or renamed since. Tags and expressions also match on content,
+    so for them the newest modification time of any rule is recorded too.
+
+    Args:
+        config: Configuration the output is built from; an interactive
+            choice is recorded as the specific filenames confirmed.
+
+    Raises:
+        OSError: If the rules directory cannot be read.
+    """
+    from .completion import newest_file_mtime
+
+    rules_dir = config.rules_directory
+    options: Dict[str, Any] = {
+        "rules_directory": Path(
+            os.path.relpath(rules_dir, config.output_file.parent)
+        ).as_posix(),
+        "rules_mtime_ns": rules_dir.stat().st_mtime_ns,
+        "selection": {
+            "mode": config.selection_mode.value,
+            "rules": list(config.selected_rules),
+            "patterns": list(config.selected_patterns),
+            "tags": list(config.selected_tags),
+            "expression": config.selection_expression,
+        },
+    }
+    if config.selected_tags or config.selection_expression:
+        options["files_mtime_ns"] = newest_file_mtime(rules_dir)
+    return options
+
+
+@dataclass
+class SourceEntry:
+    """Metadata recorded for one source rule file.
+
+    Example:
+        >>> entry = SourceEntry.from_content(
+        ...     Path("rules/test.md"), "# Test", base_dir=Path(".")
+        ... )
+        >>> entry.path
+        'rules/test.md'
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def from_content(cls, rule_path: Path, content: str, base_dir: Path) -> "SourceEntry":
+        """Create an entry from a rule file and the content read from it.
+
+        Args:
+            rule_path: Path to the source rule file.
+            content: Decoded content that was read from the file.
+            base_dir: Directory that recorded paths are made relative to.
+
+        Returns:
+            SourceEntry with the file's current stat information.
+        """
+        stat = rule_path.stat()
+        return cls(
+            path=Path(os.path.relpath(rule_path, base_dir)).as_posix(),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=hash_content(content),
+        )
+
+
+@dataclass
+class SourceManifest:
+    """Records the sources and options a generated output was built from.
+
+    The manifest is embedded as a trailing HTML comment so the output file
+    carries everything needed to decide whether it is stale.
+
+    Example:
+        >>> manifest = SourceManifest(options={"include_toc": True})
+        >>> manifest.to_comment().startswith("\\n<!-- rules-combiner-manifest")
+        True
+    """
+
+    sources: List[SourceEntry] = field(default_factory=list)
+    options: Dict[str, Any] = field(default_factory=dict)
+    body_size: int = 0
+    version: int = 1
+
+    def to_comment(self) -> str:
+        """Serialize the manifest as a trailing HTML comment.
+
+        Returns:
+            Comment text, including a leading and trailing newline.
+        """
+        payload = json.dumps(asdict(self), ensure_ascii=False, separators=(',', ':'))
+        # '>' only occurs inside JSON strings, so escaping it keeps '-->' out of the comment
+        payload = payload.replace('>', '\\u003e')
+        return f"\n{MANIFEST_PREFIX}{payload}{MANIFEST_SUFFIX}\n"
+
+    def embed(self, body: str) -> str:
+        """Append the manifest to output content.
+
+        Args:
+            body: Combined rules content without a manifest.
+
+        Returns:
+            The content with the manifest comment appended.
+        """
+        return body + self.trailer_for(len(body.encode('utf-8')))
+
+    def trailer_for(self, body_size: int) -> str:
+        """Return the manifest comment for a body of the given encoded size.
+
+        Used when the body is streamed and never held as a single string.
+
+        Args:
+            body_size: Size in bytes of the UTF-8 encoded body.
+
+        Returns:
+            The manifest comment to append after the body.
+        """
+        self.body_size = body_size
+        return self.to_comment()
+
+    @classmethod
+    def from_comment(cls, comment: str) -> "SourceManifest":
+        """Parse a manifest from its comment text.
+
+        Args:
+            comment: Text containing a manifest comment.
+
+        Returns:
+            The parsed SourceManifest.
+
+        Raises:
+            ValueError: If no valid manifest is found.
+        """
+        start = comment.rfind(MANIFEST_PREFIX)
+        end = comment.rfind(MANIFEST_SUFFIX)
+        if start == -1 or end < start:
+            raise ValueError("No rules-combiner manifest found")
+
+        try:
+            data = json.loads(comment[start + len(MANIFEST_PREFIX):end])
+            sources = [SourceEntry(**entry) for entry in data.pop("sources", [])]
+            return cls(sources=sources, **data)
+        except (TypeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Malformed rules-combiner manifest: {e}")
+
+    @classmethod
+    def from_output(cls, output_path: Path) -> Optional["SourceManifest"]:
+        """Read the manifest embedded at the end of an output file.
+
+        Only the tail of the file is read unless the manifest is larger than
+        the tail window. Compressed outputs are decompressed in full.
+
+        Args:
+            output_path: Path to the generated output file.
+
+        Returns:
+            The embedded SourceManifest, or None if the file has none.
+        """
+        try:
+            if is_compressed(output_path):
+                return cls.from_comment(read_text(output_path))
+            with output_path.open('rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - _TAIL_READ_SIZE))
+                tail = f.read()
+                if MANIFEST_PREFIX.encode('utf-8') not in tail and size > _TAIL_READ_SIZE:
+                    f.seek(0)
+                    tail = f.read()
+            return cls.from_comment(tail.decode('utf-8', errors='replace'))
+        except (OSError, ValueError):
+            return None
+
+
+@dataclass
+class VerificationResult:
+    """Outcome of checking an output's manifest against its sources.
+
+    Example:
+        >>> result = VerificationResult(fresh=True, checked=3, hashed=0)
+        >>> result.fresh
+        True
+    """
+
+    fresh: bool
+    checked: int = 0
+    hashed: int = 0
+    stale_sources: List[str] = field(default_factory=list)
+    reason: Optional[str] = None
+
+
+class StalenessChecker:
+    """Decides whether a generated output is up to date with its sources.
+
+    Freshness is decided from ``stat`` calls alone; a source is only read
+    and hashed when its size or modification time differs from the manifest,
+    and the rules are only discovered again when the rules directory changed.
+
+    Example:
+        >>> checker = StalenessChecker(Path("AGENT.md"))
+        >>> checker.verify().fresh
+        True
+    """
+
+    def __init__(self, output_path: Path, tool_version: Optional[str] = None) -> None:
+        """Initialize the checker for an output file.
+
+        Args:
+            output_path: Path to the generated output file.
+            tool_version: Current tool version; outputs built by another
+                version are reported stale. Skipped when None.
+        """
+        self._output_path = output_path
+        self._tool_version = tool_version
+        self._logger = logger.bind(component="manifest")
+
+    def verify(self) -> VerificationResult:
+        """Check the output's embedded manifest against the source files.
+
+        Returns:
+            VerificationResult describing whether the output is fresh.
+        """
+        if not self._output_path.exists():
+            return VerificationResult(fresh=False, reason=f"{self._output_path} does not exist")
+
+        manifest = SourceManifest.from_output(self._output_path)
+        if manifest is None:
+            return VerificationResult(fresh=False, reason="No manifest embedded in output")
+
+        recorded_version = manifest.options.get("tool_version")
+        if self._tool_version is not None and recorded_version != self._tool_version:
+            return VerificationResult(
+                fresh=False,
+                reason=f"Built by version {recorded_version}, current is {self._tool_version}",
+            )
+
+        # A hand-edited body shows up as a size mismatch without reading it
+        expected_size = manifest.body_size + len(manifest.to_comment().encode('utf-8'))
+        if self._output_size() != expected_size:
+            return VerificationResult(fresh=False, reason="Output was modified after generation")
+
+        base_dir = self._output_path.parent
+        reason = self._selection_change(manifest, base_dir)
+        if reason is not None:
+            return VerificationResult(fresh=False, reason=reason)
+
+        result = VerificationResult(fresh=True)
+        for entry in manifest.sources:
+            result.checked += 1
+            if not self._source_matches(base_dir / entry.path, entry, result):
+                result.stale_sources.append(entry.path)
+
+        if result.stale_sources:
+            result.fresh = False
+            result.reason = f"{len(result.stale_sources)} source(s) changed"
+
+        self._logger.debug(
+            f"Verified {result.checked} sources, hashed {result.hashed}, "
+            f"stale: {len(result.stale_sources)}"
+        )
+        return result
+
+    def _selection_change(self, manifest: SourceManifest, base_dir: Path) -> Optional[str]:
+        """Describe how the rules the output's selection matches changed, if they did.
+
+        The recorded modification times are compared first; only if they
+        differ are the rules discovered and the selection resolved again.
+        Outputs whose manifest records no selection are not checked.
+        """
+        selection = manifest.options.get("selection")
+        recorded_dir = manifest.options.get("rules_directory")
+        if not isinstance(selection, dict) or not isinstance(recorded_dir, str):
+            return None
+
+        rules_dir = base_dir / recorded_dir
+        try:
+            unchanged = rules_dir.stat().st_mtime_ns == manifest.options.get("rules_mtime_ns")
+            if unchanged and "files_mtime_ns" in manifest.options:
+                from .completion import newest_file_mtime
+
+                unchanged = newest_file_mtime(rules_dir) == manifest.options["files_mtime_ns"]
+        except OSError:
+            return f"Rules directory {rules_dir} cannot be read"
+        if unchanged:
+            return None
+
+        from .discovery import RuleDiscoveryEngine
+        from .selection import select_rules
+
+        try:
+            rules = select_rules(
+                RuleDiscoveryEngine(rules_dir).discover_catalog(),
+                SelectionMode(selection.get("mode")),
+                selection.get("rules") or [],
+                selection.get("patterns") or [],
+                selection.get("tags") or [],
+                selection.get("expression"),
+            )
+        except ValueError as e:
+            return f"Selection no longer resolves: {e}"
+
+        selected = {Path(os.path.relpath(rule.path, base_dir)).as_posix() for rule in rules}
+        if selected != {entry.path for entry in manifest.sources}:
+            return "Rules matching the selection changed"
+        return None
+
+    def _output_size(self) -> int:
+        """Return the output's content size, decompressing only if needed."""
+        if is_compressed(self._output_path):
+            return len(read_text(self._output_path).encode('utf-8'))
+        return self._output_path.stat().st_size
+
+    def _source_matches(
+        self, source_path: Path, entry: SourceEntry, result: VerificationResult
+    ) -> bool:
+        """Check one source, hashing it only if its metadata changed."""
+        try:
+            stat = source_path.stat()
+        except OSError:
+            return False
+
+        if stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns:
+            return True
+
+        result.hashed += 1
+        try:
+            content = read_text(source_path)
+        except (OSError, ValueError, RuntimeError):
+            return False
+        return hash_content(content) == entry.sha256
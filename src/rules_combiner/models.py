@@ -1,6 +1,6 @@
 """Core data models for the rules combiner CLI."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional
@@ -20,7 +20,9 @@ class RuleFile:
     
     This class encapsulates all the metadata for a rule file including
     its path, basic file information, and content metadata like title
-    and description.
+    and description. Description, tags, priority, applies-to patterns and
+    the ``requires``/``after`` filenames of other rules come from the file's
+    optional frontmatter block.
     
     Example:
         >>> rule = RuleFile(
@@ -41,6 +43,11 @@ class RuleFile:
     file_size: int = 0
     is_readable: bool = True
     estimated_tokens: int = 0
+    tags: List[str] = field(default_factory=list)
+    priority: int = 0
+    applies_to: List[str] = field(default_factory=list)
+    requires: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
     
     def __post_init__(self) -> None:
         """Validate the rule file after initialization.
@@ -75,6 +82,13 @@ class CombinationConfig:
     
     This class holds all the configuration needed to combine rule files,
     including input/output paths, selected rules, and formatting options.
+    With ``selection_mode`` set to ``SelectionMode.ALL`` every discovered
+    rule is combined and ``selected_rules`` is ignored. Otherwise the named
+    ``selected_rules`` come first, followed by rules matching any of the
+    ``selected_patterns`` globs, rules carrying any of the
+    ``selected_tags`` and rules matching the ``selection_expression``.
+    A ``token_budget`` only makes the CLI warn when the estimated size of
+    the output exceeds it.
     
     Example:
         >>> config = CombinationConfig(
@@ -91,6 +105,12 @@ class CombinationConfig:
     selected_rules: List[str]
     include_toc: bool = True
     backup_existing: bool = True
+    selection_mode: SelectionMode = SelectionMode.SPECIFIC
+    selected_patterns: List[str] = field(default_factory=list)
+    embed_manifest: bool = True
+    selected_tags: List[str] = field(default_factory=list)
+    selection_expression: Optional[str] = None
+    token_budget: Optional[int] = None
     
     def __post_init__(self) -> None:
         """Validate configuration after initialization.
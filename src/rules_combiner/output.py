@@ -1,17 +1,70 @@
 """Output generator for creating the final combined rules file."""
 
+import os
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from types import TracebackType
+from typing import IO, Optional, Type, Union
 
-from loguru import logger
+from .compression import (
+    encode_content,
+    is_compressed,
+    open_text,
+    wrap_writer,
+    write_text,
+)
+from .log import logger
+from .processor import RuleProcessor
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _temporary_path_for(output_path: Path) -> Path:
+    """Return a unique temporary path next to the output for atomic replaces."""
+    return output_path.parent / (
+        f".{output_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    )
+
+
+def _replace_atomically(tmp_path: Path, output_path: Path) -> None:
+    """Move a fully written temporary file over the output path."""
+    if output_path.exists():
+        # Keep the permissions of the file being replaced
+        os.chmod(tmp_path, output_path.stat().st_mode & 0o7777)
+    os.replace(tmp_path, output_path)
+
+
+@dataclass
+class PatchResult:
+    """Outcome of an incremental write.
+    
+    ``mode`` is ``"unchanged"`` when the file already matched, ``"patched"``
+    when only the tail from ``offset`` was rewritten in place, and
+    ``"rewritten"`` when the whole file was replaced atomically.
+    ``backup_path`` is set by callers that back up the file before writing.
+    
+    Example:
+        >>> result = PatchResult(mode="patched", offset=4096, bytes_written=512)
+        >>> result.mode
+        'patched'
+    """
+    
+    mode: str
+    offset: int = 0
+    bytes_written: int = 0
+    backup_path: Optional[Path] = None
 
 
 class OutputGenerator:
     """Generates the final combined rules file.
     
     This class handles writing the combined rules content to the output file,
-    creating backups of existing files, and validating the output.
+    creating backups of existing files, and validating the output. Output
+    paths ending in .gz, .bz2, .xz or .zst are written compressed.
     
     Example:
         >>> generator = OutputGenerator(Path("AGENT.md"))
@@ -52,15 +105,24 @@ class OutputGenerator:
             self._logger.debug(f"Output file {self._output_path} does not exist, no backup needed")
             return None
         
-        # Generate backup filename with timestamp
+        # Generate backup filename with timestamp, keeping any compression suffix last
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"{self._output_path.stem}_backup_{timestamp}{self._output_path.suffix}"
+        compressed = is_compressed(self._output_path)
+        base_path = self._output_path.with_suffix("") if compressed else self._output_path
+        compression_suffix = self._output_path.suffix if compressed else ""
+        backup_filename = (
+            f"{base_path.stem}_backup_{timestamp}{base_path.suffix}{compression_suffix}"
+        )
         backup_path = self._output_path.parent / backup_filename
         
         try:
-            # Read existing content and write to backup
-            existing_content = self._output_path.read_text(encoding='utf-8')
-            backup_path.write_text(existing_content, encoding='utf-8')
+            if compressed:
+                # Compressed content is copied as-is
+                shutil.copyfile(self._output_path, backup_path)
+            else:
+                # Read existing content and write to backup
+                existing_content = self._output_path.read_text(encoding='utf-8')
+                backup_path.write_text(existing_content, encoding='utf-8')
             
             self._logger.info(f"Created backup file: {backup_path}")
             return backup_path
@@ -86,8 +148,8 @@ class OutputGenerator:
             # Create parent directories if they don't exist
             self._output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write the content to the file
-            self._output_path.write_text(content, encoding='utf-8')
+            # Write the content to the file, compressing by suffix
+            write_text(self._output_path, content)
             
             self._logger.info(f"Successfully wrote combined rules to: {self._output_path}")
             self._logger.debug(f"Output file size: {self._output_path.stat().st_size} bytes")
@@ -96,6 +158,109 @@ class OutputGenerator:
             self._logger.error(f"Failed to write output file {self._output_path}: {e}")
             raise
     
+    def write_incremental(
+        self, content: Union[str, bytes], max_size_change: float = 0.5
+    ) -> PatchResult:
+        """Write content by patching only the changed part of the existing file.
+        
+        Uses the section boundary markers written by the processor to find the
+        first changed section, then rewrites the file from that byte onward.
+        When no usable existing file is found, or the size changes by more than
+        ``max_size_change`` of the old size, the file is replaced atomically.
+        Either way the result is byte-identical to a full write. Compressed
+        outputs cannot be patched and are always replaced when changed.
+        
+        Args:
+            content: The complete combined rules content, as text or as
+                UTF-8 encoded bytes.
+            max_size_change: Relative size change above which the file is
+                rebuilt via atomic replace instead of patched in place.
+            
+        Returns:
+            PatchResult describing how the file was written.
+            
+        Raises:
+            PermissionError: If there are permission issues writing the file.
+            OSError: If there are other I/O issues.
+        """
+        new_bytes = encode_content(self._output_path, content)
+        
+        try:
+            old_bytes = self._output_path.read_bytes()
+        except FileNotFoundError:
+            old_bytes = None
+        
+        if old_bytes == new_bytes:
+            self._logger.info(f"Output unchanged, nothing written: {self._output_path}")
+            return PatchResult(mode="unchanged", offset=len(new_bytes))
+        
+        offset = 0
+        if old_bytes and not is_compressed(self._output_path):
+            offset = self._find_first_changed_offset(old_bytes, new_bytes)
+        
+        size_change = abs(len(new_bytes) - len(old_bytes or b""))
+        if (
+            not old_bytes
+            or offset == 0
+            or size_change > max_size_change * len(old_bytes)
+        ):
+            self._atomic_write(new_bytes)
+            self._logger.info(f"Rewrote output file: {self._output_path}")
+            return PatchResult(mode="rewritten", bytes_written=len(new_bytes))
+        
+        tail = new_bytes[offset:]
+        try:
+            with self._output_path.open('r+b') as f:
+                f.seek(offset)
+                f.write(tail)
+                f.truncate()
+        except (OSError, PermissionError) as e:
+            self._logger.error(f"Failed to patch output file {self._output_path}: {e}")
+            raise
+        
+        self._logger.info(
+            f"Patched output file from byte {offset:,}: {self._output_path} "
+            f"({len(tail):,} of {len(new_bytes):,} bytes written)"
+        )
+        return PatchResult(mode="patched", offset=offset, bytes_written=len(tail))
+    
+    def _find_first_changed_offset(self, old_bytes: bytes, new_bytes: bytes) -> int:
+        """Return the byte offset of the first section that differs.
+        
+        Compares marker digests rather than section content, then confirms the
+        shared prefix really is identical before trusting the offset.
+        """
+        processor = RuleProcessor()
+        old_markers = processor.find_section_markers(old_bytes)
+        new_markers = processor.find_section_markers(new_bytes)
+        
+        offset = 0
+        for old_marker, new_marker in zip(old_markers, new_markers):
+            if (
+                old_marker.section_id != new_marker.section_id
+                or old_marker.digest != new_marker.digest
+                or old_marker.start != new_marker.start
+            ):
+                offset = new_marker.start
+                break
+            offset = new_marker.content_end
+        
+        if memoryview(old_bytes)[:offset] != memoryview(new_bytes)[:offset]:
+            return 0
+        return offset
+    
+    def _atomic_write(self, data: bytes) -> None:
+        """Replace the output file with data via a temporary file and rename."""
+        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _temporary_path_for(self._output_path)
+        try:
+            with tmp_path.open('xb') as f:
+                f.write(data)
+            _replace_atomically(tmp_path, self._output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     def validate_output(self) -> bool:
         """Validate that the output file was written correctly.
         
@@ -120,20 +285,153 @@ class OutputGenerator:
                 self._logger.warning(f"Output file is empty: {self._output_path}")
                 return False
             
-            # Try to read the file to ensure it's readable
+            # Stream through the file to ensure it decodes and is not all whitespace
+            content_length = 0
+            has_content = False
             try:
-                content = self._output_path.read_text(encoding='utf-8')
-                if not content.strip():
+                with open_text(self._output_path) as f:
+                    while True:
+                        chunk = f.read(_COPY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        content_length += len(chunk)
+                        has_content = has_content or bool(chunk.strip())
+                if not has_content:
                     self._logger.warning(f"Output file contains only whitespace: {self._output_path}")
                     return False
-            except UnicodeDecodeError as e:
+            except (UnicodeDecodeError, EOFError, RuntimeError) as e:
                 self._logger.warning(f"Output file has encoding issues: {self._output_path}, {e}")
                 return False
             
             self._logger.info(f"Output file validation successful: {self._output_path}")
-            self._logger.debug(f"Validated file size: {file_size} bytes, content length: {len(content)} chars")
+            self._logger.debug(f"Validated file size: {file_size} bytes, content length: {content_length} chars")
             return True
             
         except (OSError, PermissionError) as e:
             self._logger.error(f"Error validating output file {self._output_path}: {e}")
             return False
+
+
+class SpooledOutputWriter:
+    """Builds an output file section by section under a memory ceiling.
+    
+    Sections are encoded one at a time into a spooled temporary buffer that
+    stays in memory up to ``max_memory`` bytes and transparently moves to
+    disk beyond that, so the combined document is never held as one string.
+    Because every section's size is known once spooled, the final file is
+    preallocated at its exact size before being copied into place.
+    
+    Example:
+        >>> with SpooledOutputWriter(Path("AGENT.md"), max_memory=8 * 1024**2) as writer:
+        ...     for section in sections:
+        ...         writer.add_section(section)
+        ...     writer.finalize()
+    """
+    
+    def __init__(self, output_path: Path, max_memory: int, separator: str = "\n") -> None:
+        """Initialize the writer.
+        
+        Args:
+            output_path: Path where the combined rules file will be written.
+            max_memory: Bytes buffered in memory before spilling to disk.
+            separator: Text inserted between consecutive sections.
+        """
+        self._output_path = output_path
+        self._max_memory = max_memory
+        self._separator = separator.encode('utf-8')
+        self._spool: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._body_size = 0
+        self._section_count = 0
+        self._logger = logger.bind(component="output")
+    
+    @property
+    def body_size(self) -> int:
+        """Encoded size in bytes of all sections added so far."""
+        return self._body_size
+    
+    @property
+    def spilled_to_disk(self) -> bool:
+        """Whether the buffered sections exceeded the memory ceiling."""
+        return self._body_size > self._max_memory
+    
+    def add_section(self, section: str) -> int:
+        """Append a section to the spool.
+        
+        Args:
+            section: Formatted section text.
+            
+        Returns:
+            Number of bytes the section added, including any separator.
+        """
+        data = section.encode('utf-8')
+        written = 0
+        if self._section_count:
+            self._spool.write(self._separator)
+            written += len(self._separator)
+        self._spool.write(data)
+        written += len(data)
+        
+        self._section_count += 1
+        self._body_size += written
+        return written
+    
+    def finalize(self, trailer: str = "") -> int:
+        """Write the spooled sections plus trailer to the output atomically.
+        
+        Args:
+            trailer: Text appended after the last section (e.g. a manifest).
+            
+        Returns:
+            Number of content bytes written (before any compression).
+            
+        Raises:
+            OSError: If the output file cannot be written.
+        """
+        trailer_bytes = trailer.encode('utf-8')
+        total_size = self._body_size + len(trailer_bytes)
+        
+        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _temporary_path_for(self._output_path)
+        try:
+            with tmp_path.open('xb') as raw:
+                if not is_compressed(self._output_path):
+                    self._preallocate(raw, total_size)
+                with wrap_writer(self._output_path, raw) as writer:
+                    self._spool.seek(0)
+                    shutil.copyfileobj(self._spool, writer, _COPY_CHUNK_SIZE)
+                    writer.write(trailer_bytes)
+            _replace_atomically(tmp_path, self._output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        self._logger.info(
+            f"Wrote {total_size:,} bytes to {self._output_path} through a "
+            f"{self._max_memory:,} byte spool (spilled to disk: {self.spilled_to_disk})"
+        )
+        return total_size
+    
+    def close(self) -> None:
+        """Release the spool buffer and any temporary file behind it."""
+        self._spool.close()
+    
+    def __enter__(self) -> "SpooledOutputWriter":
+        return self
+    
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+    
+    def _preallocate(self, raw: IO[bytes], size: int) -> None:
+        """Reserve the file's final size up front where the platform allows it."""
+        if size <= 0 or not hasattr(os, "posix_fallocate"):
+            return
+        try:
+            os.posix_fallocate(raw.fileno(), 0, size)
+        except OSError as e:
+            # Not every filesystem supports preallocation; writing still works
+            self._logger.debug(f"Preallocation skipped for {self._output_path}: {e}")
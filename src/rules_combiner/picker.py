@@ -0,0 +1,390 @@
+"""Full-screen, keyboard-driven rule picker built on curses.
+
+Only the rows inside the visible window are ever formatted, and moving the
+cursor or toggling a checkbox redraws just the rows that changed, so the
+picker stays responsive with catalogs of 100,000 rules. The whole window is
+redrawn only when it scrolls, is resized or is filtered by a search. The
+status line shows the selection's running token total, updated in constant
+time per toggle, and flags a selection over the token budget.
+
+Pressing ``p`` opens a preview pane below the list showing the first lines
+of the highlighted rule, then its heading outline; only rules that are
+highlighted while the pane is open are read.
+
+curses ships with Python on Linux and macOS; on Windows it needs the
+``windows-curses`` package. ``picker_available()`` reports whether it can
+be used.
+
+Example:
+    >>> if picker_available():
+    ...     filenames = CursesPicker(rules).run()
+"""
+
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from .models import RuleFile
+from .preview import HEAD, OUTLINE, PreviewCache
+from .search import TrigramIndex
+from .totals import SelectionTotals
+
+try:
+    import curses
+except ImportError:  # pragma: no cover - Windows without windows-curses
+    curses = None  # type: ignore[assignment]
+
+
+# Screen lines used by the header and the status line
+CHROME_LINES = 2
+
+HELP_TEXT = "space toggle · a all · / search · p preview · enter done · q cancel"
+
+# Preview pane modes cycled through by the 'p' key
+PREVIEW_MODES = (None, HEAD, OUTLINE)
+
+
+def picker_available() -> bool:
+    """Return True if curses can be imported on this platform."""
+    return curses is not None
+
+
+class PickerState:
+    """Cursor, scroll position, filter and selection of the picker.
+
+    Positions refer to the current view, which is every rule or the
+    matches of the active search; selections are kept as catalog indices so
+    they survive filtering. Methods that change the screen return the view
+    positions that need redrawing.
+
+    Example:
+        >>> state = PickerState(rules, height=20)
+        >>> state.move(1)
+        {0, 1}
+        >>> state.toggle()
+        {1}
+    """
+
+    def __init__(
+        self, rules: Sequence[RuleFile], height: int, totals: Optional[SelectionTotals] = None
+    ) -> None:
+        """Initialize the state.
+
+        Args:
+            rules: Rules to pick from, in display order.
+            height: Number of rule rows that fit on screen.
+            totals: Running totals to keep up to date, configured with the
+                budget and output options; empty totals by default.
+        """
+        self.rules = rules
+        self.view: List[int] = list(range(len(rules)))
+        self.height = max(1, height)
+        self.cursor = 0
+        self.top = 0
+        self.selected: Set[int] = set()
+        self.totals = totals if totals is not None else SelectionTotals()
+        self.totals.clear()
+        self.query = ""
+        self.preview_mode: Optional[str] = None
+        self.previews = PreviewCache()
+        self._index: Optional[TrigramIndex] = None
+
+    @property
+    def visible(self) -> range:
+        """View positions inside the window."""
+        return range(self.top, min(self.top + self.height, len(self.view)))
+
+    def move(self, delta: int) -> Set[int]:
+        """Move the cursor, scrolling the window to keep it visible.
+
+        Args:
+            delta: Rows to move; negative moves up. Clamped to the view.
+
+        Returns:
+            View positions to redraw (the old and new cursor rows).
+        """
+        if not self.view:
+            return set()
+        previous = self.cursor
+        self.cursor = min(max(self.cursor + delta, 0), len(self.view) - 1)
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + self.height:
+            self.top = self.cursor - self.height + 1
+        return {previous, self.cursor}
+
+    def toggle(self) -> Set[int]:
+        """Toggle the rule under the cursor.
+
+        Returns:
+            View positions to redraw.
+        """
+        if not self.view:
+            return set()
+        index = self.view[self.cursor]
+        if index in self.selected:
+            self.selected.discard(index)
+            self.totals.remove(self.rules[index])
+        else:
+            self.selected.add(index)
+            self.totals.add(self.rules[index])
+        return {self.cursor}
+
+    def toggle_all(self) -> Set[int]:
+        """Select every rule in the view, or clear them if all are selected.
+
+        Returns:
+            View positions to redraw (the visible rows).
+        """
+        in_view = set(self.view)
+        if in_view <= self.selected:
+            self.selected -= in_view
+            for index in in_view:
+                self.totals.remove(self.rules[index])
+        else:
+            for index in in_view - self.selected:
+                self.totals.add(self.rules[index])
+            self.selected |= in_view
+        return set(self.visible)
+
+    def filter(self, query: str) -> None:
+        """Show only rules matching a fuzzy search; an empty query shows all.
+
+        The trigram index is built on the first search.
+        """
+        self.query = query
+        if not query.strip():
+            self.view = list(range(len(self.rules)))
+        else:
+            if self._index is None:
+                self._index = TrigramIndex(
+                    f"{rule.filename} {rule.title}" for rule in self.rules
+                )
+            self.view = self._index.search(query)
+        self.cursor = 0
+        self.top = 0
+
+    def resize(self, height: int) -> None:
+        """Change the window height, keeping the cursor visible."""
+        self.height = max(1, height)
+        self.top = min(self.top, self.cursor)
+        if self.cursor >= self.top + self.height:
+            self.top = self.cursor - self.height + 1
+
+    def cycle_preview(self) -> None:
+        """Switch the preview pane between off, first lines and outline."""
+        position = PREVIEW_MODES.index(self.preview_mode)
+        self.preview_mode = PREVIEW_MODES[(position + 1) % len(PREVIEW_MODES)]
+
+    def preview_height(self, rows: int) -> int:
+        """Screen lines taken by the preview pane, including its title line."""
+        if self.preview_mode is None:
+            return 0
+        return min(self.previews.lines + 1, max(0, rows - CHROME_LINES) // 2)
+
+    def preview_lines(self) -> List[str]:
+        """Return the preview of the rule under the cursor, reading it if needed."""
+        if self.preview_mode is None or not self.view:
+            return []
+        rule = self.rules[self.view[self.cursor]]
+        if self.preview_mode == OUTLINE:
+            return self.previews.outline(rule)
+        return self.previews.head(rule)
+
+    def selected_filenames(self) -> List[str]:
+        """Return the selected filenames in catalog order."""
+        return [self.rules[index].filename for index in sorted(self.selected)]
+
+    def format_row(self, position: int, width: int) -> str:
+        """Format one view row, truncated to the screen width."""
+        index = self.view[position]
+        rule = self.rules[index]
+        mark = "x" if index in self.selected else " "
+        tokens = f"~{rule.estimated_tokens:,}"
+        text = f"[{mark}] {index + 1:>6}  {rule.filename}  {rule.title}"
+        padding = width - len(text) - len(tokens) - 1
+        if padding > 0:
+            return f"{text}{' ' * padding}{tokens}"
+        return text[:max(0, width - 1)]
+
+    def status(self) -> str:
+        """Return the status line text."""
+        first = self.top + 1 if self.view else 0
+        last = self.top + len(self.visible)
+        search = f" · /{self.query}" if self.query else ""
+        totals = self.totals
+        tokens = f"~{totals.total_tokens:,}"
+        if totals.budget is not None:
+            tokens += f"/{totals.budget:,}"
+        tokens += " tokens"
+        if totals.delta is not None:
+            tokens += f" ({totals.delta:+,})"
+        if totals.over_budget:
+            tokens += " OVER BUDGET"
+        return (
+            f"{len(self.selected)} selected · {tokens} · {first}-{last} of {len(self.view)}"
+            f"{search} · {HELP_TEXT}"
+        )
+
+
+class CursesPicker:
+    """Full-screen picker returning the filenames the user selected."""
+
+    def __init__(self, rules: Sequence[RuleFile], totals: Optional[SelectionTotals] = None) -> None:
+        """Initialize the picker.
+
+        Args:
+            rules: Rules to pick from, in display order.
+            totals: Running totals shown on the status line, configured
+                with the budget and output options.
+
+        Raises:
+            RuntimeError: If curses is not available.
+        """
+        if curses is None:
+            raise RuntimeError("The picker needs curses (pip install windows-curses on Windows)")
+        self._rules = rules
+        self._totals = totals
+        self._state: Optional[PickerState] = None
+        self._drawn_top = -1
+        self._drawn_preview: Optional[Tuple[int, Optional[str]]] = None
+
+    def run(self) -> List[str]:
+        """Show the picker until the user confirms or cancels.
+
+        Returns:
+            Selected filenames in catalog order, or an empty list if the
+            user cancelled.
+        """
+        return curses.wrapper(self._main)
+
+    def _main(self, screen: Any) -> List[str]:
+        """Event loop run inside ``curses.wrapper``."""
+        curses.curs_set(0)
+        screen.keypad(True)
+        rows, _ = screen.getmaxyx()
+        state = self._state = PickerState(self._rules, rows - CHROME_LINES, self._totals)
+        self.render(screen, None)
+
+        moves = {
+            curses.KEY_UP: -1, ord('k'): -1, curses.KEY_DOWN: 1, ord('j'): 1,
+        }
+        while True:
+            key = screen.getch()
+            dirty: Optional[Set[int]] = set()
+            if key in moves:
+                dirty = state.move(moves[key])
+            elif key == curses.KEY_PPAGE:
+                dirty = state.move(-state.height)
+            elif key == curses.KEY_NPAGE:
+                dirty = state.move(state.height)
+            elif key in (curses.KEY_HOME, ord('g')):
+                dirty = state.move(-len(state.view))
+            elif key in (curses.KEY_END, ord('G')):
+                dirty = state.move(len(state.view))
+            elif key == ord(' '):
+                dirty = state.toggle()
+                state.move(1)
+                dirty |= {state.cursor}
+            elif key == ord('a'):
+                dirty = state.toggle_all()
+            elif key == ord('/'):
+                self._read_query(screen)
+                dirty = None
+            elif key == ord('p'):
+                state.cycle_preview()
+                rows, _ = screen.getmaxyx()
+                state.resize(rows - CHROME_LINES - state.preview_height(rows))
+                dirty = None
+            elif key == curses.KEY_RESIZE:
+                rows, _ = screen.getmaxyx()
+                state.resize(rows - CHROME_LINES - state.preview_height(rows))
+                dirty = None
+            elif key in (curses.KEY_ENTER, 10, 13):
+                return state.selected_filenames()
+            elif key in (ord('q'), 27):
+                return []
+            self.render(screen, dirty)
+
+    def _read_query(self, screen: Any) -> None:
+        """Edit the search query on the status line, filtering as the user types."""
+        state = self._state
+        assert state is not None
+        query = state.query
+        while True:
+            rows, width = screen.getmaxyx()
+            screen.move(rows - 1, 0)
+            screen.clrtoeol()
+            screen.addnstr(rows - 1, 0, f"/{query}", width - 1)
+            screen.refresh()
+            key = screen.getch()
+            if key in (curses.KEY_ENTER, 10, 13, 27):
+                return
+            if key in (curses.KEY_BACKSPACE, 127, 8):
+                query = query[:-1]
+            elif 32 <= key < 127:
+                query += chr(key)
+            else:
+                continue
+            state.filter(query)
+            self.render(screen, None)
+
+    def render(self, screen: Any, dirty: Optional[Set[int]]) -> None:
+        """Draw the picker, redrawing only the rows that changed.
+
+        Args:
+            screen: curses window (or any object with the same methods).
+            dirty: View positions to redraw; None, or a scrolled window,
+                redraws every visible row and the header.
+        """
+        state = self._state
+        assert state is not None
+        rows, width = screen.getmaxyx()
+        full = dirty is None or state.top != self._drawn_top
+        if full:
+            screen.erase()
+            screen.addnstr(0, 0, "Select rules to combine", width - 1, _attribute("A_BOLD"))
+            positions = set(state.visible)
+        else:
+            positions = {position for position in dirty or () if position in state.visible}
+
+        for position in sorted(positions):
+            line = 1 + position - state.top
+            screen.move(line, 0)
+            screen.clrtoeol()
+            attribute = _attribute("A_REVERSE") if position == state.cursor else 0
+            screen.addnstr(line, 0, state.format_row(position, width), width - 1, attribute)
+
+        pane = state.preview_height(rows)
+        shown = (state.view[state.cursor] if state.view else -1, state.preview_mode)
+        if pane and (full or shown != self._drawn_preview):
+            self._render_preview(screen, rows - 1 - pane, pane, width)
+        self._drawn_preview = shown if pane else None
+
+        screen.move(rows - 1, 0)
+        screen.clrtoeol()
+        emphasis = _attribute("A_BOLD") if state.totals.over_budget else _attribute("A_DIM")
+        screen.addnstr(rows - 1, 0, state.status(), width - 1, emphasis)
+        screen.refresh()
+        self._drawn_top = state.top
+
+    def _render_preview(self, screen: Any, first_line: int, height: int, width: int) -> None:
+        """Draw the preview pane: a title line, then the preview of the highlighted rule."""
+        state = self._state
+        assert state is not None
+        title = ""
+        if state.view:
+            rule = state.rules[state.view[state.cursor]]
+            title = f"── {rule.filename} ({state.preview_mode}) "
+        lines = state.preview_lines()
+        for offset in range(height):
+            line = first_line + offset
+            screen.move(line, 0)
+            screen.clrtoeol()
+            if offset == 0:
+                screen.addnstr(line, 0, title.ljust(width - 1, "─"), width - 1, _attribute("A_BOLD"))
+            elif offset - 1 < len(lines):
+                screen.addnstr(line, 0, lines[offset - 1], width - 1)
+
+
+def _attribute(name: str) -> int:
+    """Return a curses text attribute, or 0 when curses is unavailable."""
+    return getattr(curses, name, 0)
@@ -0,0 +1,110 @@
+"""Lazily read, cached previews of rule content for the selectors.
+
+A preview is either the first lines of a rule's body, after its
+frontmatter, or the outline of its Markdown headings. Files are read only
+when a preview is asked for, a head preview stops reading after the lines
+it shows, and a bounded LRU cache keeps the most recently previewed rules,
+so browsing a large catalog reads nothing but the rules actually looked at.
+
+Example:
+    >>> previews = PreviewCache(lines=5)
+    >>> previews.head(rule)
+    ['# Python Testing', '', 'Use pytest fixtures...']
+"""
+
+import itertools
+import re
+from collections import OrderedDict
+from typing import Iterator, List, Tuple
+
+from .compression import open_text
+from .frontmatter import read_frontmatter
+from .models import RuleFile
+
+# Lines shown by a preview
+PREVIEW_LINES = 20
+
+# Rules whose previews are kept
+PREVIEW_CACHE_SIZE = 64
+
+HEAD = "head"
+OUTLINE = "outline"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+class PreviewCache:
+    """Bounded LRU cache of rule previews.
+
+    Example:
+        >>> previews = PreviewCache()
+        >>> previews.outline(rule)
+        ['Python Testing', '  Fixtures', '  Parametrize']
+    """
+
+    def __init__(self, lines: int = PREVIEW_LINES, max_entries: int = PREVIEW_CACHE_SIZE) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            lines: Maximum number of lines in a preview.
+            max_entries: Maximum number of previews kept; the least recently
+                used is dropped first.
+        """
+        self.lines = max(1, lines)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._previews: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._previews)
+
+    def head(self, rule: RuleFile) -> List[str]:
+        """Return the first lines of a rule's body, without line endings."""
+        return self._get(rule, HEAD)
+
+    def outline(self, rule: RuleFile) -> List[str]:
+        """Return a rule's headings, indented two spaces per level below the first."""
+        return self._get(rule, OUTLINE)
+
+    def _get(self, rule: RuleFile, kind: str) -> List[str]:
+        """Return a cached preview, reading the rule on a miss."""
+        key = (kind, str(rule.path))
+        if key in self._previews:
+            self.hits += 1
+            self._previews.move_to_end(key)
+            return self._previews[key]
+
+        self.misses += 1
+        try:
+            with open_text(rule.path) as f:
+                _, body = read_frontmatter(f)
+                if kind == HEAD:
+                    preview = [line.rstrip("\r\n") for line in itertools.islice(body, self.lines)]
+                else:
+                    preview = list(itertools.islice(_headings(body), self.lines))
+        except (UnicodeDecodeError, OSError, EOFError, RuntimeError) as e:
+            # Not cached, so a file that becomes readable previews next time
+            return [f"(cannot read {rule.filename}: {e})"]
+
+        self._previews[key] = preview
+        if len(self._previews) > self.max_entries:
+            self._previews.popitem(last=False)
+        return preview
+
+
+def _headings(lines: Iterator[str]) -> Iterator[str]:
+    """Yield indented Markdown headings, skipping fenced code blocks."""
+    fence = None
+    for line in lines:
+        fence_match = _FENCE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            fence = None if fence == marker else fence or marker
+            continue
+        if fence is None:
+            heading = _HEADING.match(line.rstrip("\r\n"))
+            if heading:
+                yield "  " * (len(heading.group(1)) - 1) + heading.group(2)
@@ -1,11 +1,46 @@
 """Rule processor for content processing and formatting."""
 
+import hashlib
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterator, List, Optional
 
+from .compression import read_text
+from .frontmatter import split_frontmatter
+from .manifest import SourceEntry, SourceManifest
 from .models import RuleFile
 
+SECTION_MARKER_PATTERN = re.compile(
+    rb'<!-- rules-combiner:section id="(?P<id>[^"]*)" '
+    rb'sha256="(?P<sha>[0-9a-f]+)" size="(?P<size>\d+)" -->\n'
+)
+
+
+@dataclass
+class SectionMarker:
+    """Location of a section boundary marker within combined output.
+    
+    Offsets are byte offsets into the UTF-8 encoded output. The section's
+    content starts right after the marker and spans ``size`` bytes.
+    
+    Example:
+        >>> marker = SectionMarker("rule.md", "ab12cd34ef56ab78", 0, 75, 120)
+        >>> marker.content_end
+        195
+    """
+    
+    section_id: str
+    digest: str
+    start: int
+    content_start: int
+    size: int
+    
+    @property
+    def content_end(self) -> int:
+        """Byte offset just past the end of the section content."""
+        return self.content_start + self.size
+
 
 class RuleProcessor:
     """Processes and formats rule content for combination.
@@ -28,6 +63,8 @@ class RuleProcessor:
         """Read and return the content of a rule file.
         
         Reads the file content with UTF-8 encoding and returns it as a string.
+        Compressed rule files (.md.gz, .md.bz2, .md.xz, .md.zst) are
+        decompressed transparently while streaming.
         
         Args:
             rule_path: Path to the rule file to read.
@@ -38,9 +75,10 @@ class RuleProcessor:
         Raises:
             FileNotFoundError: If the rule file does not exist.
             UnicodeDecodeError: If the file cannot be decoded as UTF-8.
+            ValueError: If a compressed rule file cannot be decompressed.
         """
         try:
-            return rule_path.read_text(encoding='utf-8')
+            return read_text(rule_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Rule file not found: {rule_path}")
         except UnicodeDecodeError as e:
@@ -54,6 +92,7 @@ class RuleProcessor:
         
         Takes raw rule content and formats it for inclusion in the combined
         document. This includes:
+        - Removing the frontmatter metadata block, if any
         - Replacing the original title with the provided title
         - Preserving subsection headers (##, ###, etc.)
         - Maintaining original formatting and structure
@@ -65,6 +104,8 @@ class RuleProcessor:
         Returns:
             Formatted content ready for inclusion in combined document.
         """
+        _, content = split_frontmatter(content)
+        
         if not content.strip():
             # Handle empty content
             return f"# {title}\n\n*No content available.*\n\n"
@@ -122,6 +163,89 @@ class RuleProcessor:
         toc_lines.append("")  # Add final empty line
         return '\n'.join(toc_lines)
     
+    def iter_sections(
+        self,
+        rules: List[RuleFile],
+        include_toc: bool = True,
+        manifest: Optional[SourceManifest] = None,
+        manifest_base_dir: Optional[Path] = None,
+        on_rule: Optional[Callable[[RuleFile], None]] = None,
+    ) -> Iterator[str]:
+        """Yield the marked-up sections of the combined document one at a time.
+        
+        Rule files are read lazily as sections are consumed, so callers can
+        stream sections without holding the whole document. Joining the
+        sections with a newline gives the combined document body.
+        
+        Args:
+            rules: Rules to include, in output order.
+            include_toc: Whether to start with a table of contents section.
+            manifest: Manifest that receives a source entry per rule read.
+            manifest_base_dir: Directory manifest paths are relative to.
+            on_rule: Callback invoked before each rule file is read.
+            
+        Returns:
+            Iterator over section strings, each prefixed by its marker.
+        """
+        if include_toc:
+            toc = self.generate_table_of_contents(rules)
+            yield self.format_section_marker("toc", toc) + toc
+        
+        for rule in rules:
+            if on_rule is not None:
+                on_rule(rule)
+            
+            rule_content = self.read_rule_content(rule.path)
+            formatted_section = self.format_rule_section(rule_content, rule.title)
+            if manifest is not None:
+                manifest.sources.append(SourceEntry.from_content(
+                    rule.path, rule_content, manifest_base_dir or Path(".")
+                ))
+            
+            yield self.format_section_marker(rule.filename, formatted_section) + formatted_section
+    
+    def format_section_marker(self, section_id: str, section: str) -> str:
+        """Create the boundary marker placed before a section.
+        
+        Markers are HTML comments, so they do not render, and record the
+        section's digest and size so unchanged sections can be recognised
+        in an existing output without comparing their content.
+        
+        Args:
+            section_id: Stable identifier of the section (e.g. rule filename).
+            section: The formatted section content that follows the marker.
+            
+        Returns:
+            Marker line, including its trailing newline.
+        """
+        encoded = section.encode('utf-8')
+        digest = hashlib.sha256(encoded).hexdigest()[:16]
+        safe_id = section_id.replace('"', "'")
+        return (
+            f'<!-- rules-combiner:section id="{safe_id}" '
+            f'sha256="{digest}" size="{len(encoded)}" -->\n'
+        )
+    
+    def find_section_markers(self, content: bytes) -> List[SectionMarker]:
+        """Locate all section boundary markers in encoded output.
+        
+        Args:
+            content: UTF-8 encoded combined output.
+            
+        Returns:
+            Markers in document order.
+        """
+        return [
+            SectionMarker(
+                section_id=match.group("id").decode('utf-8'),
+                digest=match.group("sha").decode('ascii'),
+                start=match.start(),
+                content_start=match.end(),
+                size=int(match.group("size")),
+            )
+            for match in SECTION_MARKER_PATTERN.finditer(content)
+        ]
+    
     def _create_anchor_link(self, title: str) -> str:
         """Create a GitHub-flavored markdown anchor link from a title.
         
@@ -0,0 +1,310 @@
+"""Named selection profiles with cached builds.
+
+Profiles are kept in a TOML file, ``rules-profiles.toml`` by default. Each
+``[profiles.<name>]`` table accepts the keys of a ``--config`` file, and
+top-level keys are defaults shared by every profile:
+
+    rules_directory = "rules"
+
+    [profiles.backend-python]
+    selected_rules = ["python-coding.md", "python-test.md"]
+    select_tags = ["backend"]
+
+    [profiles.frontend-ts]
+    select_glob = ["type-script*.md", "ui-*.md"]
+    output_file = "web/AGENT.md"
+
+After a profile is built, a copy of its output and a manifest of its inputs
+are kept in ``.rules-profiles/<name>/`` next to the profiles file. The
+manifest records the build settings and the size and modification time of
+every input, so an unchanged profile is recognized with ``stat`` calls
+alone. If only the output file changed since, the cached copy is restored
+without discovering or reading any rule.
+
+Example:
+    >>> config = load_profile(Path("rules-profiles.toml"), "backend-python")
+    >>> cache = ProfileCache(Path("rules-profiles.toml"), "backend-python")
+    >>> cache.check(build_key(config, "0.1.0"), config.rules_directory, config.output_file)
+    'current'
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .config import config_from_mapping, read_toml
+from .models import CombinationConfig, RuleFile
+
+PROFILES_FILE = Path("rules-profiles.toml")
+
+CACHE_DIR = ".rules-profiles"
+
+# Profile names are bare TOML keys and cache directory names
+_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Results of ProfileCache.check
+CURRENT = "current"
+CACHED = "cached"
+STALE = "stale"
+
+
+def load_profile(path: Path, name: str) -> CombinationConfig:
+    """Load one profile from a profiles file.
+
+    Relative paths are resolved against the profiles file's directory.
+
+    Args:
+        path: Path to the profiles file.
+        name: Name of the profile.
+
+    Returns:
+        The profile's combination settings.
+
+    Raises:
+        ValueError: If the file cannot be read, has no such profile, or the
+            profile is invalid.
+    """
+    data = read_toml(path)
+    profiles = _profile_tables(data, path)
+    if name not in profiles:
+        available = ", ".join(sorted(profiles)) or "none"
+        raise ValueError(f"Unknown profile '{name}' in {path} (available: {available})")
+    defaults = {key: value for key, value in data.items() if key != "profiles"}
+    try:
+        return config_from_mapping({**defaults, **profiles[name]}, path.parent)
+    except ValueError as e:
+        raise ValueError(f"Profile '{name}': {e}")
+
+
+def profile_names(path: Path) -> List[str]:
+    """Return the names of the profiles in a file, sorted.
+
+    Raises:
+        ValueError: If the file cannot be read or is invalid.
+    """
+    return sorted(_profile_tables(read_toml(path), path))
+
+
+def save_profile(path: Path, name: str, filenames: Sequence[str]) -> None:
+    """Append a profile selecting the given rules to a profiles file.
+
+    The file is created if needed; existing content is left untouched.
+
+    Args:
+        path: Path to the profiles file.
+        name: Name of the new profile.
+        filenames: Rule filenames the profile selects, in order.
+
+    Raises:
+        ValueError: If the name is invalid or already used.
+        OSError: If the file cannot be written.
+    """
+    if not _NAME.match(name):
+        raise ValueError(
+            f"Invalid profile name '{name}': use letters, digits, '-' and '_'"
+        )
+    if path.exists() and name in profile_names(path):
+        raise ValueError(f"Profile '{name}' already exists in {path}")
+
+    # JSON strings are valid TOML basic strings
+    rules = ", ".join(json.dumps(filename) for filename in filenames)
+    with path.open('a', encoding='utf-8') as f:
+        f.write(f"\n[profiles.{name}]\nselected_rules = [{rules}]\n")
+
+
+def build_key(config: CombinationConfig, tool_version: str) -> str:
+    """Return a digest of every setting that affects a build's output.
+
+    Args:
+        config: Effective settings of the build.
+        tool_version: Current tool version; other versions never match.
+
+    Returns:
+        Hex digest identifying the build settings.
+    """
+    settings = {
+        "tool_version": tool_version,
+        "rules_directory": str(config.rules_directory.resolve()),
+        "output_file": str(config.output_file.resolve()),
+        "selection_mode": config.selection_mode.value,
+        "selected_rules": config.selected_rules,
+        "selected_patterns": config.selected_patterns,
+        "selected_tags": config.selected_tags,
+        "selection_expression": config.selection_expression,
+        "include_toc": config.include_toc,
+        "embed_manifest": config.embed_manifest,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+@dataclass
+class InputEntry:
+    """Size and modification time of one input file when it was built."""
+
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class BuildRecord:
+    """Input manifest of a profile's last build."""
+
+    key: str
+    rules_dir_mtime_ns: int
+    output_size: int
+    output_mtime_ns: int
+    rule_count: int
+    inputs: List[InputEntry] = field(default_factory=list)
+
+
+class ProfileCache:
+    """The cached output and input manifest of one profile.
+
+    Example:
+        >>> cache = ProfileCache(Path("rules-profiles.toml"), "backend-python")
+        >>> if cache.check(key, rules_dir, output) == CACHED:
+        ...     cache.restore(output)
+    """
+
+    def __init__(self, profiles_path: Path, name: str) -> None:
+        """Initialize the cache.
+
+        Args:
+            profiles_path: Path to the profiles file; the cache lives next
+                to it.
+            name: Name of the profile.
+        """
+        self._dir = profiles_path.parent / CACHE_DIR / name
+        self._record_path = self._dir / "inputs.json"
+        self._output_copy = self._dir / "output"
+        self.record: Optional[BuildRecord] = None
+
+    def check(self, key: str, rules_dir: Path, output: Path) -> str:
+        """Decide whether the last build can be reused, using ``stat`` only.
+
+        Args:
+            key: ``build_key`` of the settings about to be built.
+            rules_dir: Rules directory of the build.
+            output: Output file of the build.
+
+        Returns:
+            ``CURRENT`` if the output is exactly what the last build wrote,
+            ``CACHED`` if the inputs are unchanged but the output is not, so
+            the cached copy can be restored, or ``STALE`` if the profile has
+            to be rebuilt.
+        """
+        record = self._load()
+        if record is None or record.key != key:
+            return STALE
+        try:
+            if rules_dir.stat().st_mtime_ns != record.rules_dir_mtime_ns:
+                # Rules were added, removed or renamed
+                return STALE
+            for entry in record.inputs:
+                stat = os.stat(entry.path)
+                if stat.st_size != entry.size or stat.st_mtime_ns != entry.mtime_ns:
+                    return STALE
+            copy_size = self._output_copy.stat().st_size
+        except OSError:
+            return STALE
+        if copy_size != record.output_size:
+            return STALE
+
+        self.record = record
+        try:
+            stat = output.stat()
+        except OSError:
+            return CACHED
+        if stat.st_size == record.output_size and stat.st_mtime_ns == record.output_mtime_ns:
+            return CURRENT
+        return CACHED
+
+    def restore(self, output: Path) -> None:
+        """Replace the output with the cached copy of the last build.
+
+        Raises:
+            OSError: If the copy fails; the output is then left untouched.
+        """
+        record = self._load()
+        if record is None:
+            raise OSError(f"No cached build in {self._dir}")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.")
+        os.close(fd)
+        try:
+            shutil.copyfile(self._output_copy, temp_name)
+            os.replace(temp_name, output)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        # Remember the restored file so the next run only needs stat calls
+        record.output_mtime_ns = output.stat().st_mtime_ns
+        self._save(record)
+
+    def store(
+        self, key: str, rules_dir: Path, output: Path, rules: Sequence[RuleFile],
+        inputs: Sequence[RuleFile],
+    ) -> None:
+        """Keep a copy of a finished build's output and its input manifest.
+
+        Args:
+            key: ``build_key`` of the build's settings.
+            rules_dir: Rules directory of the build.
+            output: The output file that was just written.
+            rules: Rules the output was built from.
+            inputs: Rule files whose changes invalidate the build; a
+                superset of ``rules`` when the selection depends on the
+                content of other rules.
+
+        Raises:
+            OSError: If the cache cannot be written.
+        """
+        self._dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output, self._output_copy)
+        stat = output.stat()
+        entries = []
+        for rule in inputs:
+            rule_stat = rule.path.stat()
+            entries.append(InputEntry(
+                str(rule.path.resolve()), rule_stat.st_size, rule_stat.st_mtime_ns
+            ))
+        self._save(BuildRecord(
+            key=key,
+            rules_dir_mtime_ns=rules_dir.stat().st_mtime_ns,
+            output_size=stat.st_size,
+            output_mtime_ns=stat.st_mtime_ns,
+            rule_count=len(rules),
+            inputs=entries,
+        ))
+
+    def _load(self) -> Optional[BuildRecord]:
+        """Read the input manifest, or None if it is missing or unreadable."""
+        try:
+            data = json.loads(self._record_path.read_text(encoding='utf-8'))
+            inputs = [InputEntry(**entry) for entry in data.pop("inputs", [])]
+            return BuildRecord(inputs=inputs, **data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _save(self, record: BuildRecord) -> None:
+        """Write the input manifest atomically."""
+        temp_path = self._record_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(asdict(record)), encoding='utf-8')
+        os.replace(temp_path, self._record_path)
+
+
+def _profile_tables(data: Dict[str, Any], path: Path) -> Dict[str, Dict[str, Any]]:
+    """Return the ``[profiles.*]`` tables of a parsed profiles file."""
+    profiles = data.get("profiles", {})
+    if not isinstance(profiles, dict) or not all(
+        isinstance(table, dict) for table in profiles.values()
+    ):
+        raise ValueError(f"'profiles' in {path} must be a table of [profiles.<name>] tables")
+    return profiles
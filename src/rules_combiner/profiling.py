@@ -0,0 +1,156 @@
+"""cProfile support for profiling any CLI subcommand.
+
+The profile is saved twice: as a ``.pstats`` file for ``pstats``,
+snakeviz and similar viewers, and as collapsed stacks
+(``frame;frame;frame weight`` per line) for flamegraph.pl, speedscope or
+inferno. cProfile only records caller/callee pairs, not whole stacks, so the
+collapsed stacks are rebuilt by walking the call graph from its roots and
+splitting each function's time between its callees in proportion to their
+cumulative time. Weights are in microseconds.
+
+Example:
+    >>> profiler = cProfile.Profile()
+    >>> profiler.enable()
+    >>> run()
+    >>> profiler.disable()
+    >>> write_profile(profiler, Path("run.pstats"))
+    (PosixPath('run.pstats'), PosixPath('run.collapsed'))
+"""
+
+import cProfile
+import os
+import pstats
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# pstats function key: (filename, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+# Time below frames deeper than this is charged to the deepest frame
+MAX_STACK_DEPTH = 256
+
+# Call paths contributing less than this many seconds are dropped
+MIN_SECONDS = 1e-6
+
+
+def profile_paths(path: Path) -> Tuple[Path, Path]:
+    """Return the (.pstats, .collapsed) paths for a --profile argument.
+
+    Example:
+        >>> profile_paths(Path("run.pstats"))
+        (PosixPath('run.pstats'), PosixPath('run.collapsed'))
+        >>> profile_paths(Path("run"))
+        (PosixPath('run.pstats'), PosixPath('run.collapsed'))
+    """
+    pstats_path = path if path.suffix == ".pstats" else path.with_name(path.name + ".pstats")
+    return pstats_path, pstats_path.with_suffix(".collapsed")
+
+
+def write_profile(profiler: cProfile.Profile, path: Path) -> Tuple[Path, Path]:
+    """Save a finished profile as pstats data and as collapsed stacks.
+
+    Args:
+        profiler: Disabled profiler holding the recorded run.
+        path: Output path; ``.pstats`` is appended unless already present.
+
+    Returns:
+        The paths of the pstats file and the collapsed-stack file.
+
+    Raises:
+        OSError: If a file cannot be written.
+    """
+    pstats_path, collapsed_path = profile_paths(path)
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(str(pstats_path))
+    with open(collapsed_path, "w", encoding="utf-8") as collapsed_file:
+        for stack, weight in sorted(collapsed_stacks(stats).items()):
+            collapsed_file.write(f"{stack} {weight}\n")
+    return pstats_path, collapsed_path
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """Rebuild collapsed call stacks from pstats caller/callee data.
+
+    Args:
+        stats: Loaded profile statistics.
+
+    Returns:
+        Mapping of ``;``-joined stack to its own time in microseconds.
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    cumulative: Dict[FunctionKey, float] = {}
+    own: Dict[FunctionKey, float] = {}
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    roots: List[FunctionKey] = []
+
+    for function, (_, _, total_time, cumulative_time, callers) in raw.items():
+        own[function] = total_time
+        cumulative[function] = cumulative_time
+        if not callers:
+            roots.append(function)
+        for caller, edge in callers.items():
+            # Edge stats are (primitive calls, calls, own time, cumulative time)
+            callees.setdefault(caller, []).append((function, edge[3]))
+
+    stacks: Dict[str, float] = {}
+    for root in roots:
+        for stack, seconds in _walk(root, cumulative[root], [], callees, cumulative, own):
+            stacks[stack] = stacks.get(stack, 0.0) + seconds
+
+    return {
+        stack: round(seconds * 1_000_000)
+        for stack, seconds in stacks.items()
+        if round(seconds * 1_000_000) > 0
+    }
+
+
+def _walk(
+    function: FunctionKey,
+    seconds: float,
+    path: List[str],
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]],
+    cumulative: Dict[FunctionKey, float],
+    own: Dict[FunctionKey, float],
+) -> Iterator[Tuple[str, float]]:
+    """Yield (stack, seconds) for a function reached with ``seconds`` of time."""
+    path = path + [_frame_label(function)]
+    total = cumulative[function]
+    if total <= 0:
+        return
+    scale = seconds / total
+    own_seconds = min(own[function] * scale, seconds)
+
+    # Recursive calls are already inside the outer call's time, so skip them
+    children = [
+        (callee, edge_seconds * scale)
+        for callee, edge_seconds in callees.get(function, ())
+        if _frame_label(callee) not in path
+    ]
+    # Recursion makes edge times overlap; never hand out more than we have
+    children_seconds = sum(share for _, share in children)
+    available = seconds - own_seconds
+    if children_seconds > available:
+        factor = available / children_seconds
+        children = [(callee, share * factor) for callee, share in children]
+
+    for callee, share in children:
+        if share < MIN_SECONDS:
+            continue
+        if len(path) >= MAX_STACK_DEPTH:
+            own_seconds += share
+            continue
+        yield from _walk(callee, share, path, callees, cumulative, own)
+
+    if own_seconds >= MIN_SECONDS:
+        yield ";".join(path), own_seconds
+
+
+def _frame_label(function: FunctionKey) -> str:
+    """Format a pstats function key as a flamegraph frame name."""
+    filename, line, name = function
+    if filename == "~":
+        # Built-ins are recorded as ("~", 0, "<built-in method ...>")
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
@@ -0,0 +1,295 @@
+"""Selection expressions compiled to bitset operations over a catalog.
+
+An expression combines terms with ``!`` (not), ``&`` (and) and ``|`` or
+``,`` (or), in that order of precedence, with parentheses for grouping:
+
+- ``3`` and ``2-5``: rule numbers and ranges, as shown by the selector
+- ``all``: every rule
+- ``python-*.md``: a glob matched against filenames; a name without
+  wildcards must match a rule exactly
+- ``tag:python``: rules carrying a frontmatter tag
+- ``tokens<2000``, ``size>=4096``, ``priority=1``: comparisons with
+  ``<``, ``<=``, ``>``, ``>=``, ``=`` or ``!=``
+
+A set of rules is an int whose bit *i* is set when the rule at catalog
+position *i* is included, so evaluation is a handful of big-integer
+operations. The masks for terms are built from the catalog's indexes and
+cached on it, so evaluating an expression again, or another expression
+sharing its terms, does not touch the rules.
+
+Example:
+    >>> query = compile_selection("tag:python & !*legacy* & tokens<2000")
+    >>> [rule.filename for rule in query.select(catalog)]
+    ['python-coding.md', 'python-testing.md']
+"""
+
+import re
+from typing import Callable, List, Sequence
+
+from .catalog import RuleCatalog, mask_to_positions
+from .models import RuleFile
+
+# Evaluates one compiled (sub)expression against a catalog
+Evaluator = Callable[[RuleCatalog], int]
+
+_OPERATORS = "&|,!()"
+
+_RANGE = re.compile(r"^(\d+)\s*-\s*(\d+)$")
+
+_COMPARISON = re.compile(r"^(tokens|size|priority)\s*(<=|>=|!=|==|<|>|=)\s*(-?\d+)$")
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def is_expression(value: str) -> bool:
+    """Tell a selection expression from a plain comma-separated list of filenames.
+
+    Example:
+        >>> is_expression("a.md,b.md")
+        False
+        >>> is_expression("tag:python & !*legacy*")
+        True
+    """
+    for part in value.split(","):
+        part = part.strip()
+        if (
+            any(operator in part for operator in _OPERATORS)
+            or _WILDCARDS.search(part)
+            or part.startswith("tag:")
+            or part.isdigit()
+            or _RANGE.match(part)
+            or _COMPARISON.match(part)
+            or part.lower() == "all"
+        ):
+            return True
+    return False
+
+
+class SelectionQuery:
+    """A compiled selection expression.
+
+    Example:
+        >>> query = compile_selection("1-3 | tag:go")
+        >>> query.select(catalog)
+        [RuleFile(filename='a.md', ...), ...]
+    """
+
+    def __init__(self, expression: str, evaluator: Evaluator) -> None:
+        self.expression = expression
+        self._evaluator = evaluator
+
+    def __repr__(self) -> str:
+        return f"SelectionQuery({self.expression!r})"
+
+    def mask(self, catalog: RuleCatalog) -> int:
+        """Evaluate the expression to a bitset of catalog positions."""
+        return self._evaluator(catalog) & _all_mask(catalog)
+
+    def positions(self, catalog: RuleCatalog) -> List[int]:
+        """Evaluate the expression to catalog positions, ascending.
+
+        Raises:
+            ValueError: If a term is invalid for the catalog (an unknown
+                filename or a rule number out of range).
+        """
+        return mask_to_positions(self.mask(catalog))
+
+    def select(self, catalog: RuleCatalog) -> List[RuleFile]:
+        """Return the matching rules in catalog order.
+
+        Raises:
+            ValueError: If a term is invalid for the catalog.
+        """
+        return [catalog[position] for position in self.positions(catalog)]
+
+
+def compile_selection(expression: str) -> SelectionQuery:
+    """Parse a selection expression.
+
+    Args:
+        expression: Expression such as ``tag:python & !*legacy*``.
+
+    Returns:
+        The compiled query.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    parser = _Parser(_tokenize(expression))
+    evaluator = parser.parse()
+    return SelectionQuery(expression, evaluator)
+
+
+def select_expression(rules: Sequence[RuleFile], expression: str) -> List[RuleFile]:
+    """Compile an expression and select from rules, in catalog order.
+
+    Raises:
+        ValueError: If the expression is malformed or selects nothing.
+    """
+    catalog = rules if isinstance(rules, RuleCatalog) else RuleCatalog(rules)
+    selected = compile_selection(expression).select(catalog)
+    if not selected:
+        raise ValueError(f"Selection '{expression}' matches no rule files")
+    return selected
+
+
+def _tokenize(expression: str) -> List[str]:
+    """Split an expression into operators and stripped terms.
+
+    Whitespace is not a separator, so ``1 - 3`` and ``tokens < 2000`` are
+    single terms; ``!`` is an operator only at the start of a term.
+    """
+    tokens: List[str] = []
+    term = ""
+    for character in expression:
+        if character in _OPERATORS and (character != "!" or not term.strip()):
+            if term.strip():
+                tokens.append(term.strip())
+            term = ""
+            tokens.append(character)
+        else:
+            term += character
+    if term.strip():
+        tokens.append(term.strip())
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser turning tokens into an evaluator."""
+
+    def __init__(self, tokens: List[str]) -> None:
+        self._tokens = tokens
+        self._position = 0
+
+    def parse(self) -> Evaluator:
+        if not self._tokens:
+            raise ValueError("Empty selection")
+        evaluator = self._union()
+        if self._position < len(self._tokens):
+            raise ValueError(f"Unexpected '{self._tokens[self._position]}' in selection")
+        return evaluator
+
+    def _peek(self) -> str:
+        return self._tokens[self._position] if self._position < len(self._tokens) else ""
+
+    def _union(self) -> Evaluator:
+        while self._peek() == ",":
+            # Leading commas are tolerated, as in ",1,3"
+            self._position += 1
+        operands = [self._intersection()]
+        while self._peek() in ("|", ","):
+            self._position += 1
+            # A trailing or doubled comma is tolerated, as in "1,3,"
+            if self._peek() in ("", ",", ")") and self._tokens[self._position - 1] == ",":
+                continue
+            operands.append(self._intersection())
+        if len(operands) == 1:
+            return operands[0]
+
+        def union(catalog: RuleCatalog) -> int:
+            mask = 0
+            for operand in operands:
+                mask |= operand(catalog)
+            return mask
+        return union
+
+    def _intersection(self) -> Evaluator:
+        operands = [self._negation()]
+        while self._peek() == "&":
+            self._position += 1
+            operands.append(self._negation())
+        if len(operands) == 1:
+            return operands[0]
+
+        def intersection(catalog: RuleCatalog) -> int:
+            mask = operands[0](catalog)
+            for operand in operands[1:]:
+                mask &= operand(catalog)
+            return mask
+        return intersection
+
+    def _negation(self) -> Evaluator:
+        if self._peek() != "!":
+            return self._atom()
+        self._position += 1
+        operand = self._negation()
+        return lambda catalog: _all_mask(catalog) & ~operand(catalog)
+
+    def _atom(self) -> Evaluator:
+        token = self._peek()
+        if not token:
+            raise ValueError("Selection ends unexpectedly")
+        self._position += 1
+        if token == "(":
+            evaluator = self._union()
+            if self._peek() != ")":
+                raise ValueError("Missing ')' in selection")
+            self._position += 1
+            return evaluator
+        if token in _OPERATORS:
+            raise ValueError(f"Unexpected '{token}' in selection")
+        return _term(token)
+
+
+def _term(term: str) -> Evaluator:
+    """Compile a single term."""
+    if term.lower() == "all":
+        return _all_mask
+    if term.isdigit():
+        return _number(int(term))
+    range_match = _RANGE.match(term)
+    if range_match:
+        start, end = int(range_match.group(1)), int(range_match.group(2))
+        if start > end:
+            raise ValueError("Invalid range: start must be <= end")
+        return _numbers(start, end)
+    if term.startswith("tag:"):
+        tag = term[4:].strip().lower()
+        if not tag:
+            raise ValueError("Missing tag name after 'tag:'")
+        return lambda catalog: catalog.tag_mask(tag)
+    comparison = _COMPARISON.match(term)
+    if comparison:
+        field, operator, value = comparison.groups()
+        operator = "=" if operator == "==" else operator
+        return lambda catalog: catalog.field_mask(field, operator, int(value))
+    if _WILDCARDS.search(term):
+        return lambda catalog: catalog.glob_mask(term)
+    return _filename(term)
+
+
+def _numbers(start: int, end: int) -> Evaluator:
+    """Compile 1-based rule numbers ``start`` to ``end`` inclusive."""
+    if start < 1:
+        raise ValueError("Rule numbers must be 1 or greater")
+
+    def numbers(catalog: RuleCatalog) -> int:
+        if end > len(catalog):
+            raise ValueError(f"Rule numbers must be between 1 and {len(catalog)}")
+        return ((1 << end) - 1) ^ ((1 << (start - 1)) - 1)
+    return numbers
+
+
+def _number(number: int) -> Evaluator:
+    """Compile a single 1-based rule number."""
+    if number < 1:
+        raise ValueError("Rule numbers must be 1 or greater")
+
+    def rule_number(catalog: RuleCatalog) -> int:
+        if number > len(catalog):
+            raise ValueError(f"Rule number {number} is out of range (max: {len(catalog)})")
+        return 1 << (number - 1)
+    return rule_number
+
+
+def _filename(name: str) -> Evaluator:
+    """Compile an exact filename."""
+    def filename(catalog: RuleCatalog) -> int:
+        if catalog.get(name) is None:
+            raise ValueError(f"Unknown rule file: '{name}'")
+        return 1 << catalog.index_of(name)
+    return filename
+
+
+def _all_mask(catalog: RuleCatalog) -> int:
+    return (1 << len(catalog)) - 1
@@ -0,0 +1,222 @@
+"""Progress reporting for the generate command.
+
+``generate`` reports what it does through a reporter so the same build can
+be shown as styled rich output with a progress bar, as stable
+machine-readable lines, or not at all. The porcelain reporter never touches
+rich, so quiet and scripted runs skip its import and rendering cost.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import click
+
+from .models import RuleFile
+
+RuleCallback = Callable[[RuleFile], None]
+
+
+class RichReporter:
+    """Reports progress as styled rich output.
+
+    On a terminal, rule processing is shown as a progress bar redrawn at
+    most ``refresh_per_second`` times, however many rules there are.
+    Elsewhere (logs, pipes) each rule is printed on its own line.
+    """
+
+    def __init__(self, console: Any, refresh_per_second: float = 10) -> None:
+        """Initialize the reporter.
+
+        Args:
+            console: rich Console to print to.
+            refresh_per_second: Maximum progress bar redraw rate.
+        """
+        self._console = console
+        self._refresh_per_second = refresh_per_second
+
+    def discovering(self, rules_dir: Path) -> None:
+        self._console.print(f"[cyan]Discovering rule files in: {rules_dir}[/cyan]")
+
+    def discovered(self, count: int) -> None:
+        self._console.print(f"[green]Found {count} rule files[/green]")
+
+    def selecting(self) -> None:
+        self._console.print("\n[cyan]Select rules to combine:[/cyan]")
+
+    def selected(self, count: int) -> None:
+        self._console.print(f"\n[green]Processing {count} selected rules...[/green]")
+
+    @contextmanager
+    def processing(self, total: int) -> Iterator[RuleCallback]:
+        """Show progress while rules are processed.
+
+        Args:
+            total: Number of rules that will be processed.
+
+        Returns:
+            Context manager yielding the callback to call for each rule.
+        """
+        if not self._console.is_terminal:
+            yield lambda rule: self._console.print(f"Processing: {rule.filename}")
+            return
+
+        from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+        with Progress(
+            TextColumn("[cyan]Processing"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("{task.description}"),
+            console=self._console,
+            refresh_per_second=self._refresh_per_second,
+            transient=True,
+        ) as progress:
+            task = progress.add_task("", total=total)
+            # Only updates task state; the bar redraws on its own timer
+            yield lambda rule: progress.update(task, advance=1, description=rule.filename)
+
+    def writing(self, output: Path) -> None:
+        self._console.print(f"\n[cyan]Writing combined rules to: {output}[/cyan]")
+
+    def daemon(self, socket_path: Path) -> None:
+        self._console.print(f"[cyan]Generated by daemon at: {socket_path}[/cyan]")
+
+    def backup(self, backup_path: Path) -> None:
+        self._console.print(f"[yellow]Created backup: {backup_path}[/yellow]")
+
+    def written(self, mode: str, offset: int, bytes_written: int) -> None:
+        if mode == "unchanged":
+            self._console.print("[dim]Output already up to date, nothing written[/dim]")
+        elif mode == "patched":
+            self._console.print(
+                f"[dim]Patched from byte {offset:,} ({bytes_written:,} bytes written)[/dim]"
+            )
+
+    def history(self, number: int, stored_size: int) -> None:
+        self._console.print(
+            f"[yellow]Recorded history revision {number} ({stored_size:,} bytes stored)[/yellow]"
+        )
+
+    def generated(self, output: Path, rule_count: int, size: int) -> None:
+        self._console.print(f"[green]✓ Successfully generated {output}[/green]")
+        self._console.print(f"[dim]Combined {rule_count} rules into {size:,} bytes[/dim]")
+
+    def cached(self, output: Path, rule_count: int, restored: bool) -> None:
+        if restored:
+            self._console.print(f"[green]✓ Restored {output} from the profile cache[/green]")
+        else:
+            self._console.print(f"[green]✓ {output} is up to date[/green]")
+        self._console.print(f"[dim]{rule_count} rules unchanged since the last build[/dim]")
+
+    def profile_saved(self, name: str, profiles_file: Path) -> None:
+        self._console.print(f"[green]Saved profile '{name}' to {profiles_file}[/green]")
+
+    def warning(self, message: str) -> None:
+        self._console.print(f"[yellow]{message}[/yellow]")
+
+    def error(self, message: str) -> None:
+        self._console.print(f"[red]{message}[/red]")
+
+
+class PorcelainReporter:
+    """Reports progress as stable, tab-separated lines without rich.
+
+    Each line starts with an event name followed by its fields:
+
+    - ``discovered <count>``
+    - ``selected <count>``
+    - ``rule <index> <total> <filename>``
+    - ``daemon <socket path>``
+    - ``backup <path>``
+    - ``write <mode> <offset> <bytes written>``
+    - ``history <revision> <bytes stored>``
+    - ``generated <path> <rule count> <bytes>``
+    - ``cached <path> <rule count> <current|restored>``
+    - ``profile <name> <profiles file>``
+
+    Warnings and errors go to stderr as ``warning <message>`` and
+    ``error <message>``. In quiet mode only errors are printed.
+
+    Example:
+        >>> reporter = PorcelainReporter()
+        >>> reporter.discovered(3)
+        discovered	3
+    """
+
+    def __init__(self, quiet: bool = False) -> None:
+        """Initialize the reporter.
+
+        Args:
+            quiet: Print errors only.
+        """
+        self._quiet = quiet
+
+    def discovering(self, rules_dir: Path) -> None:
+        pass
+
+    def discovered(self, count: int) -> None:
+        self._emit("discovered", count)
+
+    def selecting(self) -> None:
+        pass
+
+    def selected(self, count: int) -> None:
+        self._emit("selected", count)
+
+    @contextmanager
+    def processing(self, total: int) -> Iterator[RuleCallback]:
+        """Yield a callback printing one ``rule`` line per processed rule."""
+        if self._quiet:
+            yield lambda rule: None
+            return
+
+        processed = 0
+
+        def on_rule(rule: RuleFile) -> None:
+            nonlocal processed
+            processed += 1
+            self._emit("rule", processed, total, rule.filename)
+
+        yield on_rule
+
+    def writing(self, output: Path) -> None:
+        pass
+
+    def daemon(self, socket_path: Path) -> None:
+        self._emit("daemon", socket_path)
+
+    def backup(self, backup_path: Path) -> None:
+        self._emit("backup", backup_path)
+
+    def written(self, mode: str, offset: int, bytes_written: int) -> None:
+        self._emit("write", mode, offset, bytes_written)
+
+    def history(self, number: int, stored_size: int) -> None:
+        self._emit("history", number, stored_size)
+
+    def generated(self, output: Path, rule_count: int, size: int) -> None:
+        self._emit("generated", output, rule_count, size)
+
+    def cached(self, output: Path, rule_count: int, restored: bool) -> None:
+        self._emit("cached", output, rule_count, "restored" if restored else "current")
+
+    def profile_saved(self, name: str, profiles_file: Path) -> None:
+        self._emit("profile", name, profiles_file)
+
+    def warning(self, message: str) -> None:
+        self._emit("warning", message, err=True)
+
+    def error(self, message: str) -> None:
+        click.echo(f"error\t{_single_line(message)}", err=True)
+
+    def _emit(self, event: str, *fields: object, err: bool = False) -> None:
+        """Print one event line unless quiet."""
+        if not self._quiet:
+            line = "\t".join([event, *(_single_line(str(field)) for field in fields)])
+            click.echo(line, err=err)
+
+
+def _single_line(value: str) -> str:
+    """Keep a field on one line and free of field separators."""
+    return value.replace("\t", " ").replace("\r", " ").replace("\n", " ")
@@ -0,0 +1,103 @@
+"""Trigram index for fuzzy searching rule filenames and titles."""
+
+import heapq
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text and collapse punctuation (``-``, ``_``, ``.``) to spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _trigrams(text: str, prefix: bool = False) -> Set[str]:
+    """Return the trigrams of each word, padded so short words still match.
+
+    Every word also yields a two-character start gram, so a query word
+    typed as far as one letter can match. With ``prefix`` the last word is
+    treated as still being typed and gets no trailing padding.
+
+    Example:
+        >>> sorted(_trigrams("py"))
+        [' p', ' py', 'py ']
+        >>> sorted(_trigrams("py", prefix=True))
+        [' p', ' py']
+    """
+    grams: Set[str] = set()
+    words = _normalize(text).split()
+    for position, word in enumerate(words):
+        typing = prefix and position == len(words) - 1
+        padded = f" {word}" if typing else f" {word} "
+        grams.add(padded[:2])
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to the documents containing them.
+
+    The index is built once; each search only touches the posting lists of
+    the query's trigrams, so lookups stay fast for catalogs of thousands of
+    rules. Matches are ranked by the share of query trigrams they contain,
+    with exact substring matches of every query word ranked first.
+
+    Example:
+        >>> index = TrigramIndex(["python-testing.md Python Testing", "go.md Go"])
+        >>> index.search("pyton test")
+        [0]
+    """
+
+    def __init__(self, documents: Iterable[str], min_similarity: float = 0.3) -> None:
+        """Build the index.
+
+        Args:
+            documents: Text of each document; results are document positions.
+            min_similarity: Minimum share of query trigrams a document must
+                contain to match, unless it contains every query word.
+        """
+        self._texts: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._min_similarity = min_similarity
+
+        for position, document in enumerate(documents):
+            self._texts.append(_normalize(document))
+            for gram in _trigrams(document):
+                self._postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def search(self, query: str, limit: int = 0) -> List[int]:
+        """Return the positions of documents matching a query, best first.
+
+        Args:
+            query: Free text such as ``python test``; typos are tolerated
+                and the last word may be incomplete.
+            limit: Maximum number of results; 0 returns every match.
+
+        Returns:
+            Document positions ordered by relevance.
+        """
+        grams = _trigrams(query, prefix=True)
+        if not grams:
+            return []
+        words = _normalize(query).split()
+
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for position, count in shared.items():
+            similarity = count / len(grams)
+            text = self._texts[position]
+            exact = all(word in text for word in words)
+            if exact or similarity >= self._min_similarity:
+                # Exact matches first, then similarity, then shorter text
+                scored.append((not exact, -similarity, len(text), position))
+
+        ranked = heapq.nsmallest(limit, scored) if limit else sorted(scored)
+        return [position for *_, position in ranked]
@@ -0,0 +1,94 @@
+"""Non-interactive rule selection by filename, glob pattern or mode."""
+
+import fnmatch
+from typing import Dict, List, Optional, Sequence
+
+from .catalog import RuleCatalog
+from .models import RuleFile, SelectionMode
+from .query import select_expression
+
+
+def select_rules(
+    rules: Sequence[RuleFile],
+    mode: SelectionMode,
+    filenames: Optional[Sequence[str]] = None,
+    patterns: Optional[Sequence[str]] = None,
+    tags: Optional[Sequence[str]] = None,
+    expression: Optional[str] = None,
+) -> List[RuleFile]:
+    """Resolve a non-interactive selection against discovered rules.
+
+    Explicitly named rules come first, in the order given; rules matched by
+    glob patterns, then rules carrying any of the tags, then rules matched
+    by the selection expression follow in discovery order. Duplicates are
+    dropped. Rules required by the selection's ``requires`` frontmatter are
+    added, and the result is reordered so every rule follows the rules it
+    requires or is declared ``after`` (see ``rules_combiner.graph``).
+
+    Args:
+        rules: Discovered rule files; a RuleCatalog's filename index is
+            reused instead of building one.
+        mode: ``SelectionMode.ALL`` selects every rule; ``SPECIFIC`` uses
+            ``filenames``, ``patterns``, ``tags`` and ``expression``.
+        filenames: Exact rule filenames to select.
+        patterns: Shell-style glob patterns matched against filenames.
+        tags: Frontmatter tags, looked up in the catalog's tag index.
+        expression: Selection expression such as ``tag:python & !*legacy*``,
+            evaluated as bitsets over the catalog (see ``rules_combiner.query``).
+
+    Returns:
+        The selected rules.
+
+    Raises:
+        ValueError: If a named rule does not exist, a pattern, tag or
+            expression matches nothing, a required rule does not exist, the
+            dependencies form a cycle, or the mode is interactive.
+
+    Example:
+        >>> select_rules(rules, SelectionMode.SPECIFIC, patterns=["python-*.md"])
+    """
+    if mode is SelectionMode.INTERACTIVE:
+        raise ValueError("Interactive selection cannot be resolved non-interactively")
+
+    catalog = rules if isinstance(rules, RuleCatalog) else RuleCatalog(rules)
+    if mode is SelectionMode.ALL:
+        return catalog.graph.resolve(catalog)
+    selected: Dict[str, RuleFile] = {}
+
+    missing = catalog.missing(filenames or [])
+    if missing:
+        raise ValueError(f"Unknown rule file(s): {', '.join(missing)}")
+    for name in filenames or []:
+        selected.setdefault(name, catalog[catalog.index_of(name)])
+
+    for pattern in patterns or []:
+        matches = [rule for rule in rules if fnmatch.fnmatchcase(rule.filename, pattern)]
+        if not matches:
+            raise ValueError(f"Pattern '{pattern}' matches no rule files")
+        for rule in matches:
+            selected.setdefault(rule.filename, rule)
+
+    for tag in tags or []:
+        matches = catalog.with_tags([tag])
+        if not matches:
+            raise ValueError(f"Tag '{tag}' matches no rule files")
+        for rule in matches:
+            selected.setdefault(rule.filename, rule)
+
+    if expression:
+        for rule in select_expression(catalog, expression):
+            selected.setdefault(rule.filename, rule)
+
+    return catalog.graph.resolve(list(selected.values()))
+
+
+def split_names(value: Optional[str]) -> List[str]:
+    """Split a comma-separated option value into trimmed, non-empty names.
+
+    Example:
+        >>> split_names("a.md, b.md,")
+        ['a.md', 'b.md']
+    """
+    if not value:
+        return []
+    return [name.strip() for name in value.split(',') if name.strip()]
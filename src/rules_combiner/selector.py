@@ -1,11 +1,21 @@
 """Interactive selection interface for rule files."""
 
-from typing import List
+from typing import Dict, List, Optional, Sequence
 
 from rich.console import Console
+from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
+from .catalog import RuleCatalog
 from .models import RuleFile
+from .preview import PreviewCache
+from .query import compile_selection
+from .search import TrigramIndex
+from .totals import SelectionTotals
+
+# Maximum number of search results shown at once
+SEARCH_RESULT_LIMIT = 50
 
 
 class InteractiveSelector:
@@ -13,7 +23,11 @@ class InteractiveSelector:
     
     This class creates a user-friendly interface for selecting multiple
     rule files using various input formats like individual numbers,
-    ranges, and the 'all' keyword.
+    ranges, the 'all' keyword and selection expressions combining globs,
+    tags and size limits. Typing ``/query`` filters the list
+    with a fuzzy search over filenames and titles; the matches keep their
+    numbers, and ``matches`` selects all of them. ``?3`` previews the first
+    lines of rule 3 and ``#3`` its heading outline, reading only that file.
     
     Example:
         >>> rules = [RuleFile(...), RuleFile(...)]
@@ -22,36 +36,75 @@ class InteractiveSelector:
         >>> print(f"Selected {len(selection)} rule files")
     """
     
-    def __init__(self, available_rules: List[RuleFile]) -> None:
+    def __init__(
+        self, available_rules: Sequence[RuleFile], totals: Optional[SelectionTotals] = None
+    ) -> None:
         """Initialize selector with available rule files.
         
         Args:
-            available_rules: List of RuleFile objects available for selection.
+            available_rules: RuleFile objects available for selection; a
+                RuleCatalog is used as is, anything else is indexed.
+            totals: Totals shown when confirming, configured with the token
+                budget and output options; empty totals by default.
         """
         self._rules = available_rules
+        self._catalog = (
+            available_rules if isinstance(available_rules, RuleCatalog)
+            else RuleCatalog(available_rules)
+        )
         self._console = Console()
+        self._index = TrigramIndex(f"{rule.filename} {rule.title}" for rule in available_rules)
+        self._matches: Optional[List[int]] = None
+        self._previews = PreviewCache()
+        self._totals = totals if totals is not None else SelectionTotals()
+        # Rules counted in the totals, by filename
+        self._counted: Dict[str, RuleFile] = {}
+    
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT) -> List[int]:
+        """Fuzzy search rule filenames and titles.
+        
+        Args:
+            query: Free text such as "python test"; typos are tolerated.
+            limit: Maximum number of results; 0 returns every match.
+            
+        Returns:
+            0-based indices of matching rules, best match first.
+        """
+        return self._index.search(query, limit)
     
-    def display_rules(self) -> None:
+    def display_rules(self, indices: Optional[List[int]] = None) -> None:
         """Display available rules in a formatted table.
         
         Shows a numbered list of available rule files with their titles,
         filenames, and file sizes in a nicely formatted table using Rich.
+        
+        Args:
+            indices: 0-based indices of the rules to show, e.g. search
+                results; all rules are shown if omitted. Rules keep their
+                numbers either way.
         """
         if not self._rules:
             self._console.print("[yellow]No rule files found.[/yellow]")
             return
         
-        table = Table(title="Available Rule Files")
+        if indices is None:
+            indices = list(range(len(self._rules)))
+            title = "Available Rule Files"
+        else:
+            title = f"Rule Files Matching Search ({len(indices)})"
+        
+        table = Table(title=title)
         table.add_column("No.", justify="right", style="cyan", no_wrap=True)
         table.add_column("Filename", style="magenta")
         table.add_column("Title", style="green")
         table.add_column("Size", justify="right", style="blue")
         table.add_column("~Tokens", justify="right", style="yellow")
         
-        for i, rule in enumerate(self._rules, 1):
+        for index in indices:
+            rule = self._rules[index]
             file_size = f"{rule.file_size:,} bytes" if rule.file_size > 0 else "unknown"
             token_estimate = f"~{rule.estimated_tokens:,}" if rule.estimated_tokens > 0 else "~0"
-            table.add_row(str(i), rule.filename, rule.title, file_size, token_estimate)
+            table.add_row(str(index + 1), rule.filename, rule.title, file_size, token_estimate)
         
         self._console.print(table)
         self._console.print()
@@ -73,28 +126,53 @@ class InteractiveSelector:
             self._console.print("[red]No rules available for selection.[/red]")
             return []
         
+        # The table is only re-rendered when the rows shown change, not
+        # after invalid input or a rejected confirmation
+        redraw = True
         while True:
-            # Display available rules
-            self.display_rules()
-            
-            # Show help text
-            self._console.print("[bold cyan]Selection options:[/bold cyan]")
-            self._console.print("• Individual numbers: [green]1,3,5[/green]")
-            self._console.print("• Ranges: [green]1-3[/green] or [green]2-5[/green]")
-            self._console.print("• Mixed: [green]1,3-5,7[/green]")
-            self._console.print("• All: [green]all[/green]")
-            self._console.print()
+            if redraw:
+                # Display available rules, or the matches of the last search
+                self.display_rules(self._matches)
+                
+                # Show help text
+                self._console.print("[bold cyan]Selection options:[/bold cyan]")
+                self._console.print("• Individual numbers: [green]1,3,5[/green]")
+                self._console.print("• Ranges: [green]1-3[/green] or [green]2-5[/green]")
+                self._console.print("• Mixed: [green]1,3-5,7[/green]")
+                self._console.print("• All: [green]all[/green]")
+                self._console.print(
+                    "• Expressions: [green]tag:python & !*legacy* & tokens<2000[/green] "
+                    "(globs, [green]tag:[/green], [green]![/green], [green]&[/green], [green]|[/green], "
+                    "[green]size[/green]/[green]tokens[/green] limits)"
+                )
+                self._console.print("• Search: [green]/python test[/green] ([green]/[/green] alone clears it)")
+                self._console.print("• Preview: [green]?3[/green] first lines, [green]#3[/green] heading outline")
+                if self._matches:
+                    self._console.print("• Every search match: [green]matches[/green]")
+                self._console.print()
+                redraw = False
             
             # Get user input
             try:
-                selection_input = input("Select rule files (e.g., 1,3-5 or 'all'): ").strip()
+                selection_input = input("Select rule files (e.g., 1,3-5, 'all' or /search): ").strip()
                 
                 if not selection_input:
                     self._console.print("[red]Please enter a selection.[/red]")
                     continue
                 
-                # Parse input and get selected indices
-                selected_indices = self._parse_selection_input(selection_input)
+                if selection_input.startswith('/'):
+                    redraw = self._apply_search(selection_input[1:].strip())
+                    continue
+                
+                if selection_input[0] in '?#':
+                    self.show_preview(selection_input[1:].strip(), outline=selection_input[0] == '#')
+                    continue
+                
+                if selection_input.lower() == "matches" and self._matches:
+                    selected_indices = sorted(self._matches)
+                else:
+                    # Parse input and get selected indices
+                    selected_indices = self._parse_selection_input(selection_input)
                 
                 # Convert indices to filenames
                 selected_filenames = [self._rules[i].filename for i in selected_indices]
@@ -110,27 +188,66 @@ class InteractiveSelector:
                 self._console.print("\\n[yellow]Selection cancelled.[/yellow]")
                 return []
     
+    def show_preview(self, number: str, outline: bool = False) -> None:
+        """Show the first lines or heading outline of one rule.
+        
+        Only that rule's file is read, and previews are cached, so showing
+        the same rule again does not read it.
+        
+        Args:
+            number: 1-based rule number as typed by the user.
+            outline: Show the heading outline instead of the first lines.
+            
+        Raises:
+            ValueError: If the number is not a valid rule number.
+        """
+        if not number.isdigit() or not 1 <= int(number) <= len(self._rules):
+            raise ValueError(f"Preview needs a rule number between 1 and {len(self._rules)}")
+        
+        rule = self._rules[int(number) - 1]
+        if outline:
+            lines = self._previews.outline(rule)
+            subtitle = "heading outline"
+        else:
+            lines = self._previews.head(rule)
+            subtitle = f"first {self._previews.lines} lines"
+        self._console.print(Panel(
+            Text("\n".join(lines) or "(empty)"), title=rule.filename, subtitle=subtitle
+        ))
+        self._console.print()
+    
     def confirm_selection(self, selected: List[str]) -> bool:
         """Confirm the user's selection before proceeding.
         
-        Shows the selected rules and asks for confirmation.
+        Shows the selected rules, in output order and with the rules they
+        require, and asks for confirmation.
         
         Args:
             selected: List of selected rule filenames.
             
         Returns:
             True if user confirms, False otherwise.
+            
+        Raises:
+            ValueError: If a required rule does not exist or the selection's
+                dependencies form a cycle.
         """
-        # Calculate total tokens for selected rules
-        selected_rules = [rule for rule in self._rules if rule.filename in selected]
-        total_tokens = sum(rule.estimated_tokens for rule in selected_rules)
-        total_size = sum(rule.file_size for rule in selected_rules)
+        # Count the selected rules and their prerequisites
+        selected_rules = self._catalog.graph.resolve(self._catalog.subset(selected))
+        self._update_totals(selected_rules)
+        chosen = set(selected)
         
-        self._console.print(f"\n[bold]Selected {len(selected)} rule files:[/bold]")
+        self._console.print(f"\n[bold]Selected {len(selected_rules)} rule files:[/bold]")
         for rule in selected_rules:
-            self._console.print(f"  • {rule.filename} [dim](~{rule.estimated_tokens:,} tokens)[/dim]")
+            required = "" if rule.filename in chosen else ", required"
+            self._console.print(
+                f"  • {rule.filename} [dim](~{rule.estimated_tokens:,} tokens{required})[/dim]"
+            )
         
-        self._console.print(f"\n[dim]Total: {total_size:,} bytes, ~{total_tokens:,} estimated tokens[/dim]")
+        self._console.print(f"\n[dim]Total: {self._totals.summary()}[/dim]")
+        warning = self._totals.budget_warning()
+        if warning:
+            self._console.print(f"[bold yellow]{warning}[/bold yellow]")
         self._console.print()
         
         while True:
@@ -145,14 +262,48 @@ class InteractiveSelector:
             except KeyboardInterrupt:
                 return False
     
+    def _update_totals(self, rules: List[RuleFile]) -> None:
+        """Bring the totals to a new selection, counting only the rules that changed."""
+        selection = {rule.filename: rule for rule in rules}
+        for filename in self._counted.keys() - selection.keys():
+            self._totals.remove(self._counted[filename])
+        for filename in selection.keys() - self._counted.keys():
+            self._totals.add(selection[filename])
+        self._counted = selection
+    
+    def _apply_search(self, query: str) -> bool:
+        """Filter the displayed rules to a query's matches, or clear the filter.
+        
+        Args:
+            query: Search text; empty clears the current search.
+            
+        Returns:
+            True if the rules to display changed.
+        """
+        if not query:
+            self._matches = None
+            return True
+        
+        matches = self.search(query)
+        if matches:
+            self._matches = matches
+            return True
+        
+        self._console.print(f"[yellow]No rules match '{query}'.[/yellow]")
+        self._console.print()
+        return False
+    
     def _parse_selection_input(self, selection_input: str) -> List[int]:
         """Parse user selection input into list of indices.
         
-        Supports various input formats:
+        Input is a selection expression (see ``rules_combiner.query``), so
+        besides the classic formats it accepts globs, tags, negation and
+        size or token limits:
         - Individual numbers: "1,3,5"
         - Ranges: "1-3" 
         - Mixed: "1,3-5,7"
         - All: "all"
+        - Expressions: "tag:python & !*legacy* & tokens<2000"
         
         Args:
             selection_input: User input string.
@@ -163,61 +314,9 @@ class InteractiveSelector:
         Raises:
             ValueError: If input format is invalid or contains out-of-range numbers.
         """
-        selection_input = selection_input.lower().strip()
-        
-        # Handle 'all' keyword
-        if selection_input == "all":
-            return list(range(len(self._rules)))
-        
-        indices = set()  # Use set to avoid duplicates
-        
-        # Split by comma to handle multiple parts
-        parts = [part.strip() for part in selection_input.split(',')]
-        
-        for part in parts:
-            if not part:
-                continue
-                
-            if '-' in part:
-                # Handle range (e.g., "1-3")
-                try:
-                    start_str, end_str = part.split('-', 1)
-                    start = int(start_str.strip())
-                    end = int(end_str.strip())
-                    
-                    if start < 1 or end < 1:
-                        raise ValueError("Rule numbers must be 1 or greater")
-                    if start > len(self._rules) or end > len(self._rules):
-                        raise ValueError(f"Rule numbers must be between 1 and {len(self._rules)}")
-                    if start > end:
-                        raise ValueError("Invalid range: start must be <= end")
-                    
-                    # Convert to 0-based indices and add to set
-                    for i in range(start - 1, end):
-                        indices.add(i)
-                        
-                except ValueError as e:
-                    if "invalid literal" in str(e):
-                        raise ValueError(f"Invalid range format: '{part}'")
-                    raise
-            else:
-                # Handle individual number
-                try:
-                    num = int(part)
-                    if num < 1:
-                        raise ValueError("Rule numbers must be 1 or greater")
-                    if num > len(self._rules):
-                        raise ValueError(f"Rule number {num} is out of range (max: {len(self._rules)})")
-                    
-                    # Convert to 0-based index
-                    indices.add(num - 1)
-                    
-                except ValueError as e:
-                    if "invalid literal" in str(e):
-                        raise ValueError(f"Invalid number: '{part}'")
-                    raise
+        indices = compile_selection(selection_input.strip()).positions(self._catalog)
         
         if not indices:
-            raise ValueError("No valid rule numbers found in input")
+            raise ValueError("No rules match the selection")
         
-        return sorted(list(indices))
+        return indices
@@ -0,0 +1,209 @@
+"""Per-phase timing and I/O accounting for CLI runs.
+
+A ``RunTimer`` measures wall and CPU time for each named phase of a
+command, together with the files opened and bytes read and written while
+the phase ran. When timings are not requested, commands use
+``DISABLED_TIMER``, whose phases are a shared no-op context manager, so the
+instrumentation costs one method call per phase.
+
+Files are counted through a Python audit hook, which is only installed the
+first time a ``RunTimer`` is created. Byte counts come from
+``/proc/self/io`` and are reported as unknown on platforms without it.
+
+Example:
+    >>> timer = RunTimer()
+    >>> with timer.phase("discovery"):
+    ...     rules = engine.discover_rules()
+    >>> print(timer.format_table())
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class PhaseStats:
+    """Resources used by one phase of a run.
+
+    Byte counts include all reads and writes made by the process, and are
+    None where the platform does not expose them.
+    """
+
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    files_opened: int = 0
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+
+
+class _OpenCounter:
+    """Counts file opens through an audit hook, installed at most once."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._installed = False
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        with self._lock:
+            if not self._installed:
+                # Audit hooks cannot be removed, so only install when timing
+                sys.addaudithook(self._hook)
+                self._installed = True
+
+    def _hook(self, event: str, args: Tuple[Any, ...]) -> None:
+        if event == "open":
+            self.count += 1
+
+
+_open_counter = _OpenCounter()
+
+
+# Bytes read from /proc/self/io by _io_counters, excluded from the counts
+_own_bytes_read = 0
+
+
+def _io_counters() -> Optional[Tuple[int, int]]:
+    """Return the process's (bytes read, bytes written), or None if unknown."""
+    global _own_bytes_read
+    try:
+        with open("/proc/self/io", "rb") as io_file:
+            data = io_file.read()
+        counters = dict(line.split(b":", 1) for line in data.splitlines() if b":" in line)
+        bytes_read = int(counters[b"rchar"]) - _own_bytes_read
+        _own_bytes_read += len(data)
+        return bytes_read, int(counters[b"wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class RunTimer:
+    """Collects per-phase timings, I/O counts and cache hit rates for a run."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        _open_counter.install()
+        self.phases: List[PhaseStats] = []
+        self.caches: Dict[str, Tuple[int, int]] = {}
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """Measure a phase; repeated names are accumulated into one entry.
+
+        Args:
+            name: Phase name shown in the report.
+
+        Returns:
+            Context manager yielding the phase's stats.
+        """
+        stats = next((phase for phase in self.phases if phase.name == name), None)
+        if stats is None:
+            stats = PhaseStats(name)
+            self.phases.append(stats)
+
+        io_before = _io_counters()
+        opened_before = _open_counter.count
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.wall_seconds += time.perf_counter() - wall_before
+            stats.cpu_seconds += time.process_time() - cpu_before
+            stats.files_opened += _open_counter.count - opened_before
+            io_after = _io_counters()
+            if io_before is not None and io_after is not None:
+                stats.bytes_read = (stats.bytes_read or 0) + io_after[0] - io_before[0]
+                stats.bytes_written = (stats.bytes_written or 0) + io_after[1] - io_before[1]
+
+    def record_cache(self, name: str, hits: int, lookups: int) -> None:
+        """Record how many of a cache's lookups were hits."""
+        previous_hits, previous_lookups = self.caches.get(name, (0, 0))
+        self.caches[name] = (previous_hits + hits, previous_lookups + lookups)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as JSON-serializable data."""
+        return {
+            "phases": [asdict(phase) for phase in self.phases],
+            "total": {
+                "wall_seconds": time.perf_counter() - self._started,
+                "cpu_seconds": time.process_time() - self._cpu_started,
+            },
+            "caches": {
+                name: {
+                    "hits": hits,
+                    "lookups": lookups,
+                    "hit_rate": hits / lookups if lookups else None,
+                }
+                for name, (hits, lookups) in self.caches.items()
+            },
+        }
+
+    def format_json(self) -> str:
+        """Return the report as a single line of JSON."""
+        return json.dumps(self.to_dict())
+
+    def format_table(self) -> str:
+        """Return the report as a plain-text table."""
+        report = self.to_dict()
+        rows = [("phase", "wall ms", "cpu ms", "opened", "read", "written")]
+        for phase in report["phases"]:
+            rows.append((
+                phase["name"],
+                f"{phase['wall_seconds'] * 1000:.1f}",
+                f"{phase['cpu_seconds'] * 1000:.1f}",
+                str(phase["files_opened"]),
+                _format_bytes(phase["bytes_read"]),
+                _format_bytes(phase["bytes_written"]),
+            ))
+        total = report["total"]
+        rows.append((
+            "total",
+            f"{total['wall_seconds'] * 1000:.1f}",
+            f"{total['cpu_seconds'] * 1000:.1f}",
+            "", "", "",
+        ))
+
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if column == 0 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        ]
+        for name, cache in report["caches"].items():
+            rate = "n/a" if cache["hit_rate"] is None else f"{cache['hit_rate']:.0%}"
+            lines.append(f"cache {name}: {cache['hits']}/{cache['lookups']} hits ({rate})")
+        return "\n".join(lines)
+
+
+class _DisabledTimer:
+    """Timer used when timings are off; every operation is a no-op."""
+
+    enabled = False
+
+    _NO_PHASE: ContextManager[None] = nullcontext()
+
+    def phase(self, name: str) -> ContextManager[None]:
+        return self._NO_PHASE
+
+    def record_cache(self, name: str, hits: int, lookups: int) -> None:
+        pass
+
+
+DISABLED_TIMER = _DisabledTimer()
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    """Format a byte count for the table, or '?' if unknown."""
+    return "?" if value is None else f"{value:,}"
@@ -0,0 +1,197 @@
+"""Running size and token totals of a selection.
+
+``SelectionTotals`` is updated as rules are added to or removed from a
+selection, at constant cost per rule, so selectors can show live totals
+without rescanning the selection. Besides the rules' own size it estimates
+what combining them adds: each section's boundary marker, the table of
+contents' header and entries, and the embedded source manifest's entries,
+when those are enabled. Tokens are estimated as one per four bytes, as for
+rule files.
+
+Example:
+    >>> totals = SelectionTotals(budget=8000, current_tokens=5200)
+    >>> totals.add(rule)
+    >>> totals.summary()
+    '1 rule · ~1,532 tokens (~32 overhead) · 6,000 bytes · -3,668 vs current'
+"""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from .compression import uncompressed_size
+from .manifest import SourceEntry, SourceManifest
+from .models import RuleFile
+from .processor import RuleProcessor
+
+# Bytes per estimated token, as in RuleFile.estimate_tokens_from_file_size
+BYTES_PER_TOKEN = 4
+
+_PROCESSOR = RuleProcessor()
+
+# A section marker with an empty id and a one-digit size
+_MARKER_BYTES = len(_PROCESSOR.format_section_marker("", "").encode('utf-8')) - 1
+
+# "# Table of Contents" and the blank lines around the entries
+_TOC_HEADER_BYTES = len("# Table of Contents\n\n\n")
+
+# The manifest comment without sources, with a typical body size and an
+# empty selection record
+_MANIFEST_BYTES = len(SourceManifest(
+    options={
+        "include_toc": True, "tool_version": "0.0.0", "rules_directory": "rules",
+        "rules_mtime_ns": 10**18, "selection": {
+            "mode": "specific", "rules": [], "patterns": [], "tags": [], "expression": None,
+        },
+    },
+    body_size=10**6,
+).to_comment())
+
+
+def budget_warning(tokens: int, budget: Optional[int]) -> Optional[str]:
+    """Return a warning if an estimated token count exceeds a budget, else None."""
+    if budget is None or tokens <= budget:
+        return None
+    return (
+        f"Selection exceeds the token budget: ~{tokens:,} tokens "
+        f"> {budget:,} (~{tokens - budget:,} over)"
+    )
+
+
+def output_tokens(path: Path) -> Optional[int]:
+    """Estimate the tokens of an existing output file from its size alone.
+
+    Compressed outputs are estimated from their decompressed size.
+
+    Returns:
+        The estimate, or None if the file does not exist or cannot be
+        decompressed.
+    """
+    try:
+        return uncompressed_size(path) // BYTES_PER_TOKEN
+    except (OSError, ValueError):
+        return None
+
+
+class SelectionTotals:
+    """Size, token and overhead totals of a changing selection.
+
+    The caller keeps track of which rules are selected; adding a rule twice
+    counts it twice.
+
+    Attributes:
+        count: Number of rules in the selection.
+        size: Total size of the rule files in bytes.
+        tokens: Total estimated tokens of the rule files.
+        budget: Token budget of the combined output, or None.
+        current_tokens: Estimated tokens of the output generated last, or
+            None if there is none.
+    """
+
+    def __init__(
+        self,
+        include_toc: bool = True,
+        embed_manifest: bool = True,
+        budget: Optional[int] = None,
+        current_tokens: Optional[int] = None,
+    ) -> None:
+        """Start with an empty selection.
+
+        Args:
+            include_toc: Whether the output gets a table of contents.
+            embed_manifest: Whether the output embeds a source manifest.
+            budget: Token budget of the combined output.
+            current_tokens: Estimated tokens of the existing output, for
+                ``delta``.
+        """
+        self.include_toc = include_toc
+        self.embed_manifest = embed_manifest
+        self.budget = budget
+        self.current_tokens = current_tokens
+        self._rule_overhead: Dict[str, int] = {}
+        self.clear()
+
+    def clear(self) -> None:
+        """Empty the selection, keeping the settings."""
+        self.count = 0
+        self.size = 0
+        self.tokens = 0
+        self._overhead = 0
+
+    def add(self, rule: RuleFile) -> None:
+        """Count a rule that joined the selection."""
+        self.count += 1
+        self.size += rule.file_size
+        self.tokens += rule.estimated_tokens
+        self._overhead += self._overhead_of(rule)
+
+    def remove(self, rule: RuleFile) -> None:
+        """Stop counting a rule that left the selection."""
+        self.count -= 1
+        self.size -= rule.file_size
+        self.tokens -= rule.estimated_tokens
+        self._overhead -= self._overhead_of(rule)
+
+    @property
+    def overhead_tokens(self) -> int:
+        """Estimated tokens added by section markers, the table of contents and the manifest."""
+        overhead = self._overhead
+        if self.include_toc and self.count:
+            overhead += _TOC_HEADER_BYTES + _MARKER_BYTES + len("toc")
+        if self.embed_manifest and self.count:
+            overhead += _MANIFEST_BYTES
+        return overhead // BYTES_PER_TOKEN
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens of the combined output."""
+        return self.tokens + self.overhead_tokens
+
+    @property
+    def delta(self) -> Optional[int]:
+        """Change in estimated tokens against the existing output, or None."""
+        if self.current_tokens is None:
+            return None
+        return self.total_tokens - self.current_tokens
+
+    @property
+    def over_budget(self) -> bool:
+        """True if the combined output would exceed the token budget."""
+        return self.budget is not None and self.total_tokens > self.budget
+
+    def summary(self) -> str:
+        """Describe the totals on one line."""
+        noun = "rule" if self.count == 1 else "rules"
+        parts = [
+            f"{self.count} {noun}",
+            f"~{self.total_tokens:,} tokens (~{self.overhead_tokens:,} overhead)",
+            f"{self.size:,} bytes",
+        ]
+        if self.delta is not None:
+            parts.append(f"{self.delta:+,} vs current")
+        if self.budget is not None:
+            parts.append(f"budget {self.budget:,}")
+        return " · ".join(parts)
+
+    def budget_warning(self) -> Optional[str]:
+        """Return a warning if the budget is exceeded, else None."""
+        return budget_warning(self.total_tokens, self.budget)
+
+    def _overhead_of(self, rule: RuleFile) -> int:
+        """Bytes the combined output adds for one rule, cached per filename."""
+        overhead = self._rule_overhead.get(rule.filename)
+        if overhead is None:
+            overhead = _MARKER_BYTES + len(rule.filename) + len(str(rule.file_size))
+            if self.include_toc:
+                # "N. [Title](#anchor)\n", with a typical two-digit N
+                anchor = _PROCESSOR._create_anchor_link(rule.title)
+                overhead += len(f"00. [{rule.title}](#{anchor})\n".encode('utf-8'))
+            if self.embed_manifest:
+                # A source entry with a 19-digit mtime, plus its comma, for an
+                # output next to the rules directory
+                path = f"{rule.path.parent.name}/{rule.filename}"
+                entry = SourceEntry(path, rule.file_size, 10**18, "0" * 64)
+                overhead += len(json.dumps(asdict(entry), separators=(',', ':'))) + 1
+            self._rule_overhead[rule.filename] = overhead
+        return overhead
@@ -0,0 +1,13 @@
+"""Shared fixtures for the test suite."""
+
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.daemon import SOCKET_ENV_VAR
+
+
+@pytest.fixture(autouse=True)
+def isolated_daemon_socket(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Point the daemon socket into tmp_path so tests never reach a running daemon."""
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "rules-combiner.sock"))
@@ -0,0 +1,566 @@
+"""Integration tests for the Rules Combiner CLI commands."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import rules_combiner
+from rules_combiner.cli import cli
+from rules_combiner.daemon import DaemonClient, RulesDaemon
+
+
+@pytest.fixture
+def rules_dir(tmp_path: Path) -> Path:
+    """Create a rules directory with two rule files."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "first.md").write_text("# First Rule\n\nContent 1\n", encoding='utf-8')
+    (rules_dir / "second.md").write_text("# Second Rule\n\nContent 2\n", encoding='utf-8')
+    return rules_dir
+
+
+def _generate(runner: CliRunner, rules_dir: Path, output: Path, *args: str):
+    """Run generate selecting all rules through the interactive prompt."""
+    return runner.invoke(
+        cli,
+        ["generate", "--rules-dir", str(rules_dir), "--output", str(output), *args],
+        input="all\ny\n",
+    )
+
+
+class TestCliCommands:
+    """Test cases for CLI subcommands."""
+
+    def test_generate_then_verify_fresh(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that a freshly generated output verifies as up to date."""
+        # Arrange
+        runner = CliRunner()
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        generate_result = _generate(runner, rules_dir, output, "--no-backup")
+        verify_result = runner.invoke(cli, ["verify", "--output", str(output)])
+
+        # Assert
+        assert generate_result.exit_code == 0, generate_result.output
+        assert verify_result.exit_code == 0
+        assert "is up to date" in " ".join(verify_result.output.split())
+
+    def test_verify_reports_changed_source(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that verify exits non-zero after a source changes."""
+        # Arrange
+        runner = CliRunner()
+        output = tmp_path / "AGENT.md"
+        _generate(runner, rules_dir, output, "--no-backup")
+        (rules_dir / "second.md").write_text("# Second Rule\n\nChanged\n", encoding='utf-8')
+
+        # Act
+        result = runner.invoke(cli, ["verify", "--output", str(output)])
+
+        # Assert
+        assert result.exit_code == 1
+        assert "second.md" in result.output
+
+    def test_generate_without_manifest(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --no-manifest leaves the output without a manifest."""
+        # Arrange
+        runner = CliRunner()
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        _generate(runner, rules_dir, output, "--no-backup", "--no-manifest")
+        result = runner.invoke(cli, ["verify", "--output", str(output)])
+
+        # Assert
+        assert "rules-combiner-manifest" not in output.read_text(encoding='utf-8')
+        assert result.exit_code == 1
+
+    def test_history_commands(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test recording, listing, diffing and restoring history."""
+        # Arrange
+        runner = CliRunner()
+        output = tmp_path / "AGENT.md"
+        _generate(runner, rules_dir, output, "--history")
+        first_content = output.read_text(encoding='utf-8')
+        (rules_dir / "first.md").write_text("# First Rule\n\nUpdated\n", encoding='utf-8')
+        _generate(runner, rules_dir, output, "--history")
+
+        # Act
+        list_result = runner.invoke(cli, ["history", "list", "--output", str(output)])
+        diff_result = runner.invoke(cli, ["history", "diff", "1", "2", "--output", str(output)])
+        restore_result = runner.invoke(cli, ["history", "restore", "1", "--output", str(output)])
+
+        # Assert
+        assert list_result.exit_code == 0
+        assert "delta" in list_result.output
+        assert "+Updated" in diff_result.output
+        assert restore_result.exit_code == 0
+        assert output.read_text(encoding='utf-8') == first_content
+        assert not list(tmp_path.glob("AGENT_backup_*"))
+
+    def test_regenerate_patches_to_same_bytes_as_full_build(
+        self, rules_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test that an incremental regenerate matches a fresh full build."""
+        # Arrange
+        runner = CliRunner()
+        output = tmp_path / "AGENT.md"
+        fresh_output = tmp_path / "FRESH.md"
+        _generate(runner, rules_dir, output, "--no-backup")
+        (rules_dir / "second.md").write_text("# Second Rule\n\nContent 2b\n", encoding='utf-8')
+
+        # Act
+        result = _generate(runner, rules_dir, output, "--no-backup")
+        _generate(runner, rules_dir, fresh_output, "--no-backup")
+
+        # Assert
+        assert result.exit_code == 0
+        assert "Patched from byte" in result.output
+        assert output.read_bytes() == fresh_output.read_bytes()
+
+    def test_generate_with_memory_cap_matches_normal_build(
+        self, rules_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test that the spooled build writes the same bytes as a normal build."""
+        # Arrange
+        runner = CliRunner()
+        output = tmp_path / "AGENT.md"
+        spooled_output = tmp_path / "SPOOLED.md"
+
+        # Act
+        _generate(runner, rules_dir, output, "--no-backup")
+        result = _generate(runner, rules_dir, spooled_output, "--no-backup", "--max-memory", "1K")
+        verify_result = runner.invoke(cli, ["verify", "--output", str(spooled_output)])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert spooled_output.read_bytes() == output.read_bytes()
+        assert verify_result.exit_code == 0
+
+    def test_generate_rejects_invalid_memory_cap(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that malformed --max-memory values are rejected."""
+        # Act
+        result = _generate(CliRunner(), rules_dir, tmp_path / "AGENT.md", "--max-memory", "lots")
+
+        # Assert
+        assert result.exit_code == 2
+
+    def test_generate_non_interactive_selection(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test --all, --select and --select-glob never prompt."""
+        # Arrange
+        runner = CliRunner()
+        base_args = ["generate", "--rules-dir", str(rules_dir), "--no-backup"]
+
+        # Act
+        all_result = runner.invoke(cli, [*base_args, "--output", str(tmp_path / "all.md"), "--all"])
+        select_result = runner.invoke(
+            cli, [*base_args, "--output", str(tmp_path / "one.md"), "--select", "second.md"]
+        )
+        glob_result = runner.invoke(
+            cli, [*base_args, "--output", str(tmp_path / "glob.md"), "--select-glob", "f*.md"]
+        )
+
+        # Assert
+        assert all_result.exit_code == 0, all_result.output
+        assert "Selection options" not in all_result.output
+        all_content = (tmp_path / "all.md").read_text(encoding='utf-8')
+        assert "First Rule" in all_content and "Second Rule" in all_content
+        one_content = (tmp_path / "one.md").read_text(encoding='utf-8')
+        assert "Second Rule" in one_content and "First Rule" not in one_content
+        glob_content = (tmp_path / "glob.md").read_text(encoding='utf-8')
+        assert "First Rule" in glob_content and "Second Rule" not in glob_content
+        assert select_result.exit_code == 0 and glob_result.exit_code == 0
+
+    def test_generate_with_unknown_selection_fails(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that selecting a missing rule exits with an error."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir),
+            "--output", str(tmp_path / "AGENT.md"), "--select", "missing.md",
+        ])
+
+        # Assert
+        assert result.exit_code == 1
+        assert "missing.md" in result.output
+
+    def test_generate_from_config_file(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test generating from a TOML config without prompting."""
+        # Arrange
+        config_path = tmp_path / "combine.toml"
+        config_path.write_text(
+            'rules_directory = "rules"\n'
+            'output_file = "FROM_CONFIG.md"\n'
+            'selected_rules = ["second.md"]\n'
+            'include_toc = false\n'
+            'backup_existing = false\n'
+        )
+
+        # Act
+        result = CliRunner().invoke(cli, ["generate", "--config", str(config_path)])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        content = (tmp_path / "FROM_CONFIG.md").read_text(encoding='utf-8')
+        assert "Second Rule" in content
+        assert "Table of Contents" not in content
+
+    def test_generate_with_missing_rules_dir(self, tmp_path: Path) -> None:
+        """Test that a missing rules directory is a usage error."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(tmp_path / "missing"), "--all",
+        ])
+
+        # Assert
+        assert result.exit_code == 2
+
+    def test_build_command(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test building several targets from a manifest."""
+        # Arrange
+        manifest_path = tmp_path / "rules-build.toml"
+        manifest_path.write_text(
+            '[[targets]]\noutput = "a/AGENT.md"\nselect = ["first.md"]\n'
+            '[[targets]]\noutput = "b/AGENT.md"\nselect = "all"\n'
+        )
+
+        # Act
+        result = CliRunner().invoke(cli, ["build", str(manifest_path), "--jobs", "2"])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert "targets/s" in result.output
+        assert (tmp_path / "a" / "AGENT.md").exists()
+        assert (tmp_path / "b" / "AGENT.md").exists()
+
+    def test_list_rules_streams_ndjson_with_fields(self, rules_dir: Path) -> None:
+        """Test that ndjson prints one projected record per line and no banner."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "list-rules", "--rules-dir", str(rules_dir), "--format", "ndjson",
+            "--fields", "filename,title", "--sort", "filename",
+        ])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.output.splitlines()]
+        assert records == [
+            {"filename": "first.md", "title": "First Rule"},
+            {"filename": "second.md", "title": "Second Rule"},
+        ]
+
+    def test_list_rules_json_and_tsv(self, rules_dir: Path) -> None:
+        """Test the json array and tsv formats with sorting and a limit."""
+        # Arrange
+        runner = CliRunner()
+        base = ["list-rules", "--rules-dir", str(rules_dir), "--sort", "-filename"]
+
+        # Act
+        as_json = runner.invoke(cli, [*base, "--format", "json"])
+        as_tsv = runner.invoke(cli, [*base, "--format", "tsv", "--fields", "filename,size", "--limit", "1"])
+
+        # Assert
+        records = json.loads(as_json.output)
+        assert [record["filename"] for record in records] == ["second.md", "first.md"]
+        assert set(records[0]) == {"filename", "path", "title", "size", "tokens"}
+        assert as_tsv.output.splitlines() == ["filename\tsize", "second.md\t25"]
+
+    def test_list_rules_rejects_bad_fields(self, rules_dir: Path) -> None:
+        """Test that unknown fields, and fields with the table format, are usage errors."""
+        # Arrange
+        runner = CliRunner()
+        base = ["list-rules", "--rules-dir", str(rules_dir)]
+
+        # Act
+        unknown = runner.invoke(cli, [*base, "--format", "json", "--fields", "colour"])
+        table = runner.invoke(cli, [*base, "--fields", "filename"])
+
+        # Assert
+        assert unknown.exit_code == 2 and "colour" in unknown.output
+        assert table.exit_code == 2
+
+    def test_generate_porcelain_prints_stable_lines(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --porcelain prints tab-separated events and no styling."""
+        # Arrange
+        output = tmp_path / "AGENT.md"
+        args = [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--select", "second.md,first.md", "--no-backup", "--no-daemon",
+        ]
+
+        # Act
+        porcelain = CliRunner().invoke(cli, [*args, "--porcelain"])
+        quiet = CliRunner().invoke(cli, [*args, "--quiet"])
+
+        # Assert
+        assert porcelain.exit_code == 0, porcelain.output
+        lines = [line.split("\t") for line in porcelain.output.splitlines()]
+        assert lines[:4] == [
+            ["discovered", "2"], ["selected", "2"],
+            ["rule", "1", "2", "second.md"], ["rule", "2", "2", "first.md"],
+        ]
+        assert lines[4][:2] == ["write", "rewritten"]
+        assert lines[5] == ["generated", str(output), "2", str(output.stat().st_size)]
+        assert quiet.exit_code == 0 and quiet.output == ""
+
+    def test_porcelain_requires_non_interactive_selection(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --porcelain without a selection is a usage error."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(tmp_path / "AGENT.md"),
+            "--porcelain",
+        ])
+
+        # Assert
+        assert result.exit_code == 2
+        assert "--porcelain" in result.output
+
+    def test_generate_reports_timings_as_json(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --timings json reports every phase on stderr."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(tmp_path / "AGENT.md"),
+            "--all", "--no-daemon", "--porcelain", "--timings", "json",
+        ])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.stderr)
+        assert [phase["name"] for phase in report["phases"]] == [
+            "discovery", "selection", "processing", "backup", "write", "validation",
+        ]
+        assert report["caches"]["sections"]["lookups"] == 2
+        assert "phase" not in result.stdout
+
+    def test_list_rules_reports_timings_table(self, rules_dir: Path) -> None:
+        """Test that a bare --timings prints the table format."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "list-rules", "--rules-dir", str(rules_dir), "--format", "tsv", "--timings",
+        ])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert result.stderr.splitlines()[0].startswith("phase")
+        assert result.stdout.splitlines()[0] == "filename\tpath\ttitle\tsize\ttokens"
+
+    def test_profile_option_writes_profiles(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --profile saves pstats and collapsed stacks for a subcommand."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "--profile", str(tmp_path / "run"),
+            "list-rules", "--rules-dir", str(rules_dir), "--format", "ndjson",
+        ])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / "run.pstats").stat().st_size > 0
+        assert "iter_rules" in (tmp_path / "run.collapsed").read_text(encoding='utf-8')
+
+    def test_picker_requires_terminal(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --picker fails cleanly when stdin is not a terminal."""
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(tmp_path / "AGENT.md"),
+            "--picker",
+        ])
+
+        # Assert
+        assert result.exit_code == 1
+        assert "--picker needs an interactive terminal" in " ".join(result.output.split())
+        assert not (tmp_path / "AGENT.md").exists()
+
+    def test_generate_selects_by_tags(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --tags combines the rules carrying any of the tags."""
+        # Arrange
+        (rules_dir / "second.md").write_text(
+            "---\ntags: [review]\n---\n# Second Rule\n\nContent 2\n", encoding='utf-8'
+        )
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--tags", "review", "--no-backup", "--no-daemon",
+        ])
+        unknown = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--tags", "style", "--no-daemon",
+        ])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        content = output.read_text(encoding='utf-8')
+        assert "Second Rule" in content and "First Rule" not in content
+        assert "tags:" not in content
+        assert unknown.exit_code == 1
+        assert "Tag 'style' matches no rule files" in unknown.output
+
+    def test_generate_with_saved_profile_reuses_output(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that an unchanged profile is served from its cache without a rebuild."""
+        # Arrange
+        runner = CliRunner()
+        profiles = tmp_path / "profiles.toml"
+        output = tmp_path / "AGENT.md"
+        base = [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--profiles-file", str(profiles), "--porcelain", "--no-backup",
+        ]
+
+        # Act
+        saved = runner.invoke(cli, [*base, "--select", "second.md", "--save-profile", "mine"])
+        first = runner.invoke(cli, [*base, "--use-profile", "mine"])
+        second = runner.invoke(cli, [*base, "--use-profile", "mine"])
+        output.write_text("edited\n", encoding='utf-8')
+        restored = runner.invoke(cli, [*base, "--use-profile", "mine"])
+
+        # Assert
+        assert saved.exit_code == 0, saved.output
+        assert 'selected_rules = ["second.md"]' in profiles.read_text(encoding='utf-8')
+        assert first.exit_code == 0 and "generated\t" in first.stdout
+        assert second.stdout.splitlines() == [f"cached\t{output}\t1\tcurrent"]
+        assert restored.stdout.splitlines() == [f"cached\t{output}\t1\trestored"]
+        assert "Second Rule" in output.read_text(encoding='utf-8')
+
+    def test_generate_select_accepts_expressions(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --select takes the same expressions as the interactive prompt."""
+        # Arrange
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--select", "*.md & !first.md", "--no-backup", "--no-daemon",
+        ])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        content = output.read_text(encoding='utf-8')
+        assert "Second Rule" in content and "First Rule" not in content
+
+    def test_generate_adds_required_rules_first(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that a rule's requirements are selected too and written before it."""
+        # Arrange
+        (rules_dir / "first.md").write_text(
+            "---\nrequires: [second.md]\n---\n# First Rule\n", encoding='utf-8'
+        )
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        interactive = _generate(CliRunner(), rules_dir, output, "--no-backup")
+        interactive_content = output.read_text(encoding='utf-8')
+        result = CliRunner().invoke(cli, [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--select", "first.md", "--no-backup", "--no-daemon",
+        ])
+
+        # Assert
+        assert interactive.exit_code == 0, interactive.output
+        assert interactive_content.index("Second Rule") < interactive_content.index("First Rule")
+        assert result.exit_code == 0, result.output
+        content = output.read_text(encoding='utf-8')
+        assert content.index("Second Rule") < content.index("First Rule")
+
+    def test_generate_warns_over_budget(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that --budget warns about a selection too large for it, but still builds."""
+        # Arrange
+        output = tmp_path / "AGENT.md"
+        base = [
+            "generate", "--rules-dir", str(rules_dir), "--output", str(output),
+            "--all", "--no-backup", "--no-daemon", "--porcelain",
+        ]
+
+        # Act
+        over = CliRunner().invoke(cli, [*base, "--budget", "10"])
+        under = CliRunner().invoke(cli, [*base, "--budget", "100000"])
+
+        # Assert
+        assert over.exit_code == 0, over.output
+        assert "warning\tSelection exceeds the token budget" in over.stderr
+        assert output.exists()
+        assert under.exit_code == 0 and "budget" not in under.stderr
+
+    def test_completion_script_and_candidates(
+        self, rules_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the completion command prints a script and --select completes filenames."""
+        # Arrange
+        from click.shell_completion import ShellComplete
+        
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        complete = ShellComplete(cli, {}, "rules-combiner", "_RULES_COMBINER_COMPLETE")
+
+        # Act
+        script = CliRunner().invoke(cli, ["completion", "zsh"])
+        candidates = complete.get_completions(
+            ["generate", "--rules-dir", str(rules_dir), "--select"], "first.md,s"
+        )
+
+        # Assert
+        assert script.exit_code == 0, script.output
+        assert "_COMPLETE=zsh_complete" in script.stdout
+        assert [item.value for item in candidates] == ["first.md,second.md"]
+
+    def test_generate_forwards_to_running_daemon(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that non-interactive generate is served by a running daemon."""
+        # Arrange
+        socket_dir = tempfile.mkdtemp(prefix="rc-")
+        socket_path = Path(socket_dir) / "d.sock"
+        daemon = RulesDaemon(socket_path)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        daemon.wait_until_ready(timeout=5)
+        runner = CliRunner(env={"RULES_COMBINER_SOCKET": str(socket_path)})
+        output = tmp_path / "AGENT.md"
+        args = ["generate", "--rules-dir", str(rules_dir), "--output", str(output), "--all"]
+
+        try:
+            # Act
+            forwarded = runner.invoke(cli, [*args, "--no-backup"])
+            local = runner.invoke(cli, [*args, "--no-backup", "--no-daemon"])
+            stats = DaemonClient(socket_path).request("stats")
+        finally:
+            daemon.shutdown()
+            thread.join(timeout=5)
+            shutil.rmtree(socket_dir, ignore_errors=True)
+
+        # Assert
+        assert forwarded.exit_code == 0, forwarded.output
+        assert "Generated by daemon" in forwarded.output
+        assert "Generated by daemon" not in local.output
+        assert "already up to date" in local.output
+        assert stats["discoveries"] == 1
+
+    def test_verbose_restores_debug_logging(self, rules_dir: Path, tmp_path: Path) -> None:
+        """Test that log records below warnings are only shown with --verbose."""
+        # Arrange
+        src_dir = str(Path(rules_combiner.__file__).resolve().parents[1])
+        python_path = os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")]))
+        env = {**os.environ, "PYTHONPATH": python_path}
+        args = [
+            "generate", "--all", "--no-daemon", "--no-backup",
+            "--rules-dir", str(rules_dir), "--output", str(tmp_path / "AGENT.md"),
+        ]
+
+        # Act
+        # loguru writes to the real stderr, which CliRunner does not capture
+        quiet, verbose = (
+            subprocess.run(
+                [sys.executable, "-m", "rules_combiner.cli", *flags, *args],
+                capture_output=True, text=True, env=env, check=True,
+            )
+            for flags in ([], ["--verbose"])
+        )
+
+        # Assert
+        assert "DEBUG" not in quiet.stderr and "INFO" not in quiet.stderr
+        assert "DEBUG" in verbose.stderr
+        assert "Starting rule discovery" in verbose.stderr
+
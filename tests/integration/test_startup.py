@@ -0,0 +1,107 @@
+"""Startup cost benchmarks for the CLI, measured with ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import rules_combiner
+
+SRC_DIR = Path(rules_combiner.__file__).resolve().parents[1]
+
+# Import time the package may add on top of click, in microseconds. Importing
+# everything eagerly cost well over 100 ms; the lazy path costs a few ms.
+OWN_IMPORT_BUDGET_US = 60_000
+
+# Modules that must only be imported by the subcommands that need them
+HEAVY_MODULES = ("loguru", "rich.console", "rules_combiner.discovery", "rules_combiner.selector")
+
+
+def _import_times(*args: str) -> Dict[str, int]:
+    """Run Python with ``-X importtime`` and return cumulative times per module."""
+    python_path = os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, env={**os.environ, "PYTHONPATH": python_path},
+        check=False,
+    )
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Test cases for CLI import cost."""
+
+    def test_importing_cli_skips_heavy_modules(self) -> None:
+        """Test that importing the CLI loads neither rich, loguru nor the engines."""
+        # Act
+        times = _import_times("-c", "import rules_combiner.cli")
+
+        # Assert
+        assert "rules_combiner.cli" in times
+        assert not [module for module in HEAVY_MODULES if module in times]
+
+    def test_cli_import_time_within_budget(self) -> None:
+        """Test that the package adds little import time on top of click."""
+        # Act
+        times = _import_times("-c", "import rules_combiner.cli")
+
+        # Assert
+        own_time = times["rules_combiner.cli"] - times.get("click", 0)
+        assert own_time < OWN_IMPORT_BUDGET_US, f"CLI import took {own_time / 1000:.1f} ms"
+
+    def test_version_skips_heavy_modules(self) -> None:
+        """Test that --version does not import rich, loguru or the engines."""
+        # Act
+        times = _import_times("-m", "rules_combiner.cli", "--version")
+
+        # Assert
+        assert not [module for module in HEAVY_MODULES if module in times]
+
+    def test_verify_of_fresh_output_skips_loguru(self, tmp_path: Path) -> None:
+        """Test that verifying a fresh output never imports loguru."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "first.md").write_text("# First Rule\n\nContent 1\n", encoding='utf-8')
+        output = tmp_path / "AGENT.md"
+        _import_times(
+            "-m", "rules_combiner.cli", "generate", "--all", "--no-backup",
+            "--rules-dir", str(rules_dir), "--output", str(output),
+        )
+
+        # Act
+        times = _import_times("-m", "rules_combiner.cli", "verify", "--output", str(output))
+
+        # Assert
+        assert output.exists()
+        assert "rules_combiner.manifest" in times
+        assert "loguru" not in times
+        assert "rules_combiner.discovery" not in times
+
+    def test_porcelain_generate_skips_rich(self, tmp_path: Path) -> None:
+        """Test that a porcelain build never imports rich."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "first.md").write_text("# First Rule\n\nContent 1\n", encoding='utf-8')
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        times = _import_times(
+            "-m", "rules_combiner.cli", "generate", "--all", "--porcelain", "--no-daemon",
+            "--rules-dir", str(rules_dir), "--output", str(output),
+        )
+
+        # Assert
+        assert output.exists()
+        assert "rules_combiner.reporting" in times
+        assert not [module for module in times if module.startswith("rich")]
@@ -0,0 +1,140 @@
+"""Unit tests for the asyncio combine façade."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.aio import AsyncCombiner
+from rules_combiner.api import Combiner
+from rules_combiner.models import CombinationConfig, SelectionMode
+
+
+@pytest.fixture
+def rules_dir(tmp_path: Path) -> Path:
+    """Create a rules directory with eight rule files."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    for number in range(8):
+        (rules_dir / f"rule-{number}.md").write_text(
+            f"# Rule {number}\n\nContent {number}\n", encoding='utf-8'
+        )
+    return rules_dir
+
+
+def _config(rules_dir: Path) -> CombinationConfig:
+    """Build a config selecting every rule."""
+    return CombinationConfig(
+        rules_directory=rules_dir,
+        output_file=rules_dir.parent / "AGENT.md",
+        selected_rules=[],
+        selection_mode=SelectionMode.ALL,
+        backup_existing=False,
+    )
+
+
+class _SlowCombiner(Combiner):
+    """Combiner whose section loads sleep and record concurrency."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.loads = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._counter_lock = threading.Lock()
+
+    def load_section(self, rule):
+        with self._counter_lock:
+            self.loads += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return super().load_section(rule)
+        finally:
+            with self._counter_lock:
+                self.in_flight -= 1
+
+
+class TestAsyncCombiner:
+    """Test cases for AsyncCombiner."""
+
+    def test_combine_matches_sync_api(self, rules_dir: Path) -> None:
+        """Test that the async result is byte-identical to the blocking one."""
+        # Arrange
+        config = _config(rules_dir)
+
+        async def run():
+            async with AsyncCombiner() as combiner:
+                rules = await combiner.discover(rules_dir)
+                return rules, await combiner.combine(config)
+
+        # Act
+        rules, result = asyncio.run(run())
+
+        # Assert
+        assert len(rules) == 8
+        assert result.content == Combiner().combine(config).content
+        assert result.timings.total > 0
+
+    def test_concurrent_requests_respect_concurrency_limit(self, rules_dir: Path) -> None:
+        """Test that many concurrent requests share a bounded number of I/O slots."""
+        # Arrange
+        engine = _SlowCombiner(delay=0.005)
+        config = _config(rules_dir)
+
+        async def run():
+            async with AsyncCombiner(engine, max_workers=8, max_concurrency=3) as combiner:
+                return await asyncio.gather(*(combiner.combine(config) for _ in range(20)))
+
+        # Act
+        results = asyncio.run(run())
+
+        # Assert
+        assert len({result.content for result in results}) == 1
+        assert engine.max_in_flight <= 3
+
+    def test_timeout_abandons_pending_loads(self, rules_dir: Path) -> None:
+        """Test that a timeout raises and stops queued section loads."""
+        # Arrange
+        engine = _SlowCombiner(delay=0.2)
+
+        async def run():
+            async with AsyncCombiner(engine, max_workers=1) as combiner:
+                await combiner.combine(_config(rules_dir), timeout=0.05)
+
+        # Act & Assert
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run())
+        assert engine.loads < 8
+
+    def test_cancellation_propagates(self, rules_dir: Path) -> None:
+        """Test that cancelling a request raises CancelledError in the caller."""
+        # Arrange
+        engine = _SlowCombiner(delay=0.2)
+
+        async def run():
+            async with AsyncCombiner(engine, max_workers=1) as combiner:
+                task = asyncio.ensure_future(combiner.combine(_config(rules_dir)))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                await task
+
+        # Act & Assert
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+        assert engine.loads < 8
+
+    def test_errors_propagate(self, tmp_path: Path) -> None:
+        """Test that discovery errors surface as ValueError."""
+        # Arrange
+        async def run():
+            async with AsyncCombiner() as combiner:
+                await combiner.discover(tmp_path / "missing")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            asyncio.run(run())
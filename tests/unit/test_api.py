@@ -0,0 +1,209 @@
+"""Unit tests for the programmatic combine API and its warm caches."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import rules_combiner
+from rules_combiner.api import Combiner, WarmCatalog, combine
+from rules_combiner.manifest import SourceManifest, StalenessChecker, selection_options
+from rules_combiner.models import CombinationConfig, SelectionMode
+from rules_combiner.processor import RuleProcessor
+
+
+@pytest.fixture
+def rules_dir(tmp_path: Path) -> Path:
+    """Create a rules directory with two rule files."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "first.md").write_text("# First Rule\n\nContent 1\n", encoding='utf-8')
+    (rules_dir / "second.md").write_text("# Second Rule\n\nCafé ☕\n", encoding='utf-8')
+    return rules_dir
+
+
+def _config(rules_dir: Path, **overrides) -> CombinationConfig:
+    """Build a config selecting every rule, writing next to the rules directory."""
+    options = {
+        "rules_directory": rules_dir,
+        "output_file": rules_dir.parent / "AGENT.md",
+        "selected_rules": [],
+        "selection_mode": SelectionMode.ALL,
+        "backup_existing": False,
+    }
+    options.update(overrides)
+    return CombinationConfig(**options)
+
+
+def _touch_later(path: Path, content: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is visible."""
+    stat = path.stat()
+    path.write_text(content, encoding='utf-8')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestWarmCatalog:
+    """Test cases for the WarmCatalog caches."""
+
+    def test_rules_are_cached_until_directory_changes(self, rules_dir: Path) -> None:
+        """Test that discovery is repeated only after a file is added."""
+        # Arrange
+        catalog = WarmCatalog()
+
+        # Act
+        first = catalog.rules(rules_dir)
+        second = catalog.rules(rules_dir)
+        (rules_dir / "third.md").write_text("# Third\n", encoding='utf-8')
+        third = catalog.rules(rules_dir)
+
+        # Assert
+        assert second is first
+        assert len(third) == 3
+        assert catalog.stats.discoveries == 2
+        assert catalog.stats.catalog_hits == 1
+
+    def test_section_is_reprocessed_only_when_its_file_changes(self, rules_dir: Path) -> None:
+        """Test that a modified rule invalidates only its own section."""
+        # Arrange
+        catalog = WarmCatalog()
+        first, second = sorted(catalog.rules(rules_dir), key=lambda rule: rule.filename)
+        catalog.section(first)
+        catalog.section(second)
+
+        # Act
+        _touch_later(first.path, "# First Rule\n\nEdited\n")
+        edited, edited_hit = catalog.section(first)
+        _, second_hit = catalog.section(second)
+
+        # Assert
+        assert b"Edited" in edited.data
+        assert not edited_hit and second_hit
+        assert catalog.stats.sections_processed == 3
+        assert catalog.stats.section_hits == 1
+
+    def test_missing_directory_raises(self, tmp_path: Path) -> None:
+        """Test that an unknown rules directory is reported as a ValueError."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="does not exist"):
+            WarmCatalog().rules(tmp_path / "missing")
+
+
+class TestCombiner:
+    """Test cases for the Combiner engine."""
+
+    def test_content_matches_streamed_sections(self, rules_dir: Path) -> None:
+        """Test that combined bytes equal the processor's streamed document."""
+        # Arrange
+        config = _config(rules_dir)
+        combiner = Combiner()
+        rules = combiner.discover(rules_dir)
+        manifest = SourceManifest(options={
+            "include_toc": True, "tool_version": rules_combiner.__version__,
+            **selection_options(config),
+        })
+        expected = manifest.embed("\n".join(RuleProcessor().iter_sections(
+            rules, True, manifest, config.output_file.parent
+        )))
+
+        # Act
+        result = combiner.combine(config)
+
+        # Assert
+        assert result.content == expected.encode('utf-8')
+        assert result.text == expected
+
+    def test_section_offsets_locate_each_section(self, rules_dir: Path) -> None:
+        """Test that section metadata points at each section's marker."""
+        # Act
+        result = Combiner().combine(_config(rules_dir, embed_manifest=False))
+
+        # Assert
+        assert [section.section_id for section in result.sections][0] == "toc"
+        for section in result.sections:
+            data = result.content[section.offset:section.offset + section.size]
+            assert data.startswith(
+                f'<!-- rules-combiner:section id="{section.section_id}"'.encode('utf-8')
+            )
+        last = result.sections[-1]
+        assert last.offset + last.size == len(result.content)
+
+    def test_repeated_combine_is_served_from_cache(self, rules_dir: Path) -> None:
+        """Test that a second call reuses discovery and every section."""
+        # Arrange
+        combiner = Combiner()
+        config = _config(rules_dir)
+        first = combiner.combine(config)
+
+        # Act
+        second = combiner.combine(config)
+
+        # Assert
+        assert second.content == first.content
+        assert not any(section.cached for section in first.sections)
+        assert all(section.cached for section in second.sections if section.sha256)
+        assert combiner.catalog.stats.discoveries == 1
+        assert second.timings.total >= second.timings.processing > 0
+
+    def test_patterns_and_names_select_in_order(self, rules_dir: Path) -> None:
+        """Test that named rules come first, then glob matches."""
+        # Arrange
+        config = _config(
+            rules_dir, selection_mode=SelectionMode.SPECIFIC,
+            selected_rules=["second.md"], selected_patterns=["f*.md"], include_toc=False,
+        )
+
+        # Act
+        result = Combiner().combine(config)
+
+        # Assert
+        assert [section.section_id for section in result.sections] == ["second.md", "first.md"]
+
+    def test_invalid_selection_raises_without_exiting(self, rules_dir: Path) -> None:
+        """Test that errors surface as ValueError rather than SystemExit."""
+        # Arrange
+        interactive = _config(rules_dir, selection_mode=SelectionMode.INTERACTIVE)
+        unknown = _config(
+            rules_dir, selection_mode=SelectionMode.SPECIFIC, selected_rules=["nope.md"]
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            Combiner().combine(interactive)
+        with pytest.raises(ValueError, match="nope.md"):
+            Combiner().combine(unknown)
+
+    def test_write_produces_fresh_output(self, rules_dir: Path) -> None:
+        """Test writing a result, then rewriting it unchanged with a backup."""
+        # Arrange
+        combiner = Combiner()
+        config = _config(rules_dir)
+        result = combiner.combine(config)
+
+        # Act
+        first = combiner.write(config, result)
+        second = combiner.write(_config(rules_dir, backup_existing=True), result)
+
+        # Assert
+        assert first.mode == "rewritten" and first.backup_path is None
+        assert second.mode == "unchanged" and second.backup_path.exists()
+        assert StalenessChecker(config.output_file).verify().fresh
+
+
+class TestModuleApi:
+    """Test cases for the module-level entry points."""
+
+    def test_combine_function_and_lazy_package_exports(self, rules_dir: Path) -> None:
+        """Test the shared combine() and its lazy re-export from the package."""
+        # Act
+        result = rules_combiner.combine(_config(rules_dir))
+
+        # Assert
+        assert rules_combiner.combine is combine
+        assert rules_combiner.Combiner is Combiner
+        assert sorted(rule.filename for rule in result.rules) == ["first.md", "second.md"]
+
+    def test_unknown_package_attribute_raises(self) -> None:
+        """Test that unknown attributes still raise AttributeError."""
+        # Act & Assert
+        with pytest.raises(AttributeError):
+            rules_combiner.does_not_exist
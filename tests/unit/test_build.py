@@ -0,0 +1,157 @@
+"""Unit tests for the multi-target build runner."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from rules_combiner.build import BuildRunner, load_build_manifest
+from rules_combiner.catalog import RuleCatalog
+from rules_combiner.manifest import StalenessChecker
+from rules_combiner.models import SelectionMode
+from rules_combiner.processor import RuleProcessor
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    """Create a project with three rules and a build manifest."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    for name in ("python-coding.md", "python-test.md", "type-script.md"):
+        (rules_dir / name).write_text(f"# {name} title\n\nBody of {name}.\n", encoding='utf-8')
+
+    (tmp_path / "rules-build.toml").write_text(
+        'rules_directory = "rules"\n'
+        '\n'
+        '[[targets]]\n'
+        'name = "api"\n'
+        'output = "services/api/AGENT.md"\n'
+        'select = ["python-test.md", "python-coding.md"]\n'
+        '\n'
+        '[[targets]]\n'
+        'output = "services/web/AGENT.md.gz"\n'
+        'select_glob = "type-*.md"\n'
+        'include_toc = false\n'
+        '\n'
+        '[[targets]]\n'
+        'name = "everything"\n'
+        'output = "AGENT.md"\n'
+        'select = "all"\n',
+        encoding='utf-8',
+    )
+    return tmp_path
+
+
+class TestLoadBuildManifest:
+    """Test cases for load_build_manifest."""
+
+    def test_load_targets(self, project_dir: Path) -> None:
+        """Test that targets and defaults are loaded."""
+        # Act
+        targets = load_build_manifest(project_dir / "rules-build.toml")
+
+        # Assert
+        assert [target.name for target in targets] == [
+            "api", "services/web/AGENT.md.gz", "everything"
+        ]
+        assert targets[0].selected_rules == ["python-test.md", "python-coding.md"]
+        assert targets[0].rules_directory == project_dir / "rules"
+        assert targets[1].patterns == ["type-*.md"]
+        assert targets[1].include_toc is False
+        assert targets[2].selection_mode is SelectionMode.ALL
+
+    @pytest.mark.parametrize("content", [
+        'rules_directory = "rules"\n',
+        '[[targets]]\nselect = "all"\n',
+        '[[targets]]\noutput = "AGENT.md"\n',
+        'targets = [1]\n',
+        '[[targets]]\noutput = "AGENT.md"\nselect = 5\n',
+        '[[targets]]\noutput = "AGENT.md"\nselect = ["a.md", 5]\n',
+        '[[targets]]\noutput = "AGENT.md"\nselect_glob = 5\n',
+        '[[targets]]\noutput = 5\nselect = "all"\n',
+        '[[targets]]\noutput = "AGENT.md"\nselect = "all"\n'
+        '[[targets]]\noutput = "./AGENT.md"\nselect = ["a.md"]\n',
+    ])
+    def test_invalid_manifest(self, tmp_path: Path, content: str) -> None:
+        """Test that invalid manifests raise ValueError."""
+        # Arrange
+        manifest_path = tmp_path / "rules-build.toml"
+        manifest_path.write_text(content)
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            load_build_manifest(manifest_path)
+
+
+class TestBuildRunner:
+    """Test cases for BuildRunner."""
+
+    def test_run_builds_all_targets(self, project_dir: Path) -> None:
+        """Test that every target is written and verifies fresh."""
+        # Arrange
+        runner = BuildRunner(load_build_manifest(project_dir / "rules-build.toml"), jobs=2)
+
+        # Act
+        summary = runner.run()
+
+        # Assert
+        assert summary.failed == []
+        assert [result.rule_count for result in summary.results] == [2, 1, 3]
+        api_content = (project_dir / "services/api/AGENT.md").read_text(encoding='utf-8')
+        assert api_content.index("python-test.md title") < api_content.index("python-coding.md title")
+        assert (project_dir / "services/web/AGENT.md.gz").read_bytes()[:2] == b"\x1f\x8b"
+        for output in ("services/api/AGENT.md", "services/web/AGENT.md.gz", "AGENT.md"):
+            assert StalenessChecker(project_dir / output).verify().fresh
+        assert summary.total_bytes > 0
+
+    def test_each_rule_is_processed_once(self, project_dir: Path) -> None:
+        """Test that rules shared between targets are read only once."""
+        # Arrange
+        runner = BuildRunner(load_build_manifest(project_dir / "rules-build.toml"))
+
+        # Act
+        with patch.object(
+            RuleProcessor, "read_rule_content", autospec=True,
+            side_effect=lambda self, path: path.read_text(encoding='utf-8'),
+        ) as mock_read:
+            runner.run()
+
+        # Assert
+        assert mock_read.call_count == 3
+
+    def test_failed_target_does_not_stop_others(self, project_dir: Path) -> None:
+        """Test that one failing target is reported while others build."""
+        # Arrange
+        targets = load_build_manifest(project_dir / "rules-build.toml")
+        targets[0].selected_rules = ["missing.md"]
+        runner = BuildRunner(targets)
+
+        # Act
+        summary = runner.run()
+
+        # Assert
+        assert len(summary.failed) == 1
+        assert "missing.md" in (summary.failed[0].error or "")
+        assert (project_dir / "AGENT.md").exists()
+
+    def test_unreadable_rules_directory_fails_its_targets(self, project_dir: Path) -> None:
+        """Test that a discovery OSError fails the targets of that directory only."""
+        # Arrange
+        targets = load_build_manifest(project_dir / "rules-build.toml")
+        targets[0].rules_directory = project_dir / "other-rules"
+        runner = BuildRunner(targets)
+        discover = runner._combiner.discover
+
+        def fail_other(rules_dir: Path) -> RuleCatalog:
+            if rules_dir.name == "other-rules":
+                raise PermissionError(f"Permission denied: '{rules_dir}'")
+            return discover(rules_dir)
+
+        # Act
+        with patch.object(runner._combiner, 'discover', side_effect=fail_other):
+            summary = runner.run()
+
+        # Assert
+        assert [result.target.name for result in summary.failed] == ["api"]
+        assert "Permission denied" in (summary.failed[0].error or "")
+        assert (project_dir / "AGENT.md").exists()
@@ -0,0 +1,137 @@
+"""Unit tests for the indexed RuleCatalog."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from rules_combiner.catalog import RuleCatalog
+from rules_combiner.manifest import hash_content
+from rules_combiner.models import RuleFile, SelectionMode
+from rules_combiner.selection import select_rules
+
+
+@pytest.fixture
+def rules(tmp_path: Path) -> List[RuleFile]:
+    """Create three rule files, two with identical content."""
+    contents = {"a.md": "# A\n\nSame\n", "b.md": "# B\n\nOther\n", "c.md": "# A\n\nSame\n"}
+    rules = []
+    for name, content in contents.items():
+        path = tmp_path / name
+        path.write_text(content, encoding='utf-8')
+        rules.append(RuleFile(path=path, filename=name, title=name, file_size=len(content)))
+    return rules
+
+
+class TestRuleCatalog:
+    """Test cases for RuleCatalog."""
+
+    def test_behaves_like_a_list(self, rules: List[RuleFile]) -> None:
+        """Test sequence access in discovery order."""
+        # Act
+        catalog = RuleCatalog(rules)
+
+        # Assert
+        assert len(catalog) == 3 and catalog[0] is rules[0]
+        assert list(catalog) == rules and catalog == rules
+        assert catalog[1:] == rules[1:]
+
+    def test_lookups_by_filename_and_path(self, rules: List[RuleFile]) -> None:
+        """Test constant-time lookups and membership."""
+        # Arrange
+        catalog = RuleCatalog(rules)
+
+        # Act & Assert
+        assert catalog.get("b.md") is rules[1] and catalog.get("zz.md") is None
+        assert catalog.index_of("c.md") == 2
+        assert catalog.by_path(rules[2].path) is rules[2]
+        assert "a.md" in catalog and rules[0] in catalog and "zz.md" not in catalog
+        with pytest.raises(KeyError):
+            catalog.index_of("zz.md")
+
+    def test_subset_keeps_catalog_order(self, rules: List[RuleFile]) -> None:
+        """Test that subsets follow catalog order and skip unknown names."""
+        # Arrange
+        catalog = RuleCatalog(rules)
+
+        # Act
+        subset = catalog.subset(["c.md", "zz.md", "a.md", "c.md"])
+
+        # Assert
+        assert subset == [rules[0], rules[2]]
+        assert catalog.missing(["a.md", "zz.md"]) == ["zz.md"]
+
+    def test_aggregates_and_hash_index(self, rules: List[RuleFile]) -> None:
+        """Test precomputed totals and the lazily built content-hash index."""
+        # Arrange
+        catalog = RuleCatalog(rules)
+
+        # Act
+        duplicates = catalog.by_hash(hash_content("# A\n\nSame\n"))
+
+        # Assert
+        assert catalog.total_size == sum(rule.file_size for rule in rules)
+        assert catalog.total_tokens == sum(rule.estimated_tokens for rule in rules)
+        assert duplicates == [rules[0], rules[2]]
+        assert catalog.by_hash("0" * 64) == []
+
+    def test_tag_index(self, rules: List[RuleFile]) -> None:
+        """Test tag lookups in catalog order, ignoring case."""
+        # Arrange
+        rules[0].tags = ["python"]
+        rules[1].tags = ["go", "testing"]
+        rules[2].tags = ["python", "testing"]
+        catalog = RuleCatalog(rules)
+
+        # Act
+        selected = catalog.with_tags(["Testing", "python"])
+
+        # Assert
+        assert selected == rules
+        assert catalog.with_tags(["go"]) == [rules[1]]
+        assert catalog.with_tags(["rust"]) == []
+        assert catalog.tags == {"go": 1, "python": 2, "testing": 2}
+
+    def test_lazy_caches_are_shared_between_threads(self, rules: List[RuleFile]) -> None:
+        """Test that concurrent first uses of the lazy caches agree."""
+        # Arrange
+        rules[0].tags = ["python"]
+        catalog = RuleCatalog(rules)
+
+        def query(_: int) -> tuple:
+            return (
+                catalog.tag_mask("python"),
+                catalog.glob_mask("*.md"),
+                catalog.field_mask("size", ">", 0),
+                len(catalog.by_hash(hash_content("# A\n\nSame\n"))),
+                catalog.graph is catalog.graph,
+            )
+
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = set(executor.map(query, range(32)))
+
+        # Assert
+        assert results == {(0b1, 0b111, 0b111, 2, True)}
+
+    def test_selection_stays_linear_on_large_catalogs(self, rules: List[RuleFile]) -> None:
+        """Test that selecting half of a 100k-rule catalog takes well under a second."""
+        # Arrange
+        template = rules[0]
+        catalog = RuleCatalog(
+            RuleFile(path=template.path, filename=f"rule-{i}.md", title="", file_size=4)
+            for i in range(100_000)
+        )
+        names = [f"rule-{i}.md" for i in range(0, 100_000, 2)]
+
+        # Act
+        started = time.perf_counter()
+        subset = catalog.subset(names)
+        selected = select_rules(catalog, SelectionMode.SPECIFIC, names)
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        assert len(subset) == len(selected) == 50_000
+        assert elapsed < 1.0
@@ -0,0 +1,149 @@
+"""Unit tests for shell completion backed by catalog snapshots."""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from rules_combiner.completion import (
+    complete_names,
+    complete_profiles,
+    complete_selection,
+    complete_tags,
+    load_snapshot,
+    snapshot_path,
+)
+
+
+@pytest.fixture
+def rules_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create tagged rules and point the snapshot cache into tmp_path."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "python-coding.md").write_text("---\ntags: [python]\n---\n# Python\n")
+    (rules_dir / "python-test.md").write_text("---\ntags: [python, testing]\n---\n# Tests\n")
+    (rules_dir / "go.md").write_text("# Go\n")
+    return rules_dir
+
+
+def values(items) -> list:
+    return [item.value for item in items]
+
+
+class TestLoadSnapshot:
+    """Test cases for load_snapshot."""
+
+    def test_reuses_snapshot_until_rules_change(self, rules_dir: Path) -> None:
+        """Test that discovery only runs again when the rules change."""
+        # Arrange
+        first = load_snapshot(rules_dir)
+
+        # Act
+        with patch("rules_combiner.discovery.RuleDiscoveryEngine", side_effect=AssertionError):
+            cached = load_snapshot(rules_dir)
+        (rules_dir / "rust.md").write_text("---\ntags: [rust]\n---\n# Rust\n")
+        stat = rules_dir.stat()
+        os.utime(rules_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        refreshed = load_snapshot(rules_dir)
+
+        # Assert
+        assert sorted(first.filenames) == ["go.md", "python-coding.md", "python-test.md"]
+        assert first.tags == ["python", "testing"]
+        assert cached == first
+        assert "rust.md" in refreshed.filenames and "rust" in refreshed.tags
+        assert snapshot_path(rules_dir).is_file()
+
+    def test_files_are_statted_at_most_every_recheck_interval(self, rules_dir: Path) -> None:
+        """Test that completions within the recheck interval only stat the directory."""
+        # Arrange
+        first = load_snapshot(rules_dir)
+
+        # Act
+        with patch("rules_combiner.completion.os.scandir", side_effect=AssertionError):
+            cached = load_snapshot(rules_dir)
+
+        # Assert
+        assert cached == first
+
+    def test_edited_tags_refresh_snapshot(
+        self, rules_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that editing a rule's frontmatter, which leaves the directory's mtime alone, is seen."""
+        # Arrange
+        load_snapshot(rules_dir)
+        monkeypatch.setattr("rules_combiner.completion.RECHECK_SECONDS", 0.0)
+        rule = rules_dir / "go.md"
+        dir_mtime_ns = rules_dir.stat().st_mtime_ns
+
+        # Act
+        rule.write_text("---\ntags: [golang]\n---\n# Go\n")
+        stat = rule.stat()
+        os.utime(rule, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        refreshed = load_snapshot(rules_dir)
+
+        # Assert
+        assert rules_dir.stat().st_mtime_ns == dir_mtime_ns
+        assert "golang" in refreshed.tags
+
+    def test_corrupt_snapshot_is_rebuilt(self, rules_dir: Path) -> None:
+        """Test that an unreadable snapshot is replaced."""
+        # Arrange
+        load_snapshot(rules_dir)
+        snapshot_path(rules_dir).write_text("{not json", encoding='utf-8')
+
+        # Act
+        snapshot = load_snapshot(rules_dir)
+
+        # Assert
+        assert len(snapshot.filenames) == 3
+
+
+class TestCompletions:
+    """Test cases for the click completion callbacks."""
+
+    def test_select_completes_last_term(self, rules_dir: Path) -> None:
+        """Test filenames and tag terms after list and expression separators."""
+        # Arrange
+        ctx = SimpleNamespace(params={"rules_dir": rules_dir})
+
+        # Act & Assert
+        assert sorted(values(complete_selection(ctx, None, "py"))) == [
+            "python-coding.md", "python-test.md",
+        ]
+        assert values(complete_selection(ctx, None, "go.md,python-t")) == ["go.md,python-test.md"]
+        assert values(complete_selection(ctx, None, "tag:python & !tag:t")) == [
+            "tag:python & !tag:testing",
+        ]
+        assert values(complete_selection(ctx, None, "ta")) == ["tag:python", "tag:testing"]
+
+    def test_tags_and_globs(self, rules_dir: Path) -> None:
+        """Test comma-separated tag and filename lists."""
+        # Arrange
+        ctx = SimpleNamespace(params={"rules_dir": rules_dir})
+
+        # Act & Assert
+        assert values(complete_tags(ctx, None, "python,Te")) == ["python,testing"]
+        assert values(complete_names(ctx, None, "g")) == ["go.md"]
+
+    def test_missing_directory_completes_nothing(self, tmp_path: Path) -> None:
+        """Test that completion never fails."""
+        # Arrange
+        ctx = SimpleNamespace(params={"rules_dir": tmp_path / "missing"})
+
+        # Act & Assert
+        assert complete_selection(ctx, None, "") == []
+
+    def test_profiles(self, tmp_path: Path) -> None:
+        """Test profile names from the profiles file on the command line."""
+        # Arrange
+        profiles = tmp_path / "profiles.toml"
+        profiles.write_text("[profiles.backend]\n[profiles.frontend]\n", encoding='utf-8')
+
+        # Act & Assert
+        ctx = SimpleNamespace(params={"profiles_file": profiles})
+        assert values(complete_profiles(ctx, None, "b")) == ["backend"]
+        ctx = SimpleNamespace(params={"profiles_file": tmp_path / "missing.toml"})
+        assert complete_profiles(ctx, None, "") == []
@@ -0,0 +1,146 @@
+"""Unit tests for compressed file helpers."""
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.compression import (
+    compression_for,
+    encode_content,
+    read_text,
+    rule_stem,
+    uncompressed_size,
+    write_text,
+)
+
+CONTENT = "# Compressed Rule 🚀\n\nLine one.\nLine two.\n" * 20
+
+
+class TestCompression:
+    """Test cases for compression helpers."""
+
+    @pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+    def test_write_and_read_round_trip(self, tmp_path: Path, suffix: str) -> None:
+        """Test that compressed files round-trip through write_text/read_text."""
+        # Arrange
+        path = tmp_path / f"rule.md{suffix}"
+
+        # Act
+        write_text(path, CONTENT)
+
+        # Assert
+        assert path.read_bytes() != CONTENT.encode('utf-8')
+        assert read_text(path) == CONTENT
+        assert uncompressed_size(path) == len(CONTENT.encode('utf-8'))
+
+    def test_reads_files_from_standard_tools(self, tmp_path: Path) -> None:
+        """Test reading files compressed by the standard library modules."""
+        # Arrange
+        data = CONTENT.encode('utf-8')
+        (tmp_path / "a.md.gz").write_bytes(gzip.compress(data))
+        (tmp_path / "a.md.bz2").write_bytes(bz2.compress(data))
+        (tmp_path / "a.md.xz").write_bytes(lzma.compress(data))
+
+        # Act & Assert
+        for name in ("a.md.gz", "a.md.bz2", "a.md.xz"):
+            assert read_text(tmp_path / name) == CONTENT
+
+    def test_zstd_round_trip(self, tmp_path: Path) -> None:
+        """Test zstd support when the optional package is installed."""
+        # Arrange
+        pytest.importorskip("zstandard")
+        path = tmp_path / "rule.md.zst"
+
+        # Act
+        write_text(path, CONTENT)
+
+        # Assert
+        assert read_text(path) == CONTENT
+        assert uncompressed_size(path) == len(CONTENT.encode('utf-8'))
+
+    def test_plain_files_are_untouched(self, tmp_path: Path) -> None:
+        """Test that plain files are read and written as UTF-8 text."""
+        # Arrange
+        path = tmp_path / "rule.md"
+
+        # Act
+        write_text(path, CONTENT)
+
+        # Assert
+        assert path.read_bytes() == CONTENT.encode('utf-8')
+        assert encode_content(path, CONTENT) == CONTENT.encode('utf-8')
+        assert compression_for(path) is None
+
+    def test_gzip_output_is_reproducible(self, tmp_path: Path) -> None:
+        """Test that identical content compresses to identical bytes."""
+        # Arrange
+        path = tmp_path / "AGENT.md.gz"
+
+        # Act
+        first = encode_content(path, CONTENT)
+        second = encode_content(path, CONTENT)
+
+        # Assert
+        assert first == second
+
+    def test_corrupt_file_raises_value_error(self, tmp_path: Path) -> None:
+        """Test that undecompressable or truncated content raises ValueError."""
+        # Arrange
+        names = ["bad.md.gz", "bad.md.xz", "bad.md.bz2", "truncated.md.gz", "corrupt.md.gz"]
+        for name in names[:3]:
+            (tmp_path / name).write_bytes(b"not compressed at all")
+        compressed = gzip.compress(CONTENT.encode('utf-8'))
+        (tmp_path / "truncated.md.gz").write_bytes(compressed[:len(compressed) // 2])
+        (tmp_path / "corrupt.md.gz").write_bytes(compressed[:10] + b"\xff" + compressed[11:])
+
+        # Act & Assert
+        for name in names:
+            with pytest.raises(ValueError, match="Cannot decompress"):
+                read_text(tmp_path / name)
+        with pytest.raises(ValueError, match="Cannot decompress"):
+            uncompressed_size(tmp_path / "bad.md.xz")
+
+    def test_corrupt_zstd_file_raises_value_error(self, tmp_path: Path) -> None:
+        """Test that zstd errors are reported like those of the other codecs."""
+        # Arrange
+        pytest.importorskip("zstandard")
+        path = tmp_path / "bad.md.zst"
+        path.write_bytes(b"not compressed at all")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Cannot decompress"):
+            read_text(path)
+        with pytest.raises(ValueError, match="Cannot decompress"):
+            uncompressed_size(path)
+
+    def test_uncompressed_size_of_multi_member_gzip_file(self, tmp_path: Path) -> None:
+        """Test that every gzip member is counted, not just the last one's trailer."""
+        # Arrange
+        path = tmp_path / "joined.md.gz"
+        path.write_bytes(gzip.compress(b"# Part one\n") + gzip.compress(CONTENT.encode('utf-8')))
+
+        # Act
+        size = uncompressed_size(path)
+
+        # Assert
+        assert size == len(b"# Part one\n") + len(CONTENT.encode('utf-8'))
+
+    def test_uncompressed_size_of_short_gzip_file(self, tmp_path: Path) -> None:
+        """Test that a truncated gzip file raises ValueError."""
+        # Arrange
+        path = tmp_path / "short.md.gz"
+        path.write_bytes(b"\x1f\x8b")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Cannot decompress"):
+            uncompressed_size(path)
+
+    def test_rule_stem(self) -> None:
+        """Test stripping markdown and compression suffixes."""
+        # Assert
+        assert rule_stem(Path("rules/python-coding.md.gz")) == "python-coding"
+        assert rule_stem(Path("rules/python-coding.md")) == "python-coding"
+        assert rule_stem(Path("rules/notes.md.zst")) == "notes"
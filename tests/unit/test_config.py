@@ -0,0 +1,106 @@
+"""Unit tests for TOML configuration loading."""
+
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.config import load_combination_config
+from rules_combiner.models import SelectionMode
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    """Create a project directory with an empty rules folder."""
+    (tmp_path / "rules").mkdir()
+    return tmp_path
+
+
+class TestLoadCombinationConfig:
+    """Test cases for load_combination_config."""
+
+    def test_load_specific_selection(self, project_dir: Path) -> None:
+        """Test loading a config that names specific rules."""
+        # Arrange
+        config_path = project_dir / "combine.toml"
+        config_path.write_text(
+            'rules_directory = "rules"\n'
+            'output_file = "out/AGENT.md"\n'
+            'selected_rules = ["b.md", "a.md"]\n'
+            'include_toc = false\n'
+        )
+
+        # Act
+        config = load_combination_config(config_path)
+
+        # Assert
+        assert config.rules_directory == project_dir / "rules"
+        assert config.output_file == project_dir / "out" / "AGENT.md"
+        assert config.selected_rules == ["b.md", "a.md"]
+        assert config.include_toc is False
+        assert config.backup_existing is True
+        assert config.selection_mode is SelectionMode.SPECIFIC
+
+    def test_load_all_selection(self, project_dir: Path) -> None:
+        """Test that selected_rules = "all" selects every rule."""
+        # Arrange
+        config_path = project_dir / "combine.toml"
+        config_path.write_text('selected_rules = "all"\n')
+
+        # Act
+        config = load_combination_config(config_path)
+
+        # Assert
+        assert config.selection_mode is SelectionMode.ALL
+        assert config.selected_rules == []
+
+    def test_load_glob_selection_without_manifest(self, project_dir: Path) -> None:
+        """Test that select_glob alone is a valid selection and manifest can be disabled."""
+        # Arrange
+        config_path = project_dir / "combine.toml"
+        config_path.write_text('select_glob = "python-*.md"\nmanifest = false\ntoken_budget = 8000\n')
+
+        # Act
+        config = load_combination_config(config_path)
+
+        # Assert
+        assert config.selected_patterns == ["python-*.md"]
+        assert config.selected_rules == []
+        assert config.embed_manifest is False
+        assert config.token_budget == 8000
+
+    @pytest.mark.parametrize("content", [
+        'selected_rules = 5\n',
+        'selected_rules = ["a.md", 5]\n',
+        'selected_rules = ["a.md"]\nrules_directory = 5\n',
+        'selected_rules = ["a.md"]\noutput_file = ["AGENT.md"]\n',
+        'select_glob = 5\n',
+        'select_tags = ["python", 1]\n',
+        'selected_rules = []\n',
+        'selected_rules = ["a.md"]\nselection_mode = "interactive"\n',
+        'selected_rules = ["a.md"]\nrules_directory = "missing"\n',
+        'selected_rules = ["a.md"]\ntoken_budget = 0\n',
+        'not valid toml = = \n',
+    ])
+    def test_invalid_configs_raise_value_error(self, project_dir: Path, content: str) -> None:
+        """Test that malformed configs raise ValueError."""
+        # Arrange
+        config_path = project_dir / "combine.toml"
+        config_path.write_text(content)
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            load_combination_config(config_path)
+
+    def test_load_expression_selection(self, project_dir: Path) -> None:
+        """Test that a selected_rules string other than "all" is an expression."""
+        # Arrange
+        config_path = project_dir / "combine.toml"
+        config_path.write_text('selected_rules = "tag:python & tokens<2000"\n')
+
+        # Act
+        config = load_combination_config(config_path)
+
+        # Assert
+        assert config.selection_mode is SelectionMode.SPECIFIC
+        assert config.selection_expression == "tag:python & tokens<2000"
+        assert config.selected_rules == []
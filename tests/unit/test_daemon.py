@@ -0,0 +1,149 @@
+"""Unit tests for the warm-cache daemon and its client."""
+
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from rules_combiner.daemon import DaemonClient, RulesDaemon
+from rules_combiner.manifest import StalenessChecker
+
+
+@pytest.fixture
+def rules_dir(tmp_path: Path) -> Path:
+    """Create a rules directory with two rule files."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "first.md").write_text("# First Rule\n\nContent 1\n", encoding='utf-8')
+    (rules_dir / "second.md").write_text("# Second Rule\n\nContent 2\n", encoding='utf-8')
+    return rules_dir
+
+
+@pytest.fixture
+def client() -> Iterator[DaemonClient]:
+    """Run a daemon on a short socket path and yield a client for it."""
+    # Unix socket paths are limited to ~100 bytes, too short for tmp_path
+    socket_dir = tempfile.mkdtemp(prefix="rc-")
+    socket_path = Path(socket_dir) / "d.sock"
+    daemon = RulesDaemon(socket_path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    assert daemon.wait_until_ready(timeout=5)
+
+    yield DaemonClient(socket_path, timeout=5)
+
+    daemon.shutdown()
+    thread.join(timeout=5)
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+class TestRulesDaemon:
+    """Test cases for requests served over the socket."""
+
+    def test_ping_and_list(self, client: DaemonClient, rules_dir: Path) -> None:
+        """Test that the daemon answers ping and lists discovered rules."""
+        # Act
+        ping = client.request("ping")
+        listing = client.request("list", rules_dir=str(rules_dir))
+
+        # Assert
+        assert ping["ok"] and ping["pid"] == os.getpid()
+        assert sorted(rule["filename"] for rule in listing["rules"]) == ["first.md", "second.md"]
+
+    def test_select_resolves_globs(self, client: DaemonClient, rules_dir: Path) -> None:
+        """Test that select returns the filenames a selection resolves to."""
+        # Act
+        response = client.request("select", rules_dir=str(rules_dir), select_glob=["sec*.md"])
+
+        # Assert
+        assert response == {"ok": True, "rules": ["second.md"]}
+
+    def test_generate_writes_verifiable_output(
+        self, client: DaemonClient, rules_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test that generate writes an output with a fresh manifest."""
+        # Arrange
+        output = tmp_path / "AGENT.md"
+
+        # Act
+        response = client.request(
+            "generate", rules_dir=str(rules_dir), output=str(output),
+            select=["second.md", "first.md"], backup=False,
+        )
+
+        # Assert
+        content = output.read_text(encoding='utf-8')
+        assert response["ok"] and response["rules"] == ["second.md", "first.md"]
+        assert response["output_size"] == len(content.encode('utf-8'))
+        assert content.index("Second Rule") < content.index("Content 1")
+        assert StalenessChecker(output).verify().fresh
+
+    def test_repeated_generate_reuses_caches(
+        self, client: DaemonClient, rules_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test that a second identical request hits the caches and writes nothing."""
+        # Arrange
+        request = {
+            "rules_dir": str(rules_dir), "output": str(tmp_path / "AGENT.md"),
+            "all": True, "backup": False,
+        }
+        client.request("generate", **request)
+
+        # Act
+        response = client.request("generate", **request)
+        stats = client.request("stats")
+
+        # Assert
+        assert response["write_mode"] == "unchanged"
+        assert stats["discoveries"] == 1
+        assert stats["sections_processed"] == 2
+        assert stats["section_hits"] == 2
+
+    def test_request_errors_are_reported(self, client: DaemonClient, rules_dir: Path) -> None:
+        """Test that bad requests get an error response and the daemon keeps serving."""
+        # Act
+        unknown = client.request("explode")
+        relative = client.request("list", rules_dir="rules")
+        missing = client.request("select", rules_dir=str(rules_dir), select=["nope.md"])
+        malformed = client.request("select", rules_dir=str(rules_dir), select=5)
+        not_a_path = client.request("list", rules_dir=5)
+
+        # Assert
+        assert unknown == {"ok": False, "error": "Unknown command: 'explode'"}
+        assert "absolute path" in relative["error"]
+        assert "nope.md" in missing["error"]
+        assert malformed == {"ok": False, "error": "'select' must be a list of strings"}
+        assert not_a_path == {"ok": False, "error": "'rules_dir' must be a string"}
+        assert client.request("ping")["ok"]
+
+    def test_unexpected_errors_are_reported(self, tmp_path: Path) -> None:
+        """Test that an unexpected exception becomes an error response."""
+        # Arrange
+        daemon = RulesDaemon(tmp_path / "d.sock")
+
+        # Act
+        with patch.object(daemon, '_list', side_effect=KeyError("boom")):
+            response = daemon.handle({"command": "list", "rules_dir": str(tmp_path)})
+
+        # Assert
+        assert response == {"ok": False, "error": "Internal error: 'boom'"}
+
+
+class TestDaemonClient:
+    """Test cases for the DaemonClient."""
+
+    def test_is_running_without_daemon(self, tmp_path: Path) -> None:
+        """Test that a missing socket is reported as not running."""
+        # Act & Assert
+        assert not DaemonClient(tmp_path / "none.sock").is_running()
+
+    def test_request_without_daemon_raises_os_error(self, tmp_path: Path) -> None:
+        """Test that requests fail with OSError when nothing is listening."""
+        # Act & Assert
+        with pytest.raises(OSError):
+            DaemonClient(tmp_path / "none.sock").request("ping")
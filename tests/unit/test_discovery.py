@@ -4,7 +4,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from rules_combiner.discovery import RuleDiscoveryEngine
+from rules_combiner.discovery import MAX_TITLE_LINES, RuleDiscoveryEngine
 from rules_combiner.models import RuleFile
 
 
@@ -141,7 +141,7 @@ class TestRuleDiscoveryEngine:
         engine = RuleDiscoveryEngine(rules_dir)
         
         # Act
-        with patch('pathlib.Path.read_text', side_effect=PermissionError("Access denied")):
+        with patch('pathlib.Path.open', side_effect=PermissionError("Access denied")):
             result = engine.validate_rule_file(test_file)
         
         # Assert
@@ -206,7 +206,7 @@ class TestRuleDiscoveryEngine:
         engine = RuleDiscoveryEngine(rules_dir)
         
         # Act
-        with patch('pathlib.Path.read_text', side_effect=UnicodeDecodeError('utf-8', b'', 0, 1, 'invalid')):
+        with patch('pathlib.Path.open', side_effect=UnicodeDecodeError('utf-8', b'', 0, 1, 'invalid')):
             title = engine.extract_title(test_file)
         
         # Assert
@@ -228,3 +228,134 @@ class TestRuleDiscoveryEngine:
         assert len(rules) == 1
         assert rules[0].title == "Valid Rule"
         assert rules[0].filename == "valid.md"
+
+    def test_discover_rules_with_compressed_files(self, tmp_path: Path) -> None:
+        """Test that compressed rule files are discovered with their titles."""
+        # Arrange
+        import gzip
+        import lzma
+
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        content = "# Packed Rule\n\n" + "Guideline text.\n" * 100
+        (rules_dir / "packed.md.gz").write_bytes(gzip.compress(content.encode('utf-8')))
+        (rules_dir / "untitled.md.xz").write_bytes(lzma.compress(b"No header here."))
+        (rules_dir / "plain.md").write_text("# Plain Rule\nContent.")
+
+        engine = RuleDiscoveryEngine(rules_dir)
+
+        # Act
+        rules = {rule.filename: rule for rule in engine.discover_rules()}
+
+        # Assert
+        assert set(rules) == {"packed.md.gz", "untitled.md.xz", "plain.md"}
+        assert rules["packed.md.gz"].title == "Packed Rule"
+        assert rules["packed.md.gz"].file_size == len(content.encode('utf-8'))
+        assert rules["untitled.md.xz"].title == "untitled"
+
+    def test_discover_rules_skips_corrupt_compressed_file(self, tmp_path: Path) -> None:
+        """Test that a corrupt compressed file is skipped."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "broken.md.gz").write_bytes(b"not gzip data")
+        (rules_dir / "valid.md").write_text("# Valid Rule\nContent.")
+
+        engine = RuleDiscoveryEngine(rules_dir)
+
+        # Act
+        rules = engine.discover_rules()
+
+        # Assert
+        assert [rule.filename for rule in rules] == ["valid.md"]
+
+    def test_iter_rules_skips_title_extraction_for_unrequested_fields(self, tmp_path: Path) -> None:
+        """Test that projecting onto filename and size never reads titles."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "valid.md").write_text("# Valid Rule\nContent.")
+
+        engine = RuleDiscoveryEngine(rules_dir)
+
+        # Act
+        with patch.object(engine, 'extract_header') as extract_header:
+            rules = list(engine.iter_rules(["filename", "size"]))
+
+        # Assert
+        extract_header.assert_not_called()
+        assert [rule.filename for rule in rules] == ["valid.md"]
+        assert rules[0].title == "valid"
+        assert rules[0].file_size == len("# Valid Rule\nContent.")
+
+    def test_iter_rules_rejects_unknown_fields(self, tmp_path: Path) -> None:
+        """Test that requesting an unknown field raises ValueError."""
+        # Arrange
+        engine = RuleDiscoveryEngine(tmp_path)
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="colour"):
+            list(engine.iter_rules(["filename", "colour"]))
+
+    def test_discover_catalog_indexes_rules(self, tmp_path: Path) -> None:
+        """Test that discover_catalog returns an indexed catalog with totals."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "one.md").write_text("# One\n" + "x" * 40)
+        (rules_dir / "two.md").write_text("# Two\n" + "y" * 80)
+
+        engine = RuleDiscoveryEngine(rules_dir)
+
+        # Act
+        catalog = engine.discover_catalog()
+
+        # Assert
+        assert len(catalog) == 2
+        assert catalog.get("two.md").title == "Two"
+        assert catalog.total_size == 46 + 86
+
+    def test_discover_rules_reads_frontmatter(self, tmp_path: Path) -> None:
+        """Test that frontmatter metadata is attached and comments are not titles."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "tagged.md").write_text(
+            "---\n# rule metadata\ntags: [Python, testing]\npriority: 5\n"
+            "applies-to: ['*.py']\ndescription: Test conventions\n---\n# Tagged Rule\n"
+        )
+        (rules_dir / "plain.md").write_text("# Plain Rule\n")
+
+        engine = RuleDiscoveryEngine(rules_dir)
+
+        # Act
+        catalog = engine.discover_catalog()
+
+        # Assert
+        tagged = catalog.get("tagged.md")
+        assert tagged.title == "Tagged Rule"
+        assert tagged.tags == ["python", "testing"]
+        assert (tagged.priority, tagged.applies_to) == (5, ["*.py"])
+        assert tagged.description == "Test conventions"
+        assert catalog.get("plain.md").tags == []
+        assert catalog.with_tags(["testing"]) == [tagged]
+
+    def test_discover_rules_reads_only_the_head(self, tmp_path: Path) -> None:
+        """Test that discovery never reads a plain rule past its frontmatter and title."""
+        # Arrange
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        body = "---\ntags: [python]\n---\n# Big Rule\n" + "line\n" * 100_000 + "\udcff"
+        (rules_dir / "big.md").write_text(body, encoding='utf-8', errors='surrogateescape')
+        late_title = "intro\n" * (MAX_TITLE_LINES + 1) + "# Late Title\n"
+        (rules_dir / "late.md").write_text(late_title, encoding='utf-8')
+
+        engine = RuleDiscoveryEngine(rules_dir)
+
+        # Act: the undecodable byte at the end of big.md is never reached
+        catalog = engine.discover_catalog()
+
+        # Assert
+        assert catalog.get("big.md").title == "Big Rule"
+        assert catalog.get("big.md").tags == ["python"]
+        assert catalog.get("late.md").title == "late"
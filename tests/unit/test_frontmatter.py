@@ -0,0 +1,135 @@
+"""Unit tests for rule frontmatter parsing."""
+
+from rules_combiner.frontmatter import (
+    MAX_FRONTMATTER_LINES,
+    Frontmatter,
+    read_frontmatter,
+    split_frontmatter,
+)
+
+
+class TestReadFrontmatter:
+    """Test cases for read_frontmatter."""
+
+    def test_parses_known_keys(self) -> None:
+        """Test inline lists, block lists, quotes and comments."""
+        # Arrange
+        lines = [
+            "---\n",
+            "# Metadata for the rule\n",
+            "tags: [Python, 'testing']  # lowercased\n",
+            "priority: 10\n",
+            "applies_to:\n",
+            "  - \"*.py\"\n",
+            "  - tests/**\n",
+            "description: Conventions for pytest suites\n",
+            "owner: platform\n",
+            "---\n",
+            "# Python Testing\n",
+        ]
+
+        # Act
+        metadata, rest = read_frontmatter(lines)
+
+        # Assert
+        assert metadata == Frontmatter(
+            tags=["python", "testing"],
+            priority=10,
+            applies_to=["*.py", "tests/**"],
+            description="Conventions for pytest suites",
+        )
+        assert list(rest) == ["# Python Testing\n"]
+
+    def test_parses_dependencies(self) -> None:
+        """Test that requires and after accept inline, block and plain lists."""
+        # Arrange
+        lines = [
+            "---\n",
+            "requires: [python-coding.md, 'python-style.md']\n",
+            "after:\n",
+            "  - git.md\n",
+            "---\n",
+        ]
+
+        # Act
+        metadata, _ = read_frontmatter(lines)
+
+        # Assert
+        assert metadata.requires == ["python-coding.md", "python-style.md"]
+        assert metadata.after == ["git.md"]
+        assert split_frontmatter("---\nafter: a.md, b.md\n---\n")[0].after == ["a.md", "b.md"]
+
+    def test_without_block_returns_every_line(self) -> None:
+        """Test that files without frontmatter are passed through untouched."""
+        # Act
+        metadata, rest = read_frontmatter(["# Title\n", "---\n", "Body\n"])
+
+        # Assert
+        assert metadata == Frontmatter()
+        assert list(rest) == ["# Title\n", "---\n", "Body\n"]
+
+    def test_unclosed_block_is_content(self) -> None:
+        """Test that the read stays bounded and an unclosed block is not metadata."""
+        # Arrange
+        lines = ["---\n"] + [f"line {i}\n" for i in range(MAX_FRONTMATTER_LINES + 10)]
+        consumed = []
+
+        def stream():
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        # Act
+        metadata, rest = read_frontmatter(stream())
+        consumed_before_rest = len(consumed)
+
+        # Assert
+        assert metadata == Frontmatter()
+        assert consumed_before_rest == MAX_FRONTMATTER_LINES + 1
+        assert list(rest) == lines
+
+    def test_reports_unusable_values(self) -> None:
+        """Test that a bad value is ignored and described in errors."""
+        # Act
+        metadata, _ = read_frontmatter(["---", "tags: go", "priority: high", "---"])
+
+        # Assert
+        assert metadata.tags == ["go"]
+        assert metadata.priority == 0
+        assert metadata.errors == ["priority must be an integer, not 'high'"]
+
+    def test_block_that_is_not_metadata_is_content(self) -> None:
+        """Test that blocks with unparseable lines or no known key are kept."""
+        for lines in (
+            ["---", "tags: go", "not a pair", "---", "Body"],
+            ["---", "- item", "---", "Body"],
+            ["---", "owner: platform", "---", "Body"],
+            ["---", "---", "Body"],
+        ):
+            # Act
+            metadata, rest = read_frontmatter(lines)
+
+            # Assert
+            assert metadata == Frontmatter()
+            assert list(rest) == lines
+
+
+class TestSplitFrontmatter:
+    """Test cases for split_frontmatter."""
+
+    def test_strips_block_and_blank_lines(self) -> None:
+        """Test that the body starts at the first line after the block."""
+        # Act
+        metadata, body = split_frontmatter("---\ntags: a, b\n---\n\n# Title\n\nText\n")
+
+        # Assert
+        assert metadata.tags == ["a", "b"]
+        assert body == "# Title\n\nText\n"
+
+    def test_content_without_block_is_unchanged(self) -> None:
+        """Test that leading blank lines are kept when there is no block."""
+        # Act
+        _, body = split_frontmatter("\n# Title\n")
+
+        # Assert
+        assert body == "\n# Title\n"
@@ -0,0 +1,142 @@
+"""Unit tests for the rule dependency graph."""
+
+import re
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from rules_combiner.catalog import RuleCatalog
+from rules_combiner.models import RuleFile
+
+
+def make_catalog(tmp_path: Path, specs: Dict[str, Dict[str, List[str]]]) -> RuleCatalog:
+    """Create a catalog whose rules declare the given requires/after lists."""
+    rules = []
+    for name, dependencies in specs.items():
+        path = tmp_path / name
+        path.write_text(f"# {name}\n", encoding='utf-8')
+        rules.append(RuleFile(
+            path, name, name,
+            requires=dependencies.get("requires", []),
+            after=dependencies.get("after", []),
+        ))
+    return RuleCatalog(rules)
+
+
+def names(rules: List[RuleFile]) -> List[str]:
+    return [rule.filename for rule in rules]
+
+
+class TestDependencyGraph:
+    """Test cases for DependencyGraph."""
+
+    def test_without_dependencies_keeps_order(self, tmp_path: Path) -> None:
+        """Test that catalogs without dependencies are passed through."""
+        # Arrange
+        catalog = make_catalog(tmp_path, {"a.md": {}, "b.md": {}, "c.md": {}})
+
+        # Act
+        resolved = catalog.graph.resolve([catalog[2], catalog[0]])
+
+        # Assert
+        assert not catalog.graph.has_dependencies
+        assert names(resolved) == ["c.md", "a.md"]
+
+    def test_transitive_prerequisites(self, tmp_path: Path) -> None:
+        """Test that requirements are followed transitively and cached."""
+        # Arrange
+        catalog = make_catalog(tmp_path, {
+            "base.md": {},
+            "python.md": {"requires": ["base.md"]},
+            "python-test.md": {"requires": ["python.md"]},
+            "other.md": {},
+        })
+
+        # Act
+        prerequisites = catalog.graph.prerequisites("python-test.md")
+
+        # Assert
+        assert names(prerequisites) == ["base.md", "python.md"]
+        assert catalog.graph is catalog.graph
+
+    def test_resolve_adds_prerequisites_first(self, tmp_path: Path) -> None:
+        """Test that prerequisites are added and each rule follows its own."""
+        # Arrange
+        catalog = make_catalog(tmp_path, {
+            "base.md": {},
+            "python.md": {"requires": ["base.md"]},
+            "python-test.md": {"requires": ["python.md"]},
+            "other.md": {},
+        })
+
+        # Act
+        resolved = catalog.graph.resolve([catalog[3], catalog[2]])
+
+        # Assert
+        assert names(resolved) == ["other.md", "base.md", "python.md", "python-test.md"]
+
+    def test_after_only_orders_selected_rules(self, tmp_path: Path) -> None:
+        """Test that after reorders selected rules without adding any."""
+        # Arrange
+        catalog = make_catalog(tmp_path, {
+            "a.md": {"after": ["c.md"]},
+            "b.md": {},
+            "c.md": {},
+        })
+
+        # Act
+        without_c = catalog.graph.resolve([catalog[0], catalog[1]])
+        with_c = catalog.graph.resolve(list(catalog))
+
+        # Assert
+        assert names(without_c) == ["a.md", "b.md"]
+        assert names(with_c) == ["b.md", "c.md", "a.md"]
+
+    def test_cycle_is_reported(self, tmp_path: Path) -> None:
+        """Test that requires and after cycles name the rules involved."""
+        # Arrange
+        catalog = make_catalog(tmp_path, {
+            "a.md": {"requires": ["b.md"]},
+            "b.md": {"requires": ["a.md"]},
+            "c.md": {"after": ["d.md"]},
+            "d.md": {"after": ["c.md"]},
+            "e.md": {},
+        })
+
+        # Act & Assert
+        with pytest.raises(ValueError, match=re.escape("a.md -> b.md -> a.md")):
+            catalog.graph.resolve([catalog[0]])
+        with pytest.raises(ValueError, match=re.escape("c.md -> d.md -> c.md")):
+            catalog.graph.resolve([catalog[2], catalog[3]])
+        assert names(catalog.graph.resolve([catalog[4], catalog[2]])) == ["e.md", "c.md"]
+
+    def test_missing_requirement_fails_only_when_selected(self, tmp_path: Path) -> None:
+        """Test that an unknown required rule is an error for its dependents only."""
+        # Arrange
+        catalog = make_catalog(tmp_path, {
+            "a.md": {"requires": ["gone.md"]},
+            "b.md": {"after": ["gone.md"]},
+        })
+
+        # Act & Assert
+        assert names(catalog.graph.resolve([catalog[1]])) == ["b.md"]
+        with pytest.raises(ValueError, match="a.md requires 'gone.md'"):
+            catalog.graph.resolve([catalog[0]])
+
+    def test_long_chain(self, tmp_path: Path) -> None:
+        """Test that deep requirement chains resolve without recursion."""
+        # Arrange
+        path = tmp_path / "rule.md"
+        path.write_text("x", encoding='utf-8')
+        count = 5000
+        catalog = RuleCatalog(
+            RuleFile(path, f"{i}.md", str(i), requires=[f"{i - 1}.md"] if i else [])
+            for i in range(count)
+        )
+
+        # Act
+        resolved = catalog.graph.resolve([catalog[count - 1]])
+
+        # Assert
+        assert names(resolved) == [f"{i}.md" for i in range(count)]
@@ -0,0 +1,142 @@
+"""Unit tests for OutputHistory."""
+
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.history import OutputHistory
+
+
+def _make_revision(i: int) -> str:
+    """Build a large document where only one line changes per revision."""
+    lines = [f"Line {n}: some rule text that stays the same." for n in range(500)]
+    lines[i % 500] = f"Line {i % 500}: edited in revision {i}."
+    return "\n".join(lines) + "\n"
+
+
+class TestOutputHistory:
+    """Test cases for OutputHistory."""
+
+    def test_list_revisions_without_history(self, tmp_path: Path) -> None:
+        """Test that a fresh history has no revisions."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md")
+
+        # Act
+        revisions = history.list_revisions()
+
+        # Assert
+        assert revisions == []
+
+    def test_first_revision_is_full_and_later_are_deltas(self, tmp_path: Path) -> None:
+        """Test that only the first revision is stored in full."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md")
+
+        # Act
+        history.record("# Rules\n\nFirst version.\n")
+        history.record("# Rules\n\nSecond version.\n")
+
+        # Assert
+        kinds = [revision.kind for revision in history.list_revisions()]
+        assert kinds == ["full", "delta"]
+
+    def test_record_skips_unchanged_content(self, tmp_path: Path) -> None:
+        """Test that recording identical content is a no-op."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md")
+        history.record("# Rules\n")
+
+        # Act
+        revision = history.record("# Rules\n")
+
+        # Assert
+        assert revision is None
+        assert len(history.list_revisions()) == 1
+
+    def test_get_content_round_trips_every_revision(self, tmp_path: Path) -> None:
+        """Test that every revision reconstructs byte-for-byte."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md", keyframe_interval=4)
+        versions = [_make_revision(i) for i in range(10)]
+        versions.append("")  # Emptied file
+        versions.append("no trailing newline")
+        for content in versions:
+            history.record(content)
+
+        # Act & Assert
+        for number, expected in enumerate(versions, 1):
+            assert history.get_content(number) == expected
+
+    def test_deltas_are_small_relative_to_full_copy(self, tmp_path: Path) -> None:
+        """Test that storing many revisions stays compact."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md", keyframe_interval=1000)
+
+        # Act
+        for i in range(100):
+            history.record(_make_revision(i))
+
+        # Assert
+        revisions = history.list_revisions()
+        full_size = revisions[0].content_size
+        delta_size = sum(revision.stored_size for revision in revisions[1:])
+        assert delta_size < full_size
+
+    def test_get_content_with_invalid_number(self, tmp_path: Path) -> None:
+        """Test that unknown revisions raise ValueError."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md")
+        history.record("# Rules\n")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            history.get_content(2)
+
+        with pytest.raises(ValueError):
+            history.get_content(0)
+
+    def test_diff_between_revisions(self, tmp_path: Path) -> None:
+        """Test producing a unified diff between two revisions."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md")
+        history.record("# Rules\n\nold line\n")
+        history.record("# Rules\n\nnew line\n")
+
+        # Act
+        diff_text = history.diff(1, 2)
+
+        # Assert
+        assert "-old line" in diff_text
+        assert "+new line" in diff_text
+        assert history.diff(1, 1) == ""
+
+    def test_record_file_and_restore(self, tmp_path: Path) -> None:
+        """Test recording the output file and restoring an older revision."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        history = OutputHistory(output_path)
+        output_path.write_text("# Version 1\n", encoding='utf-8')
+        history.record_file()
+        output_path.write_text("# Version 2\n", encoding='utf-8')
+        history.record_file()
+
+        # Act
+        revision = history.restore(1)
+
+        # Assert
+        assert output_path.read_text(encoding='utf-8') == "# Version 1\n"
+        assert revision is not None
+        assert revision.number == 3
+
+    def test_record_file_when_output_missing(self, tmp_path: Path) -> None:
+        """Test that a missing output file records nothing."""
+        # Arrange
+        history = OutputHistory(tmp_path / "AGENT.md")
+
+        # Act
+        revision = history.record_file()
+
+        # Assert
+        assert revision is None
+        assert not history.history_dir.exists()
@@ -0,0 +1,214 @@
+"""Unit tests for the source manifest and StalenessChecker."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.api import Combiner
+from rules_combiner.manifest import (
+    SourceEntry,
+    SourceManifest,
+    StalenessChecker,
+)
+from rules_combiner.models import CombinationConfig
+
+
+@pytest.fixture
+def generated_output(tmp_path: Path) -> Path:
+    """Create two rule files and an output embedding their manifest."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    manifest = SourceManifest(options={"include_toc": True, "tool_version": "0.1.0"})
+    for name in ("a.md", "b.md"):
+        rule_path = rules_dir / name
+        content = f"# Rule {name}\n\nBody of {name}.\n"
+        rule_path.write_text(content, encoding='utf-8')
+        manifest.sources.append(SourceEntry.from_content(rule_path, content, tmp_path))
+
+    output_path = tmp_path / "AGENT.md"
+    output_path.write_text(manifest.embed("# Combined\n\nBody.\n"), encoding='utf-8')
+    return output_path
+
+
+class TestSourceManifest:
+    """Test cases for SourceManifest."""
+
+    def test_comment_round_trip(self, tmp_path: Path) -> None:
+        """Test that a manifest survives serialization to a comment."""
+        # Arrange
+        manifest = SourceManifest(
+            sources=[SourceEntry("rules/a-->b.md", 10, 123, "abc")],
+            options={"include_toc": False},
+        )
+
+        # Act
+        comment = manifest.to_comment()
+        parsed = SourceManifest.from_comment(comment)
+
+        # Assert
+        assert "-->" not in comment[:-len(" -->\n")]
+        assert parsed == manifest
+
+    def test_from_comment_without_manifest(self) -> None:
+        """Test that text without a manifest raises ValueError."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            SourceManifest.from_comment("# Just markdown")
+
+    def test_from_output_reads_embedded_manifest(self, generated_output: Path) -> None:
+        """Test reading the manifest from the end of an output file."""
+        # Act
+        manifest = SourceManifest.from_output(generated_output)
+
+        # Assert
+        assert manifest is not None
+        assert [entry.path for entry in manifest.sources] == ["rules/a.md", "rules/b.md"]
+        assert manifest.options["include_toc"] is True
+
+    def test_from_output_without_manifest(self, tmp_path: Path) -> None:
+        """Test that outputs without a manifest return None."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        output_path.write_text("# No manifest here\n")
+
+        # Act & Assert
+        assert SourceManifest.from_output(output_path) is None
+
+
+class TestStalenessChecker:
+    """Test cases for StalenessChecker."""
+
+    def test_verify_fresh_output_without_hashing(self, generated_output: Path) -> None:
+        """Test that untouched sources are verified by stat alone."""
+        # Act
+        result = StalenessChecker(generated_output, tool_version="0.1.0").verify()
+
+        # Assert
+        assert result.fresh is True
+        assert result.checked == 2
+        assert result.hashed == 0
+
+    def test_verify_touched_source_is_hashed_but_fresh(self, generated_output: Path) -> None:
+        """Test that a metadata-only change triggers a hash but stays fresh."""
+        # Arrange
+        rule_path = generated_output.parent / "rules" / "a.md"
+        stat = rule_path.stat()
+        os.utime(rule_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        # Act
+        result = StalenessChecker(generated_output).verify()
+
+        # Assert
+        assert result.fresh is True
+        assert result.hashed == 1
+
+    def test_verify_modified_source_is_stale(self, generated_output: Path) -> None:
+        """Test that changed source content marks the output stale."""
+        # Arrange
+        rule_path = generated_output.parent / "rules" / "b.md"
+        rule_path.write_text("# Rule b.md\n\nChanged body.\n", encoding='utf-8')
+
+        # Act
+        result = StalenessChecker(generated_output).verify()
+
+        # Assert
+        assert result.fresh is False
+        assert result.stale_sources == ["rules/b.md"]
+
+    def test_verify_deleted_source_is_stale(self, generated_output: Path) -> None:
+        """Test that a missing source marks the output stale."""
+        # Arrange
+        (generated_output.parent / "rules" / "a.md").unlink()
+
+        # Act
+        result = StalenessChecker(generated_output).verify()
+
+        # Assert
+        assert result.fresh is False
+        assert result.stale_sources == ["rules/a.md"]
+
+    def test_verify_edited_output_is_stale(self, generated_output: Path) -> None:
+        """Test that hand edits to the output body are detected."""
+        # Arrange
+        content = generated_output.read_text(encoding='utf-8')
+        generated_output.write_text("Edited.\n" + content, encoding='utf-8')
+
+        # Act
+        result = StalenessChecker(generated_output).verify()
+
+        # Assert
+        assert result.fresh is False
+
+    def test_verify_different_tool_version_is_stale(self, generated_output: Path) -> None:
+        """Test that outputs from another tool version are stale."""
+        # Act
+        result = StalenessChecker(generated_output, tool_version="9.9.9").verify()
+
+        # Assert
+        assert result.fresh is False
+
+    def test_verify_missing_output(self, tmp_path: Path) -> None:
+        """Test verifying an output that does not exist."""
+        # Act
+        result = StalenessChecker(tmp_path / "AGENT.md").verify()
+
+        # Assert
+        assert result.fresh is False
+        assert result.reason is not None
+
+    @pytest.mark.parametrize("new_rule, fresh", [("a-extra.md", False), ("c.md", True)])
+    def test_verify_checks_rules_added_to_the_directory(
+        self, tmp_path: Path, new_rule: str, fresh: bool
+    ) -> None:
+        """Test that a new rule matching the recorded selection makes the output stale."""
+        # Arrange
+        output = _generate(tmp_path, selected_patterns=["a*.md"])
+        rules_dir = tmp_path / "rules"
+        (rules_dir / new_rule).write_text("# New\n", encoding='utf-8')
+        _bump_mtime(rules_dir)
+
+        # Act
+        result = StalenessChecker(output).verify()
+
+        # Assert
+        assert result.fresh is fresh
+        if not fresh:
+            assert result.reason == "Rules matching the selection changed"
+
+    def test_verify_checks_tags_of_unselected_rules(self, tmp_path: Path) -> None:
+        """Test that an unselected rule gaining a selected tag makes the output stale."""
+        # Arrange
+        output = _generate(tmp_path, selected_tags=["python"])
+        rule_path = tmp_path / "rules" / "b.md"
+        rule_path.write_text("---\ntags: [python]\n---\n# Rule b.md\n", encoding='utf-8')
+        _bump_mtime(rule_path)
+
+        # Act
+        result = StalenessChecker(output).verify()
+
+        # Assert
+        assert result.fresh is False
+        assert result.stale_sources == []
+
+
+def _generate(tmp_path: Path, **selection: list) -> Path:
+    """Write rules a.md (tagged python) and b.md, and combine a selection of them."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "a.md").write_text("---\ntags: [python]\n---\n# Rule a.md\n", encoding='utf-8')
+    (rules_dir / "b.md").write_text("# Rule b.md\n", encoding='utf-8')
+    config = CombinationConfig(
+        rules_directory=rules_dir, output_file=tmp_path / "AGENT.md", selected_rules=[],
+        backup_existing=False, **selection,
+    )
+    combiner = Combiner()
+    combiner.write(config, combiner.combine(config))
+    return config.output_file
+
+
+def _bump_mtime(path: Path) -> None:
+    """Move a path's modification time forward so the change is visible."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
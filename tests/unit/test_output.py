@@ -5,7 +5,26 @@ from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
-from rules_combiner.output import OutputGenerator
+from rules_combiner.output import OutputGenerator, SpooledOutputWriter
+from rules_combiner.processor import RuleProcessor
+
+
+def _build_output(bodies: dict[str, str]) -> str:
+    """Build marked-up combined output the way the CLI does."""
+    processor = RuleProcessor()
+    parts = []
+    for name, body in bodies.items():
+        section = processor.format_rule_section(body, name)
+        parts.append(processor.format_section_marker(name, section) + section)
+    return "\n".join(parts)
+
+
+def _sample_bodies(count: int = 20) -> dict[str, str]:
+    """Create section bodies large enough for patching to be worthwhile."""
+    return {
+        f"rule{i:02d}.md": f"# Rule {i}\n\n" + f"Guideline {i} text.\n" * 50
+        for i in range(count)
+    }
 
 
 class TestOutputGenerator:
@@ -230,3 +249,188 @@ class TestOutputGenerator:
         # The logger functionality is tested indirectly through the other methods
         assert generator._output_path == output_path
         assert hasattr(generator, '_logger')
+
+    def test_write_incremental_creates_new_file(self, tmp_path: Path) -> None:
+        """Test that a missing output is written in full."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        generator = OutputGenerator(output_path)
+        content = _build_output(_sample_bodies())
+
+        # Act
+        result = generator.write_incremental(content)
+
+        # Assert
+        assert result.mode == "rewritten"
+        assert output_path.read_text(encoding='utf-8') == content
+
+    def test_write_incremental_unchanged(self, tmp_path: Path) -> None:
+        """Test that identical content is not rewritten."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        content = _build_output(_sample_bodies())
+        output_path.write_text(content, encoding='utf-8')
+        generator = OutputGenerator(output_path)
+
+        # Act
+        result = generator.write_incremental(content)
+
+        # Assert
+        assert result.mode == "unchanged"
+        assert result.bytes_written == 0
+
+    def test_write_incremental_patches_from_changed_section(self, tmp_path: Path) -> None:
+        """Test that only the tail from the changed section is rewritten."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        bodies = _sample_bodies()
+        output_path.write_text(_build_output(bodies), encoding='utf-8')
+        bodies["rule15.md"] = bodies["rule15.md"].replace("Guideline 15", "Changed ünïcode", 1)
+        new_content = _build_output(bodies)
+        generator = OutputGenerator(output_path)
+
+        # Act
+        result = generator.write_incremental(new_content)
+
+        # Assert
+        assert result.mode == "patched"
+        assert result.offset > 0
+        assert result.bytes_written < len(new_content.encode('utf-8')) // 2
+        assert output_path.read_bytes() == new_content.encode('utf-8')
+
+    def test_write_incremental_shrinking_output(self, tmp_path: Path) -> None:
+        """Test that removing the last section truncates the file."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        bodies = _sample_bodies()
+        output_path.write_text(_build_output(bodies), encoding='utf-8')
+        del bodies["rule19.md"]
+        new_content = _build_output(bodies)
+        generator = OutputGenerator(output_path)
+
+        # Act
+        result = generator.write_incremental(new_content)
+
+        # Assert
+        assert result.mode == "patched"
+        assert output_path.read_bytes() == new_content.encode('utf-8')
+
+    def test_write_incremental_large_size_change_rewrites(self, tmp_path: Path) -> None:
+        """Test that a large size change rebuilds the file atomically."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        bodies = _sample_bodies()
+        output_path.write_text(_build_output(bodies), encoding='utf-8')
+        new_content = _build_output(dict(list(bodies.items())[:5]))
+        generator = OutputGenerator(output_path)
+
+        # Act
+        result = generator.write_incremental(new_content)
+
+        # Assert
+        assert result.mode == "rewritten"
+        assert output_path.read_bytes() == new_content.encode('utf-8')
+        assert list(tmp_path.iterdir()) == [output_path]
+
+    def test_write_incremental_without_markers_rewrites(self, tmp_path: Path) -> None:
+        """Test that outputs without section markers are rewritten in full."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        output_path.write_text("# Old format output\n", encoding='utf-8')
+        new_content = _build_output(_sample_bodies())
+        generator = OutputGenerator(output_path)
+
+        # Act
+        result = generator.write_incremental(new_content)
+
+        # Assert
+        assert result.mode == "rewritten"
+        assert output_path.read_text(encoding='utf-8') == new_content
+
+    def test_write_compressed_output(self, tmp_path: Path) -> None:
+        """Test writing, validating and backing up a gzip-compressed output."""
+        # Arrange
+        import gzip
+
+        output_path = tmp_path / "AGENT.md.gz"
+        content = _build_output(_sample_bodies())
+        generator = OutputGenerator(output_path, backup=True)
+
+        # Act
+        first = generator.write_incremental(content)
+        second = generator.write_incremental(content)
+        backup_path = generator.backup_existing_file()
+
+        # Assert
+        assert first.mode == "rewritten"
+        assert second.mode == "unchanged"
+        assert gzip.decompress(output_path.read_bytes()).decode('utf-8') == content
+        assert generator.validate_output() is True
+        assert backup_path is not None
+        assert backup_path.name.endswith(".md.gz")
+        assert backup_path.read_bytes() == output_path.read_bytes()
+
+
+class TestSpooledOutputWriter:
+    """Test cases for SpooledOutputWriter."""
+
+    def _sections(self) -> list[str]:
+        """Split sample output into the sections the CLI would stream."""
+        processor = RuleProcessor()
+        sections = []
+        for name, body in _sample_bodies().items():
+            section = processor.format_rule_section(body, name)
+            sections.append(processor.format_section_marker(name, section) + section)
+        return sections
+
+    def test_finalize_matches_joined_content(self, tmp_path: Path) -> None:
+        """Test that spooled output equals joining sections in memory."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        sections = self._sections()
+
+        # Act
+        with SpooledOutputWriter(output_path, max_memory=1024 * 1024) as writer:
+            for section in sections:
+                writer.add_section(section)
+            written = writer.finalize(trailer="\n<!-- trailer -->\n")
+
+        # Assert
+        expected = "\n".join(sections) + "\n<!-- trailer -->\n"
+        assert output_path.read_bytes() == expected.encode('utf-8')
+        assert written == len(expected.encode('utf-8'))
+        assert writer.spilled_to_disk is False
+
+    def test_small_ceiling_spills_to_disk(self, tmp_path: Path) -> None:
+        """Test that exceeding the ceiling spills while output stays exact."""
+        # Arrange
+        output_path = tmp_path / "AGENT.md"
+        sections = self._sections()
+
+        # Act
+        with SpooledOutputWriter(output_path, max_memory=2048) as writer:
+            for section in sections:
+                writer.add_section(section)
+            writer.finalize()
+
+        # Assert
+        assert writer.spilled_to_disk is True
+        assert output_path.read_text(encoding='utf-8') == "\n".join(sections)
+        assert [p.name for p in tmp_path.iterdir()] == ["AGENT.md"]
+
+    def test_finalize_compressed_output(self, tmp_path: Path) -> None:
+        """Test streaming sections into a compressed output."""
+        # Arrange
+        import gzip
+
+        output_path = tmp_path / "AGENT.md.gz"
+        sections = self._sections()
+
+        # Act
+        with SpooledOutputWriter(output_path, max_memory=4096) as writer:
+            for section in sections:
+                writer.add_section(section)
+            writer.finalize()
+
+        # Assert
+        assert gzip.decompress(output_path.read_bytes()).decode('utf-8') == "\n".join(sections)
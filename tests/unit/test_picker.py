@@ -0,0 +1,196 @@
+"""Unit tests for the full-screen picker's state and rendering."""
+
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from rules_combiner.models import RuleFile
+from rules_combiner.picker import CursesPicker, PickerState, picker_available
+from rules_combiner.totals import SelectionTotals
+
+
+@pytest.fixture
+def rules(tmp_path: Path) -> List[RuleFile]:
+    """Create rule files backed by one real file."""
+    path = tmp_path / "rule.md"
+    path.write_text("# Rule\n", encoding='utf-8')
+    return [
+        RuleFile(path=path, filename=f"rule-{i}.md", title=f"Rule {i}", file_size=40)
+        for i in range(100)
+    ]
+
+
+class FakeScreen:
+    """Records the rows a curses window is asked to draw."""
+
+    def __init__(self, rows: int, width: int) -> None:
+        self.rows = rows
+        self.width = width
+        self.drawn: List[Tuple[int, str]] = []
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.rows, self.width
+
+    def addnstr(self, line: int, column: int, text: str, limit: int, attribute: int = 0) -> None:
+        self.drawn.append((line, text[:limit]))
+
+    def erase(self) -> None:
+        pass
+
+    def move(self, line: int, column: int) -> None:
+        pass
+
+    def clrtoeol(self) -> None:
+        pass
+
+    def refresh(self) -> None:
+        pass
+
+
+class TestPickerState:
+    """Test cases for PickerState."""
+
+    def test_move_scrolls_window_to_keep_cursor_visible(self, rules: List[RuleFile]) -> None:
+        """Test cursor clamping and scrolling."""
+        # Arrange
+        state = PickerState(rules, height=10)
+
+        # Act
+        dirty = state.move(1)
+        state.move(15)
+
+        # Assert
+        assert dirty == {0, 1}
+        assert state.cursor == 16 and state.top == 7
+        state.move(-1000)
+        assert state.cursor == 0 and state.top == 0
+
+    def test_toggle_and_toggle_all(self, rules: List[RuleFile]) -> None:
+        """Test that selections toggle in place and 'all' acts on the view."""
+        # Arrange
+        state = PickerState(rules, height=10)
+
+        # Act
+        state.move(2)
+        toggled = state.toggle()
+        state.filter("rule 5")
+        state.toggle_all()
+
+        # Assert
+        assert toggled == {2}
+        assert "rule-2.md" in state.selected_filenames()
+        assert "rule-5.md" in state.selected_filenames()
+
+    def test_toggles_update_running_totals(self, rules: List[RuleFile]) -> None:
+        """Test that totals follow toggles and the status flags an exceeded budget."""
+        # Arrange
+        state = PickerState(rules, height=10, totals=SelectionTotals(budget=100))
+
+        # Act
+        state.toggle()
+        state.move(1)
+        state.toggle()
+        two = (state.totals.count, state.totals.tokens)
+        state.toggle()
+        state.toggle_all()
+
+        # Assert
+        assert two == (2, 20)
+        assert state.totals.count == 100 and state.totals.tokens == 1000
+        assert "OVER BUDGET" in state.status()
+        state.toggle_all()
+        assert state.totals.count == 0 and "OVER BUDGET" not in state.status()
+
+    def test_filter_and_clear(self, rules: List[RuleFile]) -> None:
+        """Test that a search narrows the view and an empty query restores it."""
+        # Arrange
+        state = PickerState(rules, height=10)
+
+        # Act
+        state.filter("rule-42")
+        matches = [rules[index].filename for index in state.view]
+        state.filter("")
+
+        # Assert
+        assert matches[0] == "rule-42.md"
+        assert len(state.view) == 100 and state.cursor == 0
+
+    def test_rows_fit_the_width(self, rules: List[RuleFile]) -> None:
+        """Test that formatted rows never exceed the screen width."""
+        # Arrange
+        state = PickerState(rules, height=10)
+        state.toggle()
+
+        # Act
+        wide = state.format_row(0, 80)
+        narrow = state.format_row(0, 12)
+
+        # Assert
+        assert wide.startswith("[x]") and len(wide) == 79 and wide.endswith("~10")
+        assert len(narrow) <= 11
+
+
+@pytest.mark.skipif(not picker_available(), reason="curses is not available")
+class TestCursesPicker:
+    """Test cases for CursesPicker rendering."""
+
+    def test_only_changed_rows_are_redrawn(self, rules: List[RuleFile]) -> None:
+        """Test that moving within the window redraws two rows, scrolling redraws all."""
+        # Arrange
+        picker = CursesPicker(rules)
+        screen = FakeScreen(rows=12, width=80)
+        state = picker._state = PickerState(rules, height=10)
+        picker.render(screen, None)
+        full_draw = len(screen.drawn)
+
+        # Act
+        screen.drawn.clear()
+        picker.render(screen, state.move(1))
+        moved = [line for line, _ in screen.drawn]
+        screen.drawn.clear()
+        picker.render(screen, state.move(10))
+        scrolled = len(screen.drawn)
+
+        # Assert
+        assert full_draw == 12  # header, 10 rows, status line
+        assert moved == [1, 2, 11]  # old row, new row, status line
+        assert scrolled == full_draw
+
+    def test_preview_pane_follows_the_cursor(self, rules: List[RuleFile]) -> None:
+        """Test that the pane shows the highlighted rule and is redrawn only when it changes."""
+        # Arrange
+        screen = FakeScreen(rows=30, width=60)
+        picker = CursesPicker(rules)
+        state = picker._state = PickerState(rules, height=28)
+        state.cycle_preview()
+        state.resize(28 - state.preview_height(30))
+        picker.render(screen, None)
+
+        # Act
+        screen.drawn.clear()
+        picker.render(screen, state.toggle())
+        unchanged = list(screen.drawn)
+        screen.drawn.clear()
+        picker.render(screen, state.move(1))
+
+        # Assert
+        assert state.height == 14
+        assert not any("rule-0.md (head)" in text for _, text in unchanged)
+        assert any("rule-1.md (head)" in text for _, text in screen.drawn)
+        assert (16, "# Rule") in screen.drawn
+        assert state.previews.misses == 1
+
+    def test_large_catalog_renders_only_visible_rows(self, rules: List[RuleFile]) -> None:
+        """Test that a 100k-rule catalog formats a window's worth of rows."""
+        # Arrange
+        catalog = rules * 1000
+        picker = CursesPicker(catalog)
+        screen = FakeScreen(rows=42, width=100)
+        picker._state = PickerState(catalog, height=40)
+
+        # Act
+        picker.render(screen, None)
+
+        # Assert
+        assert len(screen.drawn) == 42
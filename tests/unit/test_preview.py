@@ -0,0 +1,102 @@
+"""Unit tests for cached rule previews."""
+
+import gzip
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from rules_combiner.models import RuleFile
+from rules_combiner.preview import PreviewCache
+
+CONTENT = """---
+tags: [python]
+---
+# Python Testing
+
+Intro line
+
+```python
+# not a heading
+```
+
+## Fixtures
+### Scope ###
+## Parametrize
+"""
+
+
+@pytest.fixture
+def rules(tmp_path: Path) -> List[RuleFile]:
+    """Create a plain and a gzip-compressed rule with the same content."""
+    plain = tmp_path / "python-testing.md"
+    plain.write_text(CONTENT, encoding='utf-8')
+    compressed = tmp_path / "python-testing-gz.md.gz"
+    compressed.write_bytes(gzip.compress(CONTENT.encode('utf-8')))
+    return [
+        RuleFile(plain, plain.name, "Python Testing"),
+        RuleFile(compressed, compressed.name, "Python Testing"),
+    ]
+
+
+class TestPreviewCache:
+    """Test cases for PreviewCache."""
+
+    def test_head_skips_frontmatter(self, rules: List[RuleFile]) -> None:
+        """Test that the head shows the first body lines of plain and compressed rules."""
+        # Arrange
+        previews = PreviewCache(lines=3)
+
+        # Act & Assert
+        for rule in rules:
+            assert previews.head(rule) == ["# Python Testing", "", "Intro line"]
+
+    def test_outline_skips_code_blocks(self, rules: List[RuleFile]) -> None:
+        """Test that headings are indented by level and fenced code is ignored."""
+        # Act
+        outline = PreviewCache().outline(rules[0])
+
+        # Assert
+        assert outline == ["Python Testing", "  Fixtures", "    Scope", "  Parametrize"]
+
+    def test_head_reads_only_the_lines_shown(self, tmp_path: Path) -> None:
+        """Test that a head preview stops reading after its lines."""
+        # Arrange
+        path = tmp_path / "big.md"
+        path.write_text("line\n" * 100_000 + "\udcff", encoding='utf-8', errors='surrogateescape')
+        rule = RuleFile(path, path.name, "Big")
+
+        # Act
+        head = PreviewCache(lines=5).head(rule)
+
+        # Assert: the undecodable byte at the end is never reached
+        assert head == ["line"] * 5
+
+    def test_cache_is_lru_bounded(self, rules: List[RuleFile]) -> None:
+        """Test hits, misses and eviction of the least recently used preview."""
+        # Arrange
+        previews = PreviewCache(max_entries=2)
+
+        # Act
+        previews.head(rules[0])
+        previews.head(rules[1])
+        previews.head(rules[0])
+        previews.outline(rules[0])
+        previews.head(rules[1])
+
+        # Assert
+        assert len(previews) == 2
+        assert (previews.hits, previews.misses) == (1, 4)
+
+    def test_unreadable_rule_is_described(self, rules: List[RuleFile]) -> None:
+        """Test that read errors become a one-line preview and are not cached."""
+        # Arrange
+        previews = PreviewCache()
+        rules[0].path.unlink()
+
+        # Act
+        preview = previews.head(rules[0])
+
+        # Assert
+        assert preview[0].startswith("(cannot read python-testing.md")
+        assert len(previews) == 0
@@ -80,6 +80,32 @@ class TestRuleProcessor:
         # Should not contain the original title as a header since it's replaced
         assert "# Original Title" not in formatted
 
+    def test_format_rule_section_strips_frontmatter(self) -> None:
+        """Test that the frontmatter block is not copied into the output."""
+        # Arrange
+        processor = RuleProcessor()
+        content = "---\ntags: [python]\npriority: 1\n---\n\n# Original\n\nBody.\n"
+        
+        # Act
+        formatted = processor.format_rule_section(content, "Python")
+        
+        # Assert
+        assert formatted.startswith("# Python\n\nBody.")
+        assert "tags:" not in formatted and "---" not in formatted
+    
+    def test_format_rule_section_keeps_leading_horizontal_rule(self) -> None:
+        """Test that text between horizontal rules is not mistaken for frontmatter."""
+        # Arrange
+        processor = RuleProcessor()
+        content = "---\nImportant intro paragraph that must be kept.\n\n---\n# Title\nBody\n"
+
+        # Act
+        formatted = processor.format_rule_section(content, "T")
+
+        # Assert
+        assert "Important intro paragraph that must be kept." in formatted
+        assert formatted.endswith("Body\n\n")
+
     def test_format_rule_section_with_empty_content(self) -> None:
         """Test formatting empty content."""
         # Arrange  
@@ -201,3 +227,51 @@ class TestRuleProcessor:
         # Assert
         assert "## Section 2" in formatted
         assert "### Section 3" in formatted
+
+    def test_format_section_marker_round_trip(self) -> None:
+        """Test that section markers can be located in encoded output."""
+        # Arrange
+        processor = RuleProcessor()
+        first = processor.format_rule_section("# One\n\nBody 1.", "One")
+        second = processor.format_rule_section("# Two\n\nBody 2 🚀.", "Two")
+        content = "\n".join([
+            processor.format_section_marker("one.md", first) + first,
+            processor.format_section_marker("two.md", second) + second,
+        ])
+        encoded = content.encode('utf-8')
+
+        # Act
+        markers = processor.find_section_markers(encoded)
+
+        # Assert
+        assert [marker.section_id for marker in markers] == ["one.md", "two.md"]
+        for marker, section in zip(markers, [first, second]):
+            assert encoded[marker.content_start:marker.content_end] == section.encode('utf-8')
+
+    def test_format_section_marker_digest_changes_with_content(self) -> None:
+        """Test that marker digests reflect section content."""
+        # Arrange
+        processor = RuleProcessor()
+
+        # Act
+        marker_a = processor.format_section_marker("rule.md", "# Rule\n\nA\n")
+        marker_b = processor.format_section_marker("rule.md", "# Rule\n\nB\n")
+
+        # Assert
+        assert marker_a != marker_b
+        assert marker_a.startswith("<!-- rules-combiner:section")
+
+    def test_read_rule_content_from_compressed_file(self, tmp_path: Path) -> None:
+        """Test reading a gzip-compressed rule file."""
+        # Arrange
+        import gzip
+
+        processor = RuleProcessor()
+        file_path = tmp_path / "packed.md.gz"
+        file_path.write_bytes(gzip.compress("# Packed\n\nCompressed ñ content.".encode('utf-8')))
+
+        # Act
+        result = processor.read_rule_content(file_path)
+
+        # Assert
+        assert result == "# Packed\n\nCompressed ñ content."
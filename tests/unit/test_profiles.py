@@ -0,0 +1,136 @@
+"""Unit tests for saved selection profiles and their build cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.models import CombinationConfig, RuleFile, SelectionMode
+from rules_combiner.profiles import (
+    CACHED,
+    CURRENT,
+    STALE,
+    ProfileCache,
+    build_key,
+    load_profile,
+    profile_names,
+    save_profile,
+)
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    """Create a project with two rules and a profiles file."""
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "a.md").write_text("# A\n", encoding='utf-8')
+    (rules_dir / "b.md").write_text("# B\n", encoding='utf-8')
+    (tmp_path / "rules-profiles.toml").write_text(
+        'include_toc = false\n'
+        '\n'
+        '[profiles.backend]\n'
+        'selected_rules = ["a.md"]\n'
+        '\n'
+        '[profiles.web]\n'
+        'select_glob = ["*.md"]\n'
+        'output_file = "web/AGENT.md"\n'
+        'include_toc = true\n',
+        encoding='utf-8',
+    )
+    return tmp_path
+
+
+class TestProfilesFile:
+    """Test cases for loading and saving profiles."""
+
+    def test_load_profile_applies_defaults(self, project_dir: Path) -> None:
+        """Test that top-level keys are defaults a profile can override."""
+        # Act
+        backend = load_profile(project_dir / "rules-profiles.toml", "backend")
+        web = load_profile(project_dir / "rules-profiles.toml", "web")
+
+        # Assert
+        assert backend.selected_rules == ["a.md"] and backend.include_toc is False
+        assert backend.rules_directory == project_dir / "rules"
+        assert web.selected_patterns == ["*.md"] and web.include_toc is True
+        assert web.output_file == project_dir / "web" / "AGENT.md"
+
+    def test_unknown_profile_lists_available(self, project_dir: Path) -> None:
+        """Test the error for a missing profile name."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="available: backend, web"):
+            load_profile(project_dir / "rules-profiles.toml", "mobile")
+
+    def test_save_profile_appends_table(self, project_dir: Path) -> None:
+        """Test that saved profiles load back and names are checked."""
+        # Arrange
+        path = project_dir / "rules-profiles.toml"
+
+        # Act
+        save_profile(path, "mixed", ["b.md", "a.md"])
+
+        # Assert
+        assert profile_names(path) == ["backend", "mixed", "web"]
+        assert load_profile(path, "mixed").selected_rules == ["b.md", "a.md"]
+        with pytest.raises(ValueError, match="already exists"):
+            save_profile(path, "mixed", ["a.md"])
+        with pytest.raises(ValueError, match="Invalid profile name"):
+            save_profile(path, "two words", ["a.md"])
+
+
+class TestProfileCache:
+    """Test cases for ProfileCache."""
+
+    def _build(self, output: Path) -> None:
+        """Stand in for a build by writing the output."""
+        output.write_text("combined\n", encoding='utf-8')
+
+    def test_round_trip(self, project_dir: Path) -> None:
+        """Test stale, current, cached and restored states."""
+        # Arrange
+        rules_dir = project_dir / "rules"
+        output = project_dir / "AGENT.md"
+        config = CombinationConfig(rules_dir, output, ["a.md"], selection_mode=SelectionMode.SPECIFIC)
+        key = build_key(config, "1.0")
+        rule = RuleFile(rules_dir / "a.md", "a.md", "A")
+        cache = ProfileCache(project_dir / "rules-profiles.toml", "backend")
+
+        # Act & Assert
+        assert cache.check(key, rules_dir, output) == STALE
+        self._build(output)
+        cache.store(key, rules_dir, output, [rule], [rule])
+        assert cache.check(key, rules_dir, output) == CURRENT
+        assert cache.record is not None and cache.record.rule_count == 1
+        assert cache.check(build_key(config, "2.0"), rules_dir, output) == STALE
+
+        output.write_text("edited by hand\n", encoding='utf-8')
+        assert cache.check(key, rules_dir, output) == CACHED
+        cache.restore(output)
+        assert output.read_text(encoding='utf-8') == "combined\n"
+        assert cache.check(key, rules_dir, output) == CURRENT
+
+    def test_changed_inputs_are_stale(self, project_dir: Path) -> None:
+        """Test that editing an input or adding a rule invalidates the cache."""
+        # Arrange
+        rules_dir = project_dir / "rules"
+        output = project_dir / "AGENT.md"
+        config = CombinationConfig(rules_dir, output, [], selected_patterns=["*.md"])
+        key = build_key(config, "1.0")
+        rule = RuleFile(rules_dir / "a.md", "a.md", "A")
+        cache = ProfileCache(project_dir / "rules-profiles.toml", "web")
+        self._build(output)
+        cache.store(key, rules_dir, output, [rule], [rule])
+
+        # Act
+        stat = rule.path.stat()
+        os.utime(rule.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        edited = cache.check(key, rules_dir, output)
+        cache.store(key, rules_dir, output, [rule], [rule])
+        (rules_dir / "c.md").write_text("# C\n", encoding='utf-8')
+        dir_stat = rules_dir.stat()
+        os.utime(rules_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns + 1_000_000_000))
+        added = cache.check(key, rules_dir, output)
+
+        # Assert
+        assert edited == STALE
+        assert added == STALE
@@ -0,0 +1,60 @@
+"""Unit tests for cProfile output helpers."""
+
+import cProfile
+import pstats
+from pathlib import Path
+
+from rules_combiner.profiling import collapsed_stacks, profile_paths, write_profile
+
+
+def _busy(iterations: int) -> int:
+    """Burn CPU so the profile has measurable time."""
+    return sum(i * i for i in range(iterations))
+
+
+def _outer() -> int:
+    """Call the busy function from a known parent."""
+    return _busy(200_000) + _busy(100_000)
+
+
+def _profile() -> cProfile.Profile:
+    """Profile a call to _outer."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _outer()
+    profiler.disable()
+    return profiler
+
+
+class TestProfiling:
+    """Test cases for pstats and collapsed-stack output."""
+
+    def test_profile_paths(self) -> None:
+        """Test that .pstats is appended only when missing."""
+        # Act & Assert
+        assert profile_paths(Path("run")) == (Path("run.pstats"), Path("run.collapsed"))
+        assert profile_paths(Path("out/run.pstats")) == (
+            Path("out/run.pstats"), Path("out/run.collapsed")
+        )
+
+    def test_collapsed_stacks_follow_call_paths(self) -> None:
+        """Test that rebuilt stacks nest callees under their callers."""
+        # Act
+        stacks = collapsed_stacks(pstats.Stats(_profile()))
+
+        # Assert
+        busy_stacks = [stack for stack in stacks if "_busy (test_profiling.py" in stack]
+        assert busy_stacks
+        assert all("_outer (test_profiling.py" in stack for stack in busy_stacks)
+        assert all(weight > 0 and ";;" not in stack for stack, weight in stacks.items())
+
+    def test_write_profile_creates_both_files(self, tmp_path: Path) -> None:
+        """Test that the pstats file loads and the collapsed file is 'stack weight' lines."""
+        # Act
+        pstats_path, collapsed_path = write_profile(_profile(), tmp_path / "run")
+
+        # Assert
+        assert pstats.Stats(str(pstats_path)).total_calls > 0
+        for line in collapsed_path.read_text(encoding='utf-8').splitlines():
+            stack, weight = line.rsplit(" ", 1)
+            assert stack and int(weight) > 0
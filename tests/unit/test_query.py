@@ -0,0 +1,137 @@
+"""Unit tests for selection expressions."""
+
+import re
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from rules_combiner.catalog import RuleCatalog, mask_to_positions, positions_to_mask
+from rules_combiner.models import RuleFile
+from rules_combiner.query import compile_selection, is_expression, select_expression
+
+
+@pytest.fixture
+def catalog(tmp_path: Path) -> RuleCatalog:
+    """Create a catalog with tags and varied sizes."""
+    specs = [
+        ("python-coding.md", 4000, ["python"]),
+        ("python-legacy.md", 2000, ["python"]),
+        ("python-testing.md", 12000, ["python", "testing"]),
+        ("go-style.md", 800, ["go"]),
+        ("review.md", 400, []),
+    ]
+    rules = []
+    for name, size, tags in specs:
+        path = tmp_path / name
+        path.write_text("x", encoding='utf-8')
+        rules.append(RuleFile(path, name, name, file_size=size, tags=tags))
+    return RuleCatalog(rules)
+
+
+def _names(catalog: RuleCatalog, expression: str) -> List[str]:
+    return [rule.filename for rule in compile_selection(expression).select(catalog)]
+
+
+class TestSelectionExpressions:
+    """Test cases for compile_selection."""
+
+    def test_classic_numbers_and_ranges(self, catalog: RuleCatalog) -> None:
+        """Test that the selector's original formats keep their meaning."""
+        # Act & Assert
+        assert compile_selection("1,3").positions(catalog) == [0, 2]
+        assert compile_selection("2 - 4").positions(catalog) == [1, 2, 3]
+        assert compile_selection("1,3-4,").positions(catalog) == [0, 2, 3]
+        assert compile_selection("ALL").positions(catalog) == [0, 1, 2, 3, 4]
+
+    def test_combines_tags_globs_and_comparisons(self, catalog: RuleCatalog) -> None:
+        """Test negation, intersection, union and precedence."""
+        # Act & Assert
+        assert _names(catalog, "tag:python & !*legacy* & tokens<2000") == ["python-coding.md"]
+        assert _names(catalog, "tag:go | review.md") == ["go-style.md", "review.md"]
+        assert _names(catalog, "!tag:python & size>=800") == ["go-style.md"]
+        assert _names(catalog, "tag:testing | tag:go & size<500") == ["python-testing.md"]
+        assert _names(catalog, "(tag:testing | tag:go) & size<1000") == ["go-style.md"]
+        assert _names(catalog, "tokens=500 , size!=400 & tag:Python") == [
+            "python-coding.md", "python-legacy.md", "python-testing.md",
+        ]
+
+    @pytest.mark.parametrize("expression, message", [
+        ("", "Empty selection"),
+        ("1 &", "ends unexpectedly"),
+        ("(1 | 2", "Missing ')'"),
+        ("1)", "Unexpected ')'"),
+        ("0", "1 or greater"),
+        ("4-2", "start must be <= end"),
+        ("tag:", "Missing tag name"),
+    ])
+    def test_malformed_expressions(self, expression: str, message: str) -> None:
+        """Test that syntax errors are reported when compiling."""
+        # Act & Assert
+        with pytest.raises(ValueError, match=re.escape(message)):
+            compile_selection(expression)
+
+    def test_errors_against_catalog(self, catalog: RuleCatalog) -> None:
+        """Test unknown filenames, out-of-range numbers and empty results."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unknown rule file: 'missing.md'"):
+            compile_selection("missing.md | 1").positions(catalog)
+        with pytest.raises(ValueError, match="out of range"):
+            compile_selection("9").positions(catalog)
+        with pytest.raises(ValueError, match="matches no rule files"):
+            select_expression(catalog, "*.txt")
+
+    def test_is_expression(self) -> None:
+        """Test telling plain filename lists from expressions."""
+        # Act & Assert
+        assert not is_expression("python-coding.md, go-style.md")
+        assert is_expression("python-*.md")
+        assert is_expression("tag:go")
+        assert is_expression("1-3")
+        assert is_expression("a.md & !b.md")
+
+    def test_large_catalog_evaluates_from_cached_masks(self, tmp_path: Path) -> None:
+        """Test bitset evaluation over 100k rules against a brute-force scan."""
+        # Arrange
+        path = tmp_path / "rule.md"
+        path.write_text("x", encoding='utf-8')
+        rules = [
+            RuleFile(
+                path, f"rule-{i}{'-legacy' if i % 7 == 0 else ''}.md", "",
+                file_size=i % 9000, tags=["python"] if i % 2 else ["go"],
+            )
+            for i in range(100_000)
+        ]
+        catalog = RuleCatalog(rules)
+        query = compile_selection("tag:python & !*legacy* & tokens<2000")
+        query.mask(catalog)
+
+        # Act
+        started = time.perf_counter()
+        for _ in range(100):
+            mask = query.mask(catalog)
+        elapsed = (time.perf_counter() - started) / 100
+
+        # Assert
+        expected = [
+            i for i, rule in enumerate(rules)
+            if "python" in rule.tags and "legacy" not in rule.filename
+            and rule.estimated_tokens < 2000
+        ]
+        assert mask_to_positions(mask) == expected
+        assert elapsed < 0.01
+
+
+class TestBitsets:
+    """Test cases for the bitset helpers."""
+
+    def test_round_trip(self) -> None:
+        """Test converting positions to a mask and back."""
+        # Act
+        mask = positions_to_mask([0, 9, 3, 64], 70)
+
+        # Assert
+        assert mask == (1 << 0) | (1 << 3) | (1 << 9) | (1 << 64)
+        assert mask_to_positions(mask) == [0, 3, 9, 64]
+        assert mask_to_positions(0) == []
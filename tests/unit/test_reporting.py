@@ -0,0 +1,97 @@
+"""Unit tests for the generate progress reporters."""
+
+import io
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from rules_combiner.models import RuleFile
+from rules_combiner.reporting import PorcelainReporter, RichReporter
+
+
+@pytest.fixture
+def rules(tmp_path: Path) -> list:
+    """Create three rule files."""
+    rules = []
+    for name in ("a.md", "b.md", "c.md"):
+        path = tmp_path / name
+        path.write_text(f"# {name}\n", encoding='utf-8')
+        rules.append(RuleFile(path=path, filename=name, title=name))
+    return rules
+
+
+class TestPorcelainReporter:
+    """Test cases for PorcelainReporter."""
+
+    def test_events_are_tab_separated_lines(
+        self, rules: list, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that each event is one line, with fields kept on that line."""
+        # Arrange
+        reporter = PorcelainReporter()
+
+        # Act
+        reporter.selected(3)
+        with reporter.processing(len(rules)) as on_rule:
+            for rule in rules:
+                on_rule(rule)
+        reporter.error("broken\nacross lines")
+
+        # Assert
+        captured = capsys.readouterr()
+        assert captured.out.splitlines() == [
+            "selected\t3", "rule\t1\t3\ta.md", "rule\t2\t3\tb.md", "rule\t3\t3\tc.md",
+        ]
+        assert captured.err == "error\tbroken across lines\n"
+
+    def test_quiet_prints_only_errors(self, rules: list, capsys: pytest.CaptureFixture) -> None:
+        """Test that quiet mode suppresses everything except errors."""
+        # Arrange
+        reporter = PorcelainReporter(quiet=True)
+
+        # Act
+        reporter.discovered(3)
+        with reporter.processing(len(rules)) as on_rule:
+            on_rule(rules[0])
+        reporter.warning("careful")
+        reporter.error("failed")
+
+        # Assert
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == "error\tfailed\n"
+
+
+class TestRichReporter:
+    """Test cases for RichReporter."""
+
+    def test_non_terminal_prints_one_line_per_rule(self, rules: list) -> None:
+        """Test that logs and pipes keep a line per processed rule."""
+        # Arrange
+        stream = io.StringIO()
+        reporter = RichReporter(Console(file=stream, force_terminal=False))
+
+        # Act
+        with reporter.processing(len(rules)) as on_rule:
+            for rule in rules:
+                on_rule(rule)
+
+        # Assert
+        assert stream.getvalue().splitlines() == [
+            "Processing: a.md", "Processing: b.md", "Processing: c.md",
+        ]
+
+    def test_terminal_shows_progress_bar_instead_of_lines(self, rules: list) -> None:
+        """Test that a terminal gets a progress bar rather than a line per rule."""
+        # Arrange
+        stream = io.StringIO()
+        reporter = RichReporter(Console(file=stream, force_terminal=True, width=80))
+
+        # Act
+        with reporter.processing(len(rules)) as on_rule:
+            for rule in rules:
+                on_rule(rule)
+
+        # Assert
+        assert "Processing: a.md" not in stream.getvalue()
@@ -0,0 +1,77 @@
+"""Unit tests for the trigram search index."""
+
+import time
+
+from rules_combiner.search import TrigramIndex
+
+DOCUMENTS = [
+    "go-style.md Go Style Guide",
+    "python-testing.md Python Testing Standards",
+    "python-coding.md Python Coding Standards",
+    "react-testing.md React Testing Library",
+]
+
+
+class TestTrigramIndex:
+    """Test cases for TrigramIndex."""
+
+    def test_words_matching_exactly_rank_first(self) -> None:
+        """Test that a document containing every query word ranks first."""
+        # Arrange
+        index = TrigramIndex(DOCUMENTS)
+
+        # Act
+        results = index.search("python test")
+
+        # Assert
+        assert results[0] == 1
+        assert set(results[1:]) >= {2, 3}
+
+    def test_typos_are_tolerated(self) -> None:
+        """Test that misspelled queries still find the intended rule."""
+        # Arrange
+        index = TrigramIndex(DOCUMENTS)
+
+        # Act
+        results = index.search("pyhton testng")
+
+        # Assert
+        assert results[0] == 1
+
+    def test_unrelated_and_empty_queries_match_nothing(self) -> None:
+        """Test that nothing is returned without shared trigrams."""
+        # Arrange
+        index = TrigramIndex(DOCUMENTS)
+
+        # Act & Assert
+        assert index.search("kubernetes") == []
+        assert index.search("  --  ") == []
+
+    def test_limit_truncates_results(self) -> None:
+        """Test that limit caps the number of results."""
+        # Arrange
+        index = TrigramIndex(DOCUMENTS)
+
+        # Act & Assert
+        assert len(index.search("testing", limit=1)) == 1
+        assert len(index) == 4
+
+    def test_search_is_fast_on_large_catalogs(self) -> None:
+        """Test that a query over thousands of rules takes milliseconds."""
+        # Arrange
+        topics = ["python", "rust", "react", "docker", "testing", "security", "api", "sql"]
+        documents = [
+            f"{topics[i % 8]}-{topics[i // 8 % 8]}-{i}.md {topics[i % 8].title()} Rule {i}"
+            for i in range(5000)
+        ]
+        index = TrigramIndex(documents)
+
+        # Act
+        started = time.perf_counter()
+        for query in ("p", "py", "pyt", "pyth", "pytho", "python", "python t", "python te"):
+            results = index.search(query, limit=50)
+        elapsed = (time.perf_counter() - started) / 8
+
+        # Assert
+        assert results and "python" in documents[results[0]]
+        assert elapsed < 0.05, f"{elapsed * 1000:.1f} ms per keystroke"
@@ -0,0 +1,110 @@
+"""Unit tests for non-interactive rule selection."""
+
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.models import RuleFile, SelectionMode
+from rules_combiner.selection import select_rules, split_names
+
+
+@pytest.fixture
+def sample_rules(tmp_path: Path) -> list[RuleFile]:
+    """Create sample rule files for selection."""
+    rules = []
+    for name in ("python-coding.md", "python-test.md", "type-script.md"):
+        path = tmp_path / name
+        path.write_text(f"# {name}\n")
+        rules.append(RuleFile(path, name, name))
+    return rules
+
+
+class TestSelectRules:
+    """Test cases for select_rules."""
+
+    def test_select_all(self, sample_rules: list[RuleFile]) -> None:
+        """Test that ALL mode selects every rule in order."""
+        # Act
+        selected = select_rules(sample_rules, SelectionMode.ALL)
+
+        # Assert
+        assert selected == sample_rules
+
+    def test_select_by_tags(self, sample_rules: list[RuleFile]) -> None:
+        """Test that tags add rules after named ones, and unknown tags fail."""
+        # Arrange
+        sample_rules[1].tags = ["testing"]
+        sample_rules[2].tags = ["web", "testing"]
+
+        # Act
+        selected = select_rules(
+            sample_rules, SelectionMode.SPECIFIC, filenames=["type-script.md"], tags=["testing"]
+        )
+
+        # Assert
+        assert [rule.filename for rule in selected] == ["type-script.md", "python-test.md"]
+        with pytest.raises(ValueError, match="Tag 'rust'"):
+            select_rules(sample_rules, SelectionMode.SPECIFIC, tags=["rust"])
+
+    def test_select_by_filename_keeps_given_order(self, sample_rules: list[RuleFile]) -> None:
+        """Test that named rules are returned in the order given."""
+        # Act
+        selected = select_rules(
+            sample_rules, SelectionMode.SPECIFIC, filenames=["type-script.md", "python-coding.md"]
+        )
+
+        # Assert
+        assert [rule.filename for rule in selected] == ["type-script.md", "python-coding.md"]
+
+    def test_select_by_glob_without_duplicates(self, sample_rules: list[RuleFile]) -> None:
+        """Test combining filenames and glob patterns."""
+        # Act
+        selected = select_rules(
+            sample_rules,
+            SelectionMode.SPECIFIC,
+            filenames=["python-test.md"],
+            patterns=["python-*.md"],
+        )
+
+        # Assert
+        assert [rule.filename for rule in selected] == ["python-test.md", "python-coding.md"]
+
+    def test_adds_and_orders_required_rules(self, sample_rules: list[RuleFile]) -> None:
+        """Test that prerequisites are added and come before their dependents."""
+        # Arrange
+        sample_rules[0].after = ["type-script.md"]
+        sample_rules[1].requires = ["python-coding.md"]
+
+        # Act
+        selected = select_rules(sample_rules, SelectionMode.SPECIFIC, filenames=["python-test.md"])
+        everything = select_rules(sample_rules, SelectionMode.ALL)
+
+        # Assert
+        assert [rule.filename for rule in selected] == ["python-coding.md", "python-test.md"]
+        assert [rule.filename for rule in everything] == [
+            "type-script.md", "python-coding.md", "python-test.md",
+        ]
+
+    def test_unknown_filename_raises(self, sample_rules: list[RuleFile]) -> None:
+        """Test that naming a missing rule raises ValueError."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="missing.md"):
+            select_rules(sample_rules, SelectionMode.SPECIFIC, filenames=["missing.md"])
+
+    def test_unmatched_pattern_raises(self, sample_rules: list[RuleFile]) -> None:
+        """Test that a pattern matching nothing raises ValueError."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            select_rules(sample_rules, SelectionMode.SPECIFIC, patterns=["*.txt"])
+
+    def test_interactive_mode_raises(self, sample_rules: list[RuleFile]) -> None:
+        """Test that interactive mode cannot be resolved here."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            select_rules(sample_rules, SelectionMode.INTERACTIVE)
+
+    def test_split_names(self) -> None:
+        """Test splitting comma-separated option values."""
+        # Assert
+        assert split_names("a.md, b.md,") == ["a.md", "b.md"]
+        assert split_names(None) == []
@@ -6,6 +6,7 @@ from unittest.mock import Mock, patch, MagicMock
 
 from rules_combiner.selector import InteractiveSelector
 from rules_combiner.models import RuleFile
+from rules_combiner.totals import SelectionTotals
 
 
 @pytest.fixture
@@ -88,6 +89,20 @@ class TestInteractiveSelector:
         with pytest.raises(ValueError):
             selector._parse_selection_input("99")  # Out of range
 
+    def test_parse_selection_input_expression(self, sample_rule_files: list[RuleFile]) -> None:
+        """Test that selection expressions work at the prompt."""
+        # Arrange
+        sample_rule_files[1].tags = ["python"]
+        selector = InteractiveSelector(sample_rule_files)
+        
+        # Act
+        indices = selector._parse_selection_input("test*.md & !tag:python")
+        
+        # Assert
+        assert indices == [0, 2]
+        with pytest.raises(ValueError, match="No rules match"):
+            selector._parse_selection_input("tag:python & tag:go")
+
     @patch('builtins.input', return_value='y')
     def test_confirm_selection_yes(self, mock_input: Mock, sample_rule_files: list[RuleFile]) -> None:
         """Test confirming selection with yes."""
@@ -125,3 +140,82 @@ class TestInteractiveSelector:
         
         # Assert
         mock_console.print.assert_called()  # Should call print at least once
+
+    def test_search_ranks_matching_rules(self, sample_rule_files: list[RuleFile]) -> None:
+        """Test fuzzy search over filenames and titles."""
+        # Arrange
+        selector = InteractiveSelector(sample_rule_files)
+        
+        # Act
+        results = selector.search("rule 2")
+        
+        # Assert
+        assert results[0] == 1
+
+    @patch('builtins.input', side_effect=['/test rule 3', 'matches', 'y'])
+    def test_search_matches_are_selectable(
+        self, mock_input: Mock, sample_rule_files: list[RuleFile]
+    ) -> None:
+        """Test that a search followed by 'matches' selects the search results."""
+        # Arrange
+        selector = InteractiveSelector(sample_rule_files)
+        
+        # Act
+        with patch.object(selector, 'search', return_value=[2]):
+            selection = selector.get_user_selection()
+        
+        # Assert
+        assert selection == ["test3.md"]
+
+    @patch('builtins.input', side_effect=['?2', '#2', '?9', '1', 'y'])
+    def test_preview_reads_only_the_previewed_rule(
+        self, mock_input: Mock, sample_rule_files: list[RuleFile]
+    ) -> None:
+        """Test that previews are shown on demand without ending the prompt."""
+        # Arrange
+        selector = InteractiveSelector(sample_rule_files)
+        
+        # Act
+        selection = selector.get_user_selection()
+        
+        # Assert
+        assert selection == ["test1.md"]
+        assert selector._previews.head(sample_rule_files[1]) == ["# Test Rule 2", "This is test rule 2."]
+        assert selector._previews.outline(sample_rule_files[1]) == ["Test Rule 2"]
+        assert selector._previews.misses == 2
+
+    @patch('builtins.input', return_value='y')
+    def test_confirm_selection_counts_totals(
+        self, mock_input: Mock, sample_rule_files: list[RuleFile]
+    ) -> None:
+        """Test that confirming fills the running totals and checks the budget."""
+        # Arrange
+        totals = SelectionTotals(budget=1)
+        selector = InteractiveSelector(sample_rule_files, totals)
+        
+        # Act
+        selector.confirm_selection(["test1.md", "test3.md"])
+        
+        # Assert
+        assert totals.count == 2
+        assert totals.over_budget
+
+    @patch('builtins.input', return_value='n')
+    def test_confirm_selection_updates_totals_by_difference(
+        self, mock_input: Mock, sample_rule_files: list[RuleFile]
+    ) -> None:
+        """Test that confirming again counts only the rules that changed."""
+        # Arrange
+        totals = SelectionTotals()
+        selector = InteractiveSelector(sample_rule_files, totals)
+        selector.confirm_selection(["test1.md", "test2.md"])
+        
+        # Act
+        with patch.object(totals, 'add', wraps=totals.add) as add, \
+                patch.object(totals, 'remove', wraps=totals.remove) as remove:
+            selector.confirm_selection(["test2.md", "test3.md"])
+        
+        # Assert
+        assert [call.args[0].filename for call in add.call_args_list] == ["test3.md"]
+        assert [call.args[0].filename for call in remove.call_args_list] == ["test1.md"]
+        assert totals.count == 2
@@ -0,0 +1,102 @@
+"""Unit tests for per-phase timing and I/O accounting."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from rules_combiner.timing import DISABLED_TIMER, RunTimer
+
+HAS_PROC_IO = os.path.exists("/proc/self/io")
+
+
+class TestRunTimer:
+    """Test cases for RunTimer."""
+
+    def test_phase_counts_opened_files(self, tmp_path: Path) -> None:
+        """Test that files opened inside a phase are attributed to it."""
+        # Arrange
+        path = tmp_path / "data.txt"
+        path.write_bytes(b"x" * 10_000)
+        timer = RunTimer()
+
+        # Act
+        with timer.phase("read"):
+            path.read_bytes()
+            path.read_bytes()
+        with timer.phase("idle"):
+            pass
+
+        # Assert
+        read, idle = timer.phases
+        assert read.files_opened == 2 and idle.files_opened == 0
+        assert read.wall_seconds > 0
+
+    @pytest.mark.skipif(not HAS_PROC_IO, reason="needs /proc/self/io")
+    def test_phase_counts_bytes(self, tmp_path: Path) -> None:
+        """Test that bytes read and written are measured per phase."""
+        # Arrange
+        path = tmp_path / "data.txt"
+        timer = RunTimer()
+
+        # Act
+        with timer.phase("write"):
+            path.write_bytes(b"x" * 10_000)
+        with timer.phase("read"):
+            path.read_bytes()
+        with timer.phase("idle"):
+            pass
+
+        # Assert
+        write, read, idle = timer.phases
+        assert write.bytes_written >= 10_000
+        assert read.bytes_read >= 10_000
+        assert idle.bytes_read == 0 and idle.bytes_written == 0
+
+    def test_repeated_phase_accumulates(self) -> None:
+        """Test that re-entering a phase adds to the same entry."""
+        # Arrange
+        timer = RunTimer()
+
+        # Act
+        for _ in range(3):
+            with timer.phase("loop"):
+                pass
+
+        # Assert
+        assert [phase.name for phase in timer.phases] == ["loop"]
+
+    def test_reports_include_cache_hit_rates(self) -> None:
+        """Test the JSON and table reports, including cache hit rates."""
+        # Arrange
+        timer = RunTimer()
+        with timer.phase("processing"):
+            pass
+        timer.record_cache("sections", 3, 4)
+
+        # Act
+        report = json.loads(timer.format_json())
+        table = timer.format_table()
+
+        # Assert
+        assert report["phases"][0]["name"] == "processing"
+        assert report["caches"]["sections"] == {"hits": 3, "lookups": 4, "hit_rate": 0.75}
+        assert table.splitlines()[0].split()[0] == "phase"
+        assert "cache sections: 3/4 hits (75%)" in table
+
+
+class TestDisabledTimer:
+    """Test cases for the no-op timer."""
+
+    def test_phases_share_one_no_op_context(self) -> None:
+        """Test that a disabled timer allocates nothing per phase."""
+        # Act
+        first = DISABLED_TIMER.phase("discovery")
+        second = DISABLED_TIMER.phase("processing")
+        with first:
+            DISABLED_TIMER.record_cache("sections", 1, 1)
+
+        # Assert
+        assert first is second
+        assert not DISABLED_TIMER.enabled
@@ -0,0 +1,123 @@
+"""Unit tests for running selection totals."""
+
+import gzip
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from rules_combiner.manifest import SourceManifest
+from rules_combiner.models import RuleFile
+from rules_combiner.processor import RuleProcessor
+from rules_combiner.totals import SelectionTotals, budget_warning, output_tokens
+
+
+@pytest.fixture
+def rules(tmp_path: Path) -> List[RuleFile]:
+    """Create rule files of different sizes."""
+    rules = []
+    for i in range(1, 21):
+        path = tmp_path / f"rule-{i}.md"
+        content = f"# Rule {i}\n\n" + "Some guidance.\n" * (i * 5)
+        path.write_text(content, encoding='utf-8')
+        rules.append(RuleFile(path, path.name, f"Rule {i}", file_size=len(content)))
+    return rules
+
+
+def totals_of(rules: List[RuleFile], **options: Any) -> SelectionTotals:
+    """Return the totals of a whole selection."""
+    totals = SelectionTotals(**options)
+    for rule in rules:
+        totals.add(rule)
+    return totals
+
+
+class TestSelectionTotals:
+    """Test cases for SelectionTotals."""
+
+    def test_add_and_remove(self, rules: List[RuleFile]) -> None:
+        """Test that totals are updated per rule and removal undoes addition."""
+        # Arrange
+        totals = SelectionTotals()
+
+        # Act
+        totals.add(rules[0])
+        totals.add(rules[1])
+        both = (totals.count, totals.size, totals.tokens, totals.total_tokens)
+        totals.remove(rules[1])
+
+        # Assert
+        assert both[:3] == (
+            2, rules[0].file_size + rules[1].file_size,
+            rules[0].estimated_tokens + rules[1].estimated_tokens,
+        )
+        assert both[3] > both[2]
+        assert totals.total_tokens == totals_of([rules[0]]).total_tokens
+
+    @pytest.mark.parametrize("include_toc, embed_manifest", [
+        (True, True), (True, False), (False, True), (False, False),
+    ])
+    def test_estimate_is_close_to_the_real_output(
+        self, rules: List[RuleFile], include_toc: bool, embed_manifest: bool
+    ) -> None:
+        """Test the overhead estimate against a combined document."""
+        # Arrange
+        processor = RuleProcessor()
+        manifest = SourceManifest(options={"include_toc": include_toc, "tool_version": "0.1.0"})
+        body = "\n".join(processor.iter_sections(
+            rules, include_toc, manifest if embed_manifest else None, rules[0].path.parent
+        ))
+        output = manifest.embed(body) if embed_manifest else body
+        actual = len(output.encode('utf-8')) // 4
+
+        # Act
+        totals = totals_of(rules, include_toc=include_toc, embed_manifest=embed_manifest)
+
+        # Assert
+        assert abs(totals.total_tokens - actual) <= actual * 0.05
+
+    def test_delta_and_budget(self, rules: List[RuleFile], tmp_path: Path) -> None:
+        """Test the change against the existing output and the budget warning."""
+        # Arrange
+        existing = tmp_path / "AGENT.md"
+        existing.write_text("x" * 400, encoding='utf-8')
+        totals = SelectionTotals(budget=300, current_tokens=output_tokens(existing))
+
+        # Act
+        totals.add(rules[0])
+        under = totals.budget_warning()
+        totals.add(rules[9])
+
+        # Assert
+        assert under is None
+        assert totals.delta == totals.total_tokens - 100
+        assert totals.over_budget
+        assert "exceeds the token budget" in (totals.budget_warning() or "")
+        assert f"{totals.delta:+,} vs current" in totals.summary()
+        assert output_tokens(tmp_path / "missing.md") is None
+        assert budget_warning(10, None) is None
+
+    def test_output_tokens_of_compressed_output(self, tmp_path: Path) -> None:
+        """Test that compressed outputs are estimated from their content."""
+        # Arrange
+        output = tmp_path / "AGENT.md.gz"
+        with gzip.open(output, 'wt', encoding='utf-8') as f:
+            f.write("x" * 4000)
+
+        # Act
+        tokens = output_tokens(output)
+
+        # Assert
+        assert tokens == 1000
+
+    def test_clear_keeps_settings(self, rules: List[RuleFile]) -> None:
+        """Test that clearing empties the selection only."""
+        # Arrange
+        totals = totals_of(rules, include_toc=False, budget=10)
+
+        # Act
+        totals.clear()
+
+        # Assert
+        assert (totals.count, totals.size, totals.total_tokens) == (0, 0, 0)
+        assert totals.budget == 10 and totals.include_toc is False